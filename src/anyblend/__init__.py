@@ -42,6 +42,7 @@ try:
     from . import scene
     from . import ops_object
     from . import points
+    from . import vertex_group
 except Exception:
     pass
 # enddef
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \asset_jobs.py
+# Created Date: Monday, October 19th 2026, 2:41:06 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+# This module runs asset preprocessing jobs in headless Blender worker processes.
+# Every job imports an asset file with 'object.ImportObjectAny()', and optionally smooths
+# the mesh objects with 'object.SmoothObjectSurface_VoxelRemesh()' and bakes them
+# with 'object.VoxelRemesh_BakeTexture()'. Each job runs in its own 'blender -b' process,
+# so that the CPU heavy steps run in parallel, and a crash only fails the job it occurred in.
+# The resulting objects are stored as .blend library per job in the output folder,
+# which the parent process then loads with 'LoadJobResults()'.
+#
+# Example usage
+# from anyblend import asset_jobs
+# lJobs = [asset_jobs.CreateJob(_sName=f"Rock{i}", _pathFile=pathX, _dicBake={"_fRemeshVoxelSize": 0.01})
+#          for i, pathX in enumerate(lPaths)]
+# lResults = asset_jobs.RunJobs(lJobs, _pathOutput=Path("/tmp/assets"), _iWorkerCnt=4)
+# dicObjects = asset_jobs.LoadJobResults(lResults, _clnTarget=bpy.data.collections["Assets"])
+
+import os
+import re
+import sys
+import bpy
+import json
+import subprocess
+from pathlib import Path
+from typing import Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+
+from .cls_import_cache import CImportCache
+
+
+# ################################################################################################
+def _GetJsonArgs(_dicArgs: Optional[dict], _lPathKeys: list[str]) -> Optional[dict]:
+    # Path arguments are stored as strings, so that the job can be written as JSON
+    if _dicArgs is None:
+        return None
+    # endif
+
+    dicArgs = dict(_dicArgs)
+    for sKey in _lPathKeys:
+        if dicArgs.get(sKey) is not None:
+            dicArgs[sKey] = Path(dicArgs[sKey]).as_posix()
+        # endif
+    # endfor
+    return dicArgs
+
+
+# enddef
+
+
+# ################################################################################################
+def CreateJob(
+    *,
+    _sName: str,
+    _pathFile: Union[str, Path],
+    _dicImport: Optional[dict] = None,
+    _fSmoothVoxelSize: Optional[float] = None,
+    _dicBake: Optional[dict] = None,
+) -> dict:
+    """Create an asset preprocessing job.
+
+    Args:
+        _sName (str): Unique name of the job. Used as file name of the result in the output folder.
+        _pathFile (Union[str, Path]): The asset file to import.
+        _dicImport (dict, optional): Keyword arguments for 'object.ImportObjectAny()',
+                                     apart from '_pathFile'.
+        _fSmoothVoxelSize (float, optional): If given, 'object.SmoothObjectSurface_VoxelRemesh()'
+                                             is applied to all imported mesh objects with this voxel size.
+        _dicBake (dict, optional): If given, 'object.VoxelRemesh_BakeTexture()' is called with these
+                                   keyword arguments for every imported mesh object. The result of the
+                                   job are then the baked low poly objects.
+
+    Returns:
+        dict: The job. All values are JSON serializable.
+    """
+    if re.fullmatch(r"[\w\-.]+", _sName) is None:
+        raise RuntimeError(f"Invalid asset job name '{_sName}'. Only letters, digits, '_', '-' and '.' are allowed")
+    # endif
+
+    return {
+        "sName": _sName,
+        "sFile": Path(_pathFile).as_posix(),
+        "dicImport": _GetJsonArgs(_dicImport, ["_pathCache"]) or {},
+        "fSmoothVoxelSize": _fSmoothVoxelSize,
+        "dicBake": _GetJsonArgs(_dicBake, ["_pathTex", "_pathCache"]),
+    }
+
+
+# enddef
+
+
+# ################################################################################################
+def _GetJobPaths(_pathOutput: Path, _sName: str) -> dict[str, Path]:
+    return {
+        "pathJob": _pathOutput / f"{_sName}.job.json",
+        "pathLog": _pathOutput / f"{_sName}.log",
+        "pathBlend": _pathOutput / f"{_sName}.blend",
+        "pathInfo": _pathOutput / f"{_sName}.json",
+    }
+
+
+# enddef
+
+
+# ################################################################################################
+def _GetWorkerExpr(_pathJob: Path) -> str:
+    # The paths of this process are appended to the worker's module search path,
+    # so that the worker finds this package and its dependencies, but keeps its own modules first.
+    lPaths: list[str] = [str(Path(__file__).resolve().parents[1])] + [x for x in sys.path if len(x) > 0]
+    return (
+        "import sys\n"
+        f"sys.path.extend(x for x in {lPaths!r} if x not in sys.path)\n"
+        "from anyblend import asset_jobs\n"
+        f"asset_jobs.RunWorkerJob({_pathJob.as_posix()!r})\n"
+    )
+
+
+# enddef
+
+
+# ################################################################################################
+def _RunJobProcess(
+    _dicJob: dict,
+    *,
+    _pathOutput: Path,
+    _pathBlender: Path,
+    _iThreadCnt: int,
+    _fTimeout: Optional[float],
+) -> dict:
+    sName: str = _dicJob["sName"]
+    dicPaths = _GetJobPaths(_pathOutput, sName)
+
+    # Remove results of earlier runs, so that a failed job cannot report a stale result
+    for sKey in ["pathBlend", "pathInfo"]:
+        dicPaths[sKey].unlink(missing_ok=True)
+    # endfor
+
+    with dicPaths["pathJob"].open("w") as xFile:
+        json.dump(_dicJob, xFile, indent=4)
+    # endwith
+
+    lCmd: list[str] = [
+        Path(_pathBlender).as_posix(),
+        "-b",
+        "--factory-startup",
+        "-noaudio",
+        "-t",
+        str(_iThreadCnt),
+        "--python-exit-code",
+        "1",
+        "--python-expr",
+        _GetWorkerExpr(dicPaths["pathJob"]),
+    ]
+
+    sError: Optional[str] = None
+    with dicPaths["pathLog"].open("w") as xLog:
+        try:
+            xProc = subprocess.run(lCmd, stdout=xLog, stderr=subprocess.STDOUT, timeout=_fTimeout)
+            if xProc.returncode != 0:
+                sError = f"Worker process exited with code {xProc.returncode}"
+            # endif
+        except subprocess.TimeoutExpired:
+            sError = f"Worker process timed out after {_fTimeout} seconds"
+        except Exception as xEx:
+            sError = f"Worker process could not be started: {str(xEx)}"
+        # endtry
+    # endwith
+
+    lObjects: list[str] = []
+    if sError is None:
+        if not dicPaths["pathBlend"].exists() or not dicPaths["pathInfo"].exists():
+            sError = "Worker process did not write a result"
+        else:
+            with dicPaths["pathInfo"].open("r") as xFile:
+                lObjects = json.load(xFile)["lObjects"]
+            # endwith
+        # endif
+    # endif
+
+    return {
+        "sName": sName,
+        "bOK": sError is None,
+        "sError": sError,
+        "lObjects": lObjects,
+        "pathBlend": dicPaths["pathBlend"],
+        "pathLog": dicPaths["pathLog"],
+    }
+
+
+# enddef
+
+
+# ################################################################################################
+def RunJobs(
+    _lJobs: list[dict],
+    *,
+    _pathOutput: Union[str, Path],
+    _iWorkerCnt: Optional[int] = None,
+    _pathBlender: Optional[Union[str, Path]] = None,
+    _fTimeout: Optional[float] = None,
+) -> list[dict]:
+    """Run asset preprocessing jobs in parallel headless Blender processes.
+    Each job runs in a separate process that writes its resulting objects to '<name>.blend'
+    and its console output to '<name>.log' in the output folder.
+    A job that fails, crashes or times out is reported in the results,
+    and does not affect the other jobs.
+
+    Args:
+        _lJobs (list[dict]): The jobs created with 'CreateJob()'.
+        _pathOutput (Union[str, Path]): The output folder.
+        _iWorkerCnt (int, optional): The number of parallel worker processes. Defaults to the number of CPUs.
+        _pathBlender (Union[str, Path], optional): The Blender executable. Defaults to the executable
+                                                   of the current process.
+        _fTimeout (float, optional): Timeout in seconds per job. Defaults to no timeout.
+
+    Returns:
+        list[dict]: One result per job, in the order of the jobs, with the elements
+                    'sName', 'bOK', 'sError', 'lObjects', 'pathBlend' and 'pathLog'.
+    """
+    if len(_lJobs) == 0:
+        return []
+    # endif
+
+    lNames: list[str] = [x["sName"] for x in _lJobs]
+    if len(set(lNames)) != len(lNames):
+        raise RuntimeError("Asset job names must be unique")
+    # endif
+
+    if _pathBlender is None:
+        if len(bpy.app.binary_path) == 0:
+            raise RuntimeError("Blender executable not known in this process, pass it with '_pathBlender'")
+        # endif
+        pathBlender = Path(bpy.app.binary_path)
+    else:
+        pathBlender = Path(_pathBlender)
+    # endif
+
+    pathOutput = Path(_pathOutput)
+    pathOutput.mkdir(parents=True, exist_ok=True)
+
+    iCpuCnt: int = os.cpu_count() or 1
+    iWorkerCnt: int = iCpuCnt if _iWorkerCnt is None else _iWorkerCnt
+    iWorkerCnt = max(1, min(iWorkerCnt, len(_lJobs)))
+    # Distribute the CPU threads across the workers to avoid oversubscription
+    iThreadCnt: int = max(1, iCpuCnt // iWorkerCnt)
+
+    # Each thread only waits for its worker process, so threads suffice here
+    with ThreadPoolExecutor(max_workers=iWorkerCnt) as xExec:
+        lResults = list(
+            xExec.map(
+                lambda dicJob: _RunJobProcess(
+                    dicJob,
+                    _pathOutput=pathOutput,
+                    _pathBlender=pathBlender,
+                    _iThreadCnt=iThreadCnt,
+                    _fTimeout=_fTimeout,
+                ),
+                _lJobs,
+            )
+        )
+    # endwith
+
+    return lResults
+
+
+# enddef
+
+
+# ################################################################################################
+def LoadJobResults(
+    _lResults: list[dict],
+    *,
+    _clnTarget: Optional[bpy.types.Collection] = None,
+    _bLink: bool = False,
+) -> dict[str, list[str]]:
+    """Load the objects of successful asset jobs into the current Blender file.
+
+    Args:
+        _lResults (list[dict]): The results returned by 'RunJobs()'.
+        _clnTarget (bpy.types.Collection, optional): The collection the objects are linked to.
+                                                     Defaults to the collection of the current context.
+        _bLink (bool, optional): Link the object data from the result files instead of appending it.
+
+    Returns:
+        dict[str, list[str]]: The names of the loaded objects per job name. Failed jobs are not contained.
+    """
+    clnTarget = bpy.context.collection if _clnTarget is None else _clnTarget
+
+    dicObjects: dict[str, list[str]] = {}
+    for dicResult in _lResults:
+        if dicResult["bOK"] is False:
+            continue
+        # endif
+        pathBlend = Path(dicResult["pathBlend"])
+        xCache = CImportCache(pathBlend.parent)
+        dicObjects[dicResult["sName"]] = xCache.Load(dicResult["sName"], _clnTarget=clnTarget, _bLink=_bLink)
+    # endfor
+
+    return dicObjects
+
+
+# enddef
+
+
+# ################################################################################################
+def RunWorkerJob(_pathJob: Union[str, Path]):
+    """Run an asset job in the current Blender process, and store the result next to the job file.
+    This function is called in the worker processes started by 'RunJobs()'.
+
+    Args:
+        _pathJob (Union[str, Path]): The job file written by 'RunJobs()'.
+    """
+    from . import object as anyobj
+
+    pathJob = Path(_pathJob)
+    with pathJob.open("r") as xFile:
+        dicJob: dict = json.load(xFile)
+    # endwith
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    pathFile = Path(dicJob["sFile"])
+    lObjects: list[str] = anyobj.ImportObjectAny(_pathFile=pathFile, **dicJob["dicImport"])
+    if len(lObjects) == 0:
+        raise RuntimeError(f"No objects imported from file: {(pathFile.as_posix())}")
+    # endif
+    lMeshObjects: list[bpy.types.Object] = [bpy.data.objects[x] for x in lObjects if bpy.data.objects[x].type == "MESH"]
+
+    fSmoothVoxelSize: Optional[float] = dicJob["fSmoothVoxelSize"]
+    if fSmoothVoxelSize is not None:
+        for objX in lMeshObjects:
+            anyobj.SmoothObjectSurface_VoxelRemesh(objX, fSmoothVoxelSize)
+        # endfor
+    # endif
+
+    dicBake: Optional[dict] = dicJob["dicBake"]
+    if dicBake is not None:
+        dicBake = dict(dicBake)
+        if "_tBakedTexRes" in dicBake:
+            dicBake["_tBakedTexRes"] = tuple(dicBake["_tBakedTexRes"])
+        # endif
+        for sKey in ["_pathTex", "_pathCache"]:
+            if dicBake.get(sKey) is not None:
+                dicBake[sKey] = Path(dicBake[sKey])
+            # endif
+        # endfor
+
+        lBaked: list[str] = []
+        for objX in lMeshObjects:
+            objLp = anyobj.VoxelRemesh_BakeTexture(_objIn=objX, **dicBake)
+            lBaked.append(objLp.name)
+        # endfor
+        lObjects = lBaked
+    # endif
+
+    # Stored with the format of the import cache, with the job name as key.
+    # Children are not written with their parents, so they are stored explicitly.
+    xIndex = anyobj.CreateObjectHierarchyIndex()
+    lChildren: list[str] = [
+        y for x in lObjects for y in anyobj.GetObjectChildrenNames(bpy.data.objects[x], bRecursive=True, _xIndex=xIndex)
+    ]
+    xCache = CImportCache(pathJob.parent)
+    xCache.Store(dicJob["sName"], lObjects, _lChildren=lChildren, _pathSource=pathFile)
+
+
+# enddef
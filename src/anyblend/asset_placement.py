@@ -21,11 +21,29 @@
 # ap.GeneratePlacementMap(bpy.data.objects["Person.Plane"],fR=40,fH=180)
 # Create visibility maps for all Anycam camsets and a collection of ASset planes, w.r.t a collection of walls
 # ap.GenerateAnycamVisibilityMaps(bpy.data.collections["Assetplanes"],bpy.data.collections["Walls"],fR=40,fFov=180)
+# Create geometric placement maps for a collection of asset planes, computed in 8 worker processes
+# ap.GeneratePlacementMaps(bpy.data.collections["Assetplanes"],fR=0.4,fH=1.8,iWorkerCnt=8)
+import os
+import sys
 import bpy
+import json
+import hashlib
+import tempfile
+import subprocess
 import numpy as np
-import mathutils
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from anyblend.util.convert import BlenderUnitsPerMeterFactor
+from anyblend import vertex_group
+from anyblend.cls_scene_bvh import CSceneBvh
+from anyblend.asset_placement_kernels import ComputePlacementWeights, ComputeVisibilityWeights, GetObstacleArrays
+
+# BVH trees of the scene geometry used for ray casting, rebuilt when the geometry changes
+_xSceneBvh: CSceneBvh = CSceneBvh()
+
+# Number of weight levels soft masks are quantized to when written to vertex groups
+_iSoftWeightLevels: int = 1024
 
 
 def BlenderVerts2np(objBlenderobject):
@@ -115,33 +133,349 @@ def MultiplyVertexGroups(xMesh, sVG1, sVG2, sTargetVectorGroupName):
         Name of the target Vertex Group
     """
 
-    xVG1 = xMesh.vertex_groups[sVG1]
-    xVG2 = xMesh.vertex_groups[sVG2]
+    xWeights = vertex_group.GetWeights(xMesh, [sVG1, sVG2])
 
     # Remove target vertex group if it already exists
     if sTargetVectorGroupName in xMesh.vertex_groups.keys():
         xMesh.vertex_groups.remove(xMesh.vertex_groups[sTargetVectorGroupName])
     # Endif
-    VG_target = xMesh.vertex_groups.new(name=sTargetVectorGroupName)
 
     # Add product of the weights for all
-    for v in xMesh.data.vertices:
-        if xVG1.index in [v.group for v in v.groups]:
-            fValueGroup1 = xVG1.weight(v.index)
-        else:
-            fValueGroup1 = 0.0
+    vertex_group.SetWeights(xMesh, sTargetVectorGroupName, vertex_group.Multiply(*xWeights), _fMinWeight=None)
+
+
+# Enddef
+def _SetMaskVertexGroup(objAssetPlane, sVertexGroupName, xMask):
+    """Replace the vertex group sVertexGroupName by a group that contains the masked vertices with weight 1.0,
+    or for a soft mask, all vertices with a weight above zero
+
+    Args:
+        objAssetPlane (bpy.types.Object): Grid object
+        sVertexGroupName (str): Name of the vertex group
+        xMask (np.ndarray): Boolean mask or weights over the vertices
+    """
+    # If vertex group already exists, remove it
+    if sVertexGroupName in objAssetPlane.vertex_groups.keys():
+        objAssetPlane.vertex_groups.remove(objAssetPlane.vertex_groups[sVertexGroupName])
+    # Endif
+
+    if xMask.dtype == bool:
+        objMask = objAssetPlane.vertex_groups.new(name=sVertexGroupName)
+        xIndices = BlenderVertexindices2np(objAssetPlane)
+        objMask.add(xIndices[xMask].tolist(), 1.0, "ADD")
+    else:
+        vertex_group.SetWeights(objAssetPlane, sVertexGroupName, xMask, _iLevels=_iSoftWeightLevels)
+    # Endif
+
+
+# Enddef
+def _GetMapCacheKey(sKind, lArrays, dicParams):
+    """Hash of the kind of map, the geometry arrays and the parameters, which identifies a cached map
+
+    Args:
+        sKind (str): Kind of the map
+        lArrays (list[np.ndarray]): Arrays the map depends on, e.g. vertex positions and camera matrices
+        dicParams (dict): Parameters the map depends on, must be serializable to JSON
+
+    Returns:
+        str: The cache key
+    """
+    xHash = hashlib.sha256(sKind.encode())
+    for xArray in lArrays:
+        xHash.update(np.ascontiguousarray(xArray, dtype=np.float32).tobytes())
+    # Endfor
+    xHash.update(json.dumps(dicParams, sort_keys=True).encode())
+    return xHash.hexdigest()
+
+
+# Enddef
+def _LoadMapCache(pathCache, sKey, iCount):
+    """Load a boolean vertex mask or soft weights from the map cache
+
+    Args:
+        pathCache (Path): Cache folder
+        sKey (str): Cache key
+        iCount (int): Number of vertices
+
+    Returns:
+        np.ndarray: The boolean mask or float32 weights, or None if the cache has no valid entry
+    """
+    pathEntry = Path(pathCache) / f"{sKey}.npz"
+    if not pathEntry.exists():
+        return None
+    # Endif
+
+    with np.load(pathEntry) as xData:
+        if int(xData["count"]) != iCount:
+            return None
+        # Endif
+        if "weights" in xData:
+            return xData["weights"].astype(np.float32)
         # Endif
-        if xVG2.index in [v.group for v in v.groups]:
-            fValueGroup2 = xVG2.weight(v.index)
+        return np.unpackbits(xData["mask"], count=iCount).astype(bool)
+    # Endwith
+
+
+# Enddef
+def _StoreMapCache(pathCache, sKey, xMask):
+    """Store a boolean vertex mask as bit array, or soft weights as float16 array in the map cache
+
+    Args:
+        pathCache (Path): Cache folder
+        sKey (str): Cache key
+        xMask (np.ndarray): Boolean mask or weights over the vertices
+    """
+    pathCache = Path(pathCache)
+    pathCache.mkdir(parents=True, exist_ok=True)
+    pathEntry = pathCache / f"{sKey}.npz"
+
+    # Write to a temporary file first, so that parallel processes never read partial entries
+    pathTemp = pathCache / f"{sKey}.{os.getpid()}.tmp"
+    with pathTemp.open("wb") as xFile:
+        if xMask.dtype == bool:
+            np.savez(xFile, mask=np.packbits(xMask), count=np.array(len(xMask)))
         else:
-            fValueGroup2 = 0.0
+            np.savez(xFile, weights=xMask.astype(np.float16), count=np.array(len(xMask)))
+        # Endif
+    # Endwith
+    os.replace(pathTemp, pathEntry)
+
+
+# Enddef
+def _GetMapWorkerExpr(pathTask):
+    """Python expression run by a map worker process
+
+    Args:
+        pathTask (Path): Task file of the worker
+
+    Returns:
+        str: The expression
+    """
+    # The paths of this process are appended to the worker's module search path,
+    # so that the worker finds this package, but keeps its own modules first.
+    lPaths = [str(Path(__file__).resolve().parents[1])] + [x for x in sys.path if len(x) > 0]
+    return (
+        "import sys\n"
+        f"sys.path.extend(x for x in {lPaths!r} if x not in sys.path)\n"
+        "from anyblend import asset_placement_kernels\n"
+        f"asset_placement_kernels.RunMapWorker({pathTask.as_posix()!r})\n"
+    )
+
+
+# Enddef
+def _RunMapWorkerProcess(lCmd, pathLog):
+    """Run a map worker process and wait for it to finish
+
+    Args:
+        lCmd (list[str]): Command line of the process
+        pathLog (Path): File the output of the process is written to
+
+    Returns:
+        int: The exit code of the process
+    """
+    with pathLog.open("w") as xLog:
+        return subprocess.run(lCmd, stdout=xLog, stderr=subprocess.STDOUT).returncode
+    # Endwith
+
+
+# Enddef
+def _RunMapWorkers(dicArrays, lTasks, iWorkerCnt, pathBlender=None):
+    """Compute maps in iWorkerCnt 'blender -b' worker processes, see asset_placement_kernels.RunMapWorker.
+    The arrays are passed to the workers as .npy files in a temporary folder, which the workers memory map,
+    and the tasks are distributed evenly over the workers.
+
+    Args:
+        dicArrays (dict[str, np.ndarray]): Arrays used by the workers
+        lTasks (list[tuple]): Plane index, kind and parameters of every map
+        iWorkerCnt (int): Number of worker processes
+        pathBlender (Path, optional): Blender executable. Defaults to the executable of this process.
+
+    Returns:
+        list[np.ndarray]: The maps in the order of the tasks
+    """
+    if pathBlender is None:
+        if len(bpy.app.binary_path) == 0:
+            raise RuntimeError("Blender executable not known in this process, pass it with 'pathBlender'")
+        # Endif
+        pathBlender = bpy.app.binary_path
+    # Endif
+
+    iWorkerCnt = min(iWorkerCnt, len(lTasks))
+    iThreadCnt = max(1, (os.cpu_count() or 1) // iWorkerCnt)
+
+    with tempfile.TemporaryDirectory(prefix="anyblend_maps_") as sTempPath:
+        pathTemp = Path(sTempPath)
+        for sName, xArray in dicArrays.items():
+            np.save(pathTemp / f"{sName}.npy", xArray)
+        # Endfor
+
+        lProcesses = []
+        for iWorker in range(iWorkerCnt):
+            lWorkerTasks = [
+                {
+                    "iPlane": lTasks[iTask][0],
+                    "sKind": lTasks[iTask][1],
+                    "dicParams": lTasks[iTask][2],
+                    "sResult": (pathTemp / f"result.{iTask}.npy").as_posix(),
+                }
+                for iTask in range(iWorker, len(lTasks), iWorkerCnt)
+            ]
+            pathTask = pathTemp / f"worker.{iWorker}.json"
+            with pathTask.open("w") as xFile:
+                json.dump({"sArrayPath": pathTemp.as_posix(), "lTasks": lWorkerTasks}, xFile)
+            # Endwith
+
+            lCmd = [
+                Path(pathBlender).as_posix(),
+                "-b",
+                "--factory-startup",
+                "-noaudio",
+                "-t",
+                str(iThreadCnt),
+                "--python-exit-code",
+                "1",
+                "--python-expr",
+                _GetMapWorkerExpr(pathTask),
+            ]
+            lProcesses.append((lCmd, pathTemp / f"worker.{iWorker}.log"))
+        # Endfor
+
+        with ThreadPoolExecutor(max_workers=iWorkerCnt) as xExecutor:
+            lExitCodes = list(xExecutor.map(lambda tProcess: _RunMapWorkerProcess(*tProcess), lProcesses))
+        # Endwith
+
+        for (lCmd, pathLog), iExitCode in zip(lProcesses, lExitCodes):
+            if iExitCode != 0:
+                sLog = pathLog.read_text(errors="replace")[-2000:]
+                raise RuntimeError(f"Map worker process exited with code {iExitCode}:\n{sLog}")
+            # Endif
+        # Endfor
+
+        return [np.load(pathTemp / f"result.{iTask}.npy") for iTask in range(len(lTasks))]
+    # Endwith
+
+
+# Enddef
+def _GetPlacementWeights(
+    lAssetPlanes, fR_bu, fH_bu, pathCache=None, fSoftSigma_bu=None, iWorkerCnt=0, pathBlender=None
+):
+    """Compute the placement maps of several asset planes.
+    Maps found in the map cache are loaded. The others are computed in this process, or in iWorkerCnt worker
+    processes if iWorkerCnt > 0, and are stored in the cache.
+
+    Args:
+        lAssetPlanes (list[bpy.types.Object]): Grid objects
+        fR_bu (float): Radius of the asset in Blender units
+        fH_bu (float): Height of the asset in Blender units
+        pathCache (Path, optional): Folder of the map cache. Defaults to None.
+        fSoftSigma_bu (float, optional): Standard deviation of the soft mask falloff in Blender units.
+            Defaults to None.
+        iWorkerCnt (int, optional): Number of worker processes. Defaults to 0.
+        pathBlender (Path, optional): Blender executable of the worker processes.
+            Defaults to the executable of this process.
+
+    Returns:
+        list[np.ndarray]: The map per plane as returned by ComputePlacementWeights
+    """
+    lVertices = [BlenderVerts2np(x) for x in lAssetPlanes]
+    lNormals = [BlenderNormals2np(x) for x in lAssetPlanes]
+    lWeights = [None] * len(lAssetPlanes)
+
+    lKeys = [None] * len(lAssetPlanes)
+    if pathCache is not None:
+        for iPlane, objAssetPlane in enumerate(lAssetPlanes):
+            dicParams = {
+                "fR_bu": fR_bu,
+                "fH_bu": fH_bu,
+                "sScene": _xSceneBvh.GetFingerprint(_lExcludeObjects=[objAssetPlane]),
+            }
+            if fSoftSigma_bu is not None:
+                dicParams["fSoftSigma_bu"] = fSoftSigma_bu
+            # Endif
+            lKeys[iPlane] = _GetMapCacheKey("placement", [lVertices[iPlane], lNormals[iPlane]], dicParams)
+            lWeights[iPlane] = _LoadMapCache(pathCache, lKeys[iPlane], lVertices[iPlane].shape[1])
+        # Endfor
+    # Endif
+
+    lMissing = [i for i, xWeights in enumerate(lWeights) if xWeights is None]
+    if len(lMissing) == 0:
+        return lWeights
+    # Endif
+
+    if iWorkerCnt > 0:
+        # The scene geometry without the planes is shared by all planes,
+        # every plane is an obstacle for the other planes
+        lGeometry = [(*_xSceneBvh.GetGeometry(_lExcludeObjects=lAssetPlanes), -1)]
+        for iPlane, objAssetPlane in enumerate(lAssetPlanes):
+            lGeometry.append((*_xSceneBvh.GetGeometry(_lIncludeObjects=[objAssetPlane]), iPlane))
+        # Endfor
+        dicArrays = GetObstacleArrays(lGeometry)
+        for iPlane in lMissing:
+            dicArrays[f"xVertices.{iPlane}"] = lVertices[iPlane]
+            dicArrays[f"xNormals.{iPlane}"] = lNormals[iPlane]
+        # Endfor
+
+        dicParams = {"fR_bu": fR_bu, "fH_bu": fH_bu, "fSoftSigma_bu": fSoftSigma_bu}
+        lTasks = [(iPlane, "placement", dicParams) for iPlane in lMissing]
+        lResults = _RunMapWorkers(dicArrays, lTasks, iWorkerCnt, pathBlender)
+    else:
+        lResults = []
+        for iPlane in lMissing:
+            # The plane is excluded from the scene geometry, otherwise the cast rays hit the plane itself
+            xBvhTree = _xSceneBvh.GetBvhTree(_lExcludeObjects=[lAssetPlanes[iPlane]])
+            lResults.append(
+                ComputePlacementWeights(lVertices[iPlane], lNormals[iPlane], xBvhTree, fR_bu, fH_bu, fSoftSigma_bu)
+            )
+        # Endfor
+    # Endif
+
+    for iPlane, xWeights in zip(lMissing, lResults):
+        lWeights[iPlane] = xWeights
+        if pathCache is not None:
+            _StoreMapCache(pathCache, lKeys[iPlane], xWeights)
         # Endif
-        VG_target.add([v.index], fValueGroup1 * fValueGroup2, "ADD")
     # Endfor
+    return lWeights
 
 
 # Enddef
-def GeneratePlacementMap(objAssetPlane, fR=0.4, fH=1.8, sVertexGroupName="AnyCam.geometric_placement_mask"):
+def _SetPlacementVertexGroup(objAssetPlane, sVertexGroupName, xWeights):
+    """Replace the vertex group sVertexGroupName by the placement map
+
+    Args:
+        objAssetPlane (bpy.types.Object): Grid object
+        sVertexGroupName (str): Name of the vertex group
+        xWeights (np.ndarray): Boolean mask of the blocked vertices, or placement weights for a soft map
+    """
+    # If vertex group already exists, remove it
+    if sVertexGroupName in objAssetPlane.vertex_groups.keys():
+        objAssetPlane.vertex_groups.remove(objAssetPlane.vertex_groups[sVertexGroupName])
+    # Endif
+
+    # create vertex group and initialize weights as 1.0, i.e. objects can be placed
+    objMask = objAssetPlane.vertex_groups.new(name=sVertexGroupName)
+    objMask.add(list(range(len(objAssetPlane.data.vertices))), 1.0, "ADD")
+
+    # write weights
+    if xWeights.dtype == bool:
+        indices = BlenderVertexindices2np(objAssetPlane)
+        objMask.add([int(indices[i]) for i in np.where(xWeights)[0]], 0.0, "REPLACE")
+    else:
+        vertex_group.SetWeights(
+            objAssetPlane, sVertexGroupName, xWeights, _fMinWeight=None, _iLevels=_iSoftWeightLevels
+        )
+    # Endif
+
+
+# Enddef
+def GeneratePlacementMap(
+    objAssetPlane,
+    fR=0.4,
+    fH=1.8,
+    sVertexGroupName="AnyCam.geometric_placement_mask",
+    pathCache=None,
+    fSoftSigma=None,
+):
     """Create a Vector group with weights indicating whether an asset of radius fR and height fH can be placed(1.0)
     or not (0.0) considering the geometry of the scene.
     Note that all modifiers need to be applied for this algorithm to work,
@@ -152,72 +486,177 @@ def GeneratePlacementMap(objAssetPlane, fR=0.4, fH=1.8, sVertexGroupName="AnyCam
         fH (float, optional): Height of the assets to be placed in meters. Defaults to 1.8.
         sVertexGroupName (str, optional): _description_. Name of the vertex group to be generated.
             Defaults to "AnyCam.geometric_placement_mask".
+        pathCache (Path, optional): Folder of the map cache. If given, the map is stored in the cache,
+            keyed by the plane vertices and normals, the scene geometry and the parameters,
+            and loaded from it on later calls. Defaults to None.
+        fSoftSigma (float, optional): If given, a soft mask is generated. Vertices within fR of an obstacle
+            still have weight 0.0, beyond that the weight rises to 1.0 with a gaussian falloff of the distance
+            with this standard deviation in meters. Sampling positions by these weights, e.g. with CPolygons,
+            avoids positions close to obstacles. Defaults to None.
     """
     fFactor = BlenderUnitsPerMeterFactor()
-    fR_bu = fR * fFactor
-    fH_bu = fH * fFactor
-
-    # Hide plane from viewport, otherwise the cast rays hit the plane itself
-    objAssetPlane.hide_viewport = True
-
-    objPersonsMesh = objAssetPlane.data
-    xPersonsVert = [v for v in objPersonsMesh.vertices]
-
-    # If vertex group already exists, remove it
-    if sVertexGroupName in objAssetPlane.vertex_groups.keys():
-        objAssetPlane.vertex_groups.remove(objAssetPlane.vertex_groups[sVertexGroupName])
-    # Endif
-
-    # create vertex group and initialize weights as 1.0, i.e. objects can be placed
-    objMask = objAssetPlane.vertex_groups.new(name=sVertexGroupName)
-    objMask.add([v.index for v in xPersonsVert], 1.0, "ADD")
 
     # Idea: iterate all Objects in the scene, duplicate persons.plane and intersect with object
     # to generate obstacles for the ray casting
     # Not sure how to do it with the blender api, for know, manual inspection and
     # targeted intersection with copies of the persons.plane
 
-    xPersonsVert_np_glob = BlenderVerts2np(objAssetPlane)
-    xPersonsNormals_np_glob = BlenderNormals2np(objAssetPlane)
+    xWeights = _GetPlacementWeights(
+        [objAssetPlane], fR * fFactor, fH * fFactor, pathCache, None if fSoftSigma is None else fSoftSigma * fFactor
+    )[0]
+    _SetPlacementVertexGroup(objAssetPlane, sVertexGroupName, xWeights)
 
-    n_verts = xPersonsNormals_np_glob.shape[1]
+    objAssetPlane.select_set(True)
 
-    weights = np.zeros([n_verts], dtype=float)
-    for i in range(n_verts):
-        xRayOrigin = xPersonsVert_np_glob[:, i]
-        xRayOrigin_v = mathutils.Vector(xPersonsVert_np_glob[:, i])
 
-        xRayDir_v = mathutils.Vector(xPersonsNormals_np_glob[:, i])
+# Enddef
+def GeneratePlacementMaps(
+    clnAssetPlaneCollection,
+    fR=0.4,
+    fH=1.8,
+    sVertexGroupName="geometric_placement_mask",
+    pathCache=None,
+    fSoftSigma=None,
+    iWorkerCnt=0,
+    pathBlender=None,
+):
+    """Convenience function applying GeneratePlacementMap to all asset planes
+    in the collection clnAssetPlaneCollection passed, see documentation of GeneratePlacementMap.
+    If iWorkerCnt > 0, the maps are computed in iWorkerCnt 'blender -b' worker processes, which read the plane
+    vertices and the scene geometry from temporary files. The vertex groups are written in this process.
+    The workers run the Blender executable pathBlender, which defaults to the executable of this process,
+    and has to be given if this process has none, e.g. with the bpy module from PyPI.
+    As starting a worker takes a few seconds, this pays off for scenes with many or large asset planes.
+    """
+    fFactor = BlenderUnitsPerMeterFactor()
+    lAssetPlanes = list(clnAssetPlaneCollection.all_objects)
+
+    lWeights = _GetPlacementWeights(
+        lAssetPlanes,
+        fR * fFactor,
+        fH * fFactor,
+        pathCache,
+        None if fSoftSigma is None else fSoftSigma * fFactor,
+        iWorkerCnt,
+        pathBlender,
+    )
+    for objPlane, xWeights in zip(lAssetPlanes, lWeights):
+        _SetPlacementVertexGroup(objPlane, sVertexGroupName, xWeights)
+        objPlane.select_set(True)
+    # Endfor
 
-        bResult, _, _, _, _, _ = bpy.context.scene.ray_cast(
-            bpy.context.evaluated_depsgraph_get(),
-            xRayOrigin_v,
-            xRayDir_v,
-            distance=fH_bu,
-        )
-        if bResult:
-            # Ray hit something
-            weights[np.linalg.norm(xPersonsVert_np_glob - xRayOrigin.reshape([3, 1]), axis=0) < fR_bu] = 1.0
-        # endif
-    # endfor
 
-    # write weights
-    indices = BlenderVertexindices2np(objAssetPlane)
-    objMask.add([int(indices[i]) for i in np.where(weights)[0]], 0.0, "REPLACE")
+# Enddef
+def _GetVisibilityWeights(
+    lVertices,
+    lCameraMatrices,
+    clnObstacles,
+    fR_bu,
+    fFov,
+    pathCache=None,
+    fSoftSigma_bu=None,
+    fCamDistSigma_bu=None,
+    iWorkerCnt=0,
+    pathBlender=None,
+):
+    """Compute the dilated visibility masks of the vertices of several asset planes for several cameras.
+    If a cache folder is given, the mask of every plane and camera is loaded from or stored in the map cache,
+    so that only the masks without a cache entry are computed. These are computed in this process,
+    or in iWorkerCnt worker processes if iWorkerCnt > 0.
+    If any of the sigmas is given, soft masks are computed instead.
 
-    # revert hiding of the plane
-    objAssetPlane.hide_viewport = False
-    objAssetPlane.select_set(True)
+    Args:
+        lVertices (list[np.ndarray]): Vertex positions of shape 3xN in world coordinates per plane
+        lCameraMatrices (list[mathutils.Matrix]): World matrices of the C cameras
+        clnObstacles (bpy.types.Collection): Collection of obstacles
+        fR_bu (float): Radius of the asset in Blender units
+        fFov (float): Field of view of the cameras in degrees
+        pathCache (Path, optional): Folder of the map cache. Defaults to None.
+        fSoftSigma_bu (float, optional): Standard deviation of the gaussian falloff of the weights with the distance
+            to the visible vertices beyond fR_bu in Blender units. Defaults to None.
+        fCamDistSigma_bu (float, optional): Standard deviation of the gaussian falloff of the weights with the
+            distance to the camera in Blender units. Defaults to None.
+        iWorkerCnt (int, optional): Number of worker processes. Defaults to 0.
+        pathBlender (Path, optional): Blender executable of the worker processes.
+            Defaults to the executable of this process.
+
+    Returns:
+        list[np.ndarray]: Boolean masks, or float32 weights for soft masks, of shape CxN per plane
+    """
+    bSoft = fSoftSigma_bu is not None or fCamDistSigma_bu is not None
+    lObstacles = list(clnObstacles.all_objects)
+    xCamMatrices = np.array([np.array(matCamera) for matCamera in lCameraMatrices], dtype=np.float64).reshape(-1, 4, 4)
+    lWeights = [
+        np.zeros([len(xCamMatrices), xVertices.shape[1]], dtype=np.float32 if bSoft else bool)
+        for xVertices in lVertices
+    ]
+
+    dicKeys = {}
+    lMissing = [(iPlane, list(range(len(xCamMatrices)))) for iPlane in range(len(lVertices))]
+    if pathCache is not None:
+        dicParams = {"fR_bu": fR_bu, "fFov": fFov, "sObstacles": _xSceneBvh.GetFingerprint(_lIncludeObjects=lObstacles)}
+        if bSoft:
+            dicParams["fSoftSigma_bu"] = fSoftSigma_bu
+            dicParams["fCamDistSigma_bu"] = fCamDistSigma_bu
+        # Endif
+        lMissing = []
+        for iPlane, xVertices in enumerate(lVertices):
+            lCams = []
+            for iCam, matCamera in enumerate(xCamMatrices):
+                dicKeys[iPlane, iCam] = _GetMapCacheKey("visibility", [xVertices, matCamera], dicParams)
+                xMask = _LoadMapCache(pathCache, dicKeys[iPlane, iCam], xVertices.shape[1])
+                if xMask is None:
+                    lCams.append(iCam)
+                else:
+                    lWeights[iPlane][iCam] = xMask
+                # Endif
+            # Endfor
+            if len(lCams) > 0:
+                lMissing.append((iPlane, lCams))
+            # Endif
+        # Endfor
+    # Endif
 
+    if len(lMissing) == 0:
+        return lWeights
+    # Endif
 
-# Enddef
-def GeneratePlacementMaps(clnAssetPlaneCollection, fR=0.4, fH=1.8, sVertexGroupName="geometric_placement_mask"):
-    """Convenience function applying GeneratePlacementMap to all asset planes
-    in the collection clnAssetPlaneCollection passed, see documentation of GeneratePlacementMap
-    """
-    for objPlane in clnAssetPlaneCollection.all_objects:
-        GeneratePlacementMap(objPlane, fR, fH, sVertexGroupName)
+    # Only the objects in the obstacle collection are considered for ray casting
+    if iWorkerCnt > 0:
+        dicArrays = GetObstacleArrays([(*_xSceneBvh.GetGeometry(_lIncludeObjects=lObstacles), -1)])
+        dicArrays["xCamMatrices"] = xCamMatrices
+        lTasks = []
+        for iPlane, lCams in lMissing:
+            dicArrays[f"xVertices.{iPlane}"] = lVertices[iPlane]
+            dicParams = {
+                "lCams": lCams,
+                "fR_bu": fR_bu,
+                "fFov": fFov,
+                "fSoftSigma_bu": fSoftSigma_bu,
+                "fCamDistSigma_bu": fCamDistSigma_bu,
+            }
+            lTasks.append((iPlane, "visibility", dicParams))
+        # Endfor
+        lResults = _RunMapWorkers(dicArrays, lTasks, iWorkerCnt, pathBlender)
+    else:
+        xBvhTree = _xSceneBvh.GetBvhTree(_lIncludeObjects=lObstacles)
+        lResults = [
+            ComputeVisibilityWeights(
+                lVertices[iPlane], xCamMatrices[lCams], xBvhTree, fR_bu, fFov, fSoftSigma_bu, fCamDistSigma_bu
+            )
+            for iPlane, lCams in lMissing
+        ]
+    # Endif
+
+    for (iPlane, lCams), xWeights in zip(lMissing, lResults):
+        lWeights[iPlane][lCams] = xWeights
+        if pathCache is not None:
+            for iCam, xCamWeights in zip(lCams, xWeights):
+                _StoreMapCache(pathCache, dicKeys[iPlane, iCam], xCamWeights)
+            # Endfor
+        # Endif
     # Endfor
+    return lWeights
 
 
 # Enddef
@@ -231,6 +670,9 @@ def GenerateVisibilityMap(
     sVertexGroupName="camera_visibility_mask",
     fFovVertical=180.0,
     fFovHorizontal=180.0,
+    pathCache=None,
+    fSoftSigma=None,
+    fCamDistSigma=None,
 ):
     """Generate vertex group with weights indicating whether an asset placed on the asset_plane at this vertex would
        be visible on a camera at the location of given empty origin, w.r.t the obstacles in obstacle_collection.
@@ -247,73 +689,38 @@ def GenerateVisibilityMap(
         fR (float, optional): _description_. Radius of the asset to be placed. Defaults to 0.4.
         sVertexGroupName (str, optional): Name of the Vertex group to be generated. Defaults to "Visibility_mask".
         fFov: (int, optional): Field of View of the camera. Defaults to 180
+        pathCache (Path, optional): Folder of the map cache. If given, the map is stored in the cache,
+            keyed by the plane vertices, the obstacle geometry, the camera pose and the parameters,
+            and loaded from it on later calls. Defaults to None.
+        fSoftSigma (float, optional): If given, a soft mask is generated. Vertices within fR of a visible vertex
+            have weight 1.0, beyond that the weight decays with a gaussian falloff of the distance
+            with this standard deviation in meters. Defaults to None.
+        fCamDistSigma (float, optional): If given, the weights are additionally multiplied by a gaussian of the
+            distance to the camera with this standard deviation in meters, which favors positions near the camera.
+            Also generates a soft mask. Defaults to None.
     """
     fFov = max(fFovHorizontal, fFovVertical)
-    xCamPosition_v = objCamOrigin.location
-    xCamPosition = np.array(xCamPosition_v)
 
     # R needs to be chosen based on the resolution of the grid and the size of the asset
     fFactor = BlenderUnitsPerMeterFactor()
     fR_bu = fR * fFactor
 
-    # hide all objects
-    lHideViewportBackup = {x.name: x.hide_viewport for x in bpy.data.objects}
-    for x in bpy.data.objects:
-        x.hide_viewport = True
-    # Endfor
-
-    # Show all objects in the obstacle collection
-    for x in clnObstacles.all_objects:
-        x.hide_viewport = False
-    # Endfor
-
-    # If vertex group already exists, remove it
-    if sVertexGroupName in objAssetPlane.vertex_groups.keys():
-        objAssetPlane.vertex_groups.remove(objAssetPlane.vertex_groups[sVertexGroupName])
-    # Endif
-    objMask = objAssetPlane.vertex_groups.new(name=sVertexGroupName)
-
     xPersonsVert_np_glob = BlenderVerts2np(objAssetPlane)
-    iNVerts = xPersonsVert_np_glob.shape[1]
-
-    xWeights = np.zeros([iNVerts], dtype=float)
-
-    for iLoopIndex in range(iNVerts):
-        xRayOrigin = xPersonsVert_np_glob[:, iLoopIndex]
-        xRayOrigin_v = mathutils.Vector(xPersonsVert_np_glob[:, iLoopIndex])
-        xRayDir_v = xCamPosition_v - xRayOrigin_v
-        # check if v is within the field of view of the camera, otherwise no ray cast necessary
-        xCamDirection = -np.array(objCamOrigin.matrix_world)[0:3, 2]
-        fAngle = (
-            np.arccos(np.dot(-xRayDir_v, xCamDirection) / (np.linalg.norm(xRayDir_v) * np.linalg.norm(xCamDirection)))
-            / (2 * np.pi)
-            * 360
-        )
-        if fAngle < fFov / 2:  # Vertex within FOV, thus proceed
-            fMaxDistance = 0.99 * np.linalg.norm(
-                xCamPosition - xRayOrigin
-            )  # Avoid hitting and registering the camera as obstacle
-            bObjectHit, _, _, _, _, _ = bpy.context.scene.ray_cast(
-                bpy.context.evaluated_depsgraph_get(),
-                xRayOrigin_v,
-                xRayDir_v,
-                distance=fMaxDistance,
-            )
-            if not bObjectHit:
-                # Ray hit nothing
-                xWeights[np.linalg.norm(xPersonsVert_np_glob - xRayOrigin.reshape([3, 1]), axis=0) < fR_bu] = 1.0
-            # Endif
-        # Endif
-    # Endfor
+
+    xWeights = _GetVisibilityWeights(
+        [xPersonsVert_np_glob],
+        [objCamOrigin.matrix_world],
+        clnObstacles,
+        fR_bu,
+        fFov,
+        pathCache,
+        None if fSoftSigma is None else fSoftSigma * fFactor,
+        None if fCamDistSigma is None else fCamDistSigma * fFactor,
+    )[0][0]
 
     # write weights into vertex group
-    xIndices = BlenderVertexindices2np(objAssetPlane)
-    objMask.add([int(xIndices[i]) for i in np.where(xWeights)[0]], 1.0, "ADD")
+    _SetMaskVertexGroup(objAssetPlane, sVertexGroupName, xWeights)
 
-    # Show everything again
-    for sName, bViewport in lHideViewportBackup.items():
-        bpy.data.objects[sName].hide_viewport = bViewport
-    # Endfor
     objAssetPlane.select_set(True)
 
 
@@ -326,12 +733,167 @@ def GenerateVisibilityMaps(
     sVertexGroupName="camera_visibility_mask",
     fFovVertical=180.0,
     fFovHorizontal=180.0,
+    pathCache=None,
+    fSoftSigma=None,
+    fCamDistSigma=None,
+    iWorkerCnt=0,
+    pathBlender=None,
 ):
     """Convenience function applying GenerateVisibilityMap to all asset planes
-    in the collection clnAssetPlaneCollection passed, see documentation of GenerateVisibilityMap
+    in the collection clnAssetPlaneCollection passed, see documentation of GenerateVisibilityMap.
+    If iWorkerCnt > 0, the maps are computed in worker processes, see GeneratePlacementMaps.
+    """
+    fFactor = BlenderUnitsPerMeterFactor()
+    lAssetPlanes = list(clnAssetPlanes.all_objects)
+
+    lWeights = _GetVisibilityWeights(
+        [BlenderVerts2np(x) for x in lAssetPlanes],
+        [objOrigin.matrix_world],
+        clnObstacles,
+        fR * fFactor,
+        max(fFovHorizontal, fFovVertical),
+        pathCache,
+        None if fSoftSigma is None else fSoftSigma * fFactor,
+        None if fCamDistSigma is None else fCamDistSigma * fFactor,
+        iWorkerCnt,
+        pathBlender,
+    )
+    for objPlane, xWeights in zip(lAssetPlanes, lWeights):
+        _SetMaskVertexGroup(objPlane, sVertexGroupName, xWeights[0])
+        objPlane.select_set(True)
+    # Endfor
+
+
+# Enddef
+def GenerateMultiCameraVisibilityMap(
+    objAssetPlane,
+    lCamOrigins,
+    clnObstacles,
+    fR=0.4,
+    sVertexGroupName="camera_visibility_mask",
+    fFovVertical=180.0,
+    fFovHorizontal=180.0,
+    sAnyVertexGroupName="camera_visibility_mask.any",
+    sAllVertexGroupName="camera_visibility_mask.all",
+    pathCache=None,
+    fSoftSigma=None,
+    fCamDistSigma=None,
+):
+    """Generate the visibility maps of GenerateVisibilityMap for several cameras in one pass.
+    The obstacle geometry and the vertex positions are shared by all cameras, and the FOV test is done
+    for all cameras at once. For every camera a vertex group '<sVertexGroupName>.<camera name>' is created.
+    Additionally, the aggregate vertex groups contain the vertices visible on any or on all of the cameras.
+    Args:
+        objAssetPlane (_type_): Grid object
+        lCamOrigins (list): Objects indicating the camera locations
+        clnObstacles (_type_): Collection of obstacles
+        fR (float, optional): Radius of the asset to be placed. Defaults to 0.4.
+        sVertexGroupName (str, optional): Name prefix of the per camera vertex groups.
+            Defaults to "camera_visibility_mask".
+        fFovVertical, fFovHorizontal: (float, optional): Field of View of the cameras. Defaults to 180
+        sAnyVertexGroupName (str, optional): Name of the vertex group of vertices visible on any camera.
+            No group is created if None. Defaults to "camera_visibility_mask.any".
+        sAllVertexGroupName (str, optional): Name of the vertex group of vertices visible on all cameras.
+            No group is created if None. Defaults to "camera_visibility_mask.all".
+        pathCache (Path, optional): Folder of the map cache, see GenerateVisibilityMap. The map of every camera
+            is cached separately. Defaults to None.
+        fSoftSigma, fCamDistSigma (float, optional): Generate soft masks, see GenerateVisibilityMap.
+            The weight of the aggregate groups is the maximum or minimum of the camera weights. Defaults to None.
+
+    Returns:
+        dict: The vertex group names per camera name
     """
-    for objPlane in clnAssetPlanes.all_objects:
-        GenerateVisibilityMap(objPlane, objOrigin, clnObstacles, fR, sVertexGroupName, fFovVertical, fFovHorizontal)
+    fFov = max(fFovHorizontal, fFovVertical)
+    fFactor = BlenderUnitsPerMeterFactor()
+    fR_bu = fR * fFactor
+
+    xPersonsVert_np_glob = BlenderVerts2np(objAssetPlane)
+    xWeights = _GetVisibilityWeights(
+        [xPersonsVert_np_glob],
+        [x.matrix_world for x in lCamOrigins],
+        clnObstacles,
+        fR_bu,
+        fFov,
+        pathCache,
+        None if fSoftSigma is None else fSoftSigma * fFactor,
+        None if fCamDistSigma is None else fCamDistSigma * fFactor,
+    )[0]
+
+    dicGroups = _SetMultiCameraVertexGroups(
+        objAssetPlane, lCamOrigins, xWeights, sVertexGroupName, sAnyVertexGroupName, sAllVertexGroupName
+    )
+
+    objAssetPlane.select_set(True)
+    return dicGroups
+
+
+# Enddef
+def _SetMultiCameraVertexGroups(
+    objAssetPlane, lCamOrigins, xWeights, sVertexGroupName, sAnyVertexGroupName, sAllVertexGroupName
+):
+    """Write the per camera and the aggregate vertex groups of GenerateMultiCameraVisibilityMap
+
+    Returns:
+        dict: The vertex group names per camera name
+    """
+    dicGroups = {}
+    for objCam, xCamWeights in zip(lCamOrigins, xWeights):
+        sName = f"{sVertexGroupName}.{objCam.name}"
+        _SetMaskVertexGroup(objAssetPlane, sName, xCamWeights)
+        dicGroups[objCam.name] = sName
+    # Endfor
+
+    if sAnyVertexGroupName is not None:
+        _SetMaskVertexGroup(objAssetPlane, sAnyVertexGroupName, np.max(xWeights, axis=0))
+    # Endif
+    if sAllVertexGroupName is not None:
+        _SetMaskVertexGroup(objAssetPlane, sAllVertexGroupName, np.min(xWeights, axis=0))
+    # Endif
+
+    return dicGroups
+
+
+# Enddef
+def GenerateMultiCameraVisibilityMaps(
+    clnAssetPlanes,
+    lCamOrigins,
+    clnObstacles,
+    fR=0.4,
+    sVertexGroupName="camera_visibility_mask",
+    fFovVertical=180.0,
+    fFovHorizontal=180.0,
+    sAnyVertexGroupName="camera_visibility_mask.any",
+    sAllVertexGroupName="camera_visibility_mask.all",
+    pathCache=None,
+    fSoftSigma=None,
+    fCamDistSigma=None,
+    iWorkerCnt=0,
+    pathBlender=None,
+):
+    """Convenience function applying GenerateMultiCameraVisibilityMap to all asset planes
+    in the collection clnAssetPlanes passed, see documentation of GenerateMultiCameraVisibilityMap.
+    If iWorkerCnt > 0, the maps are computed in worker processes, see GeneratePlacementMaps.
+    """
+    fFactor = BlenderUnitsPerMeterFactor()
+    lAssetPlanes = list(clnAssetPlanes.all_objects)
+
+    lWeights = _GetVisibilityWeights(
+        [BlenderVerts2np(x) for x in lAssetPlanes],
+        [x.matrix_world for x in lCamOrigins],
+        clnObstacles,
+        fR * fFactor,
+        max(fFovHorizontal, fFovVertical),
+        pathCache,
+        None if fSoftSigma is None else fSoftSigma * fFactor,
+        None if fCamDistSigma is None else fCamDistSigma * fFactor,
+        iWorkerCnt,
+        pathBlender,
+    )
+    for objPlane, xWeights in zip(lAssetPlanes, lWeights):
+        _SetMultiCameraVertexGroups(
+            objPlane, lCamOrigins, xWeights, sVertexGroupName, sAnyVertexGroupName, sAllVertexGroupName
+        )
+        objPlane.select_set(True)
     # Endfor
 
 
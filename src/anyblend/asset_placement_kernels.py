@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \asset_placement_kernels.py
+# Created Date: Monday, October 19th 2026, 11:12:40 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+# Ray casting kernels of the asset placement maps of 'asset_placement'.
+# The kernels only work on numpy arrays and the BVH and KD trees of 'mathutils', and this module
+# does not import bpy, so that the maps can be computed in 'blender -b' worker processes,
+# which read the arrays from files written by 'asset_placement' instead of loading the scene.
+import json
+import numpy as np
+import mathutils
+from pathlib import Path
+from mathutils.bvhtree import BVHTree
+from mathutils.kdtree import KDTree
+
+
+def GetSeedDistances(xVertices, xSeedMask):
+    """Distance of all vertices to their nearest seed vertex.
+    Every vertex queries its nearest seed on a KD-tree of the seed vertices,
+    so the costs do not depend on the number of vertices within some radius.
+
+    Args:
+        xVertices (np.ndarray): Vertex positions of shape 3xN
+        xSeedMask (np.ndarray): Boolean mask of the seed vertices of length N
+
+    Returns:
+        np.ndarray: Distances of length N, infinite if there are no seeds
+    """
+    xSeeds = np.flatnonzero(xSeedMask)
+    xDist = np.full(xVertices.shape[1], np.inf)
+    if len(xSeeds) == 0:
+        return xDist
+    # Endif
+
+    xKdTree = KDTree(len(xSeeds))
+    for i, lCo in zip(xSeeds.tolist(), xVertices[:, xSeeds].T.tolist()):
+        xKdTree.insert(lCo, i)
+    # Endfor
+    xKdTree.balance()
+
+    xDist[:] = [xKdTree.find(lCo)[2] for lCo in xVertices.T.tolist()]
+    return xDist
+
+
+# Enddef
+def DilateMask(xVertices, xSeedMask, fR):
+    """Mark all vertices that are closer than fR to a seed vertex.
+
+    Args:
+        xVertices (np.ndarray): Vertex positions of shape 3xN
+        xSeedMask (np.ndarray): Boolean mask of the seed vertices of length N
+        fR (float): Radius
+
+    Returns:
+        np.ndarray: Boolean mask of length N
+    """
+    return GetSeedDistances(xVertices, xSeedMask) < fR
+
+
+# Enddef
+def GetGaussianFalloff(xDist, fR, fSigma):
+    """Soft version of the dilation: 1.0 for distances below fR and a gaussian falloff
+    with standard deviation fSigma for the distance beyond fR
+
+    Args:
+        xDist (np.ndarray): Distances to the nearest seed
+        fR (float): Radius
+        fSigma (float): Standard deviation of the falloff
+
+    Returns:
+        np.ndarray: Weights in the range [0, 1]
+    """
+    return np.exp(-np.square(np.maximum(xDist - fR, 0.0)) / (2.0 * fSigma * fSigma)).astype(np.float32)
+
+
+# Enddef
+def GetLineOfSightMasks(xVertices, xBvhTree, lCameraMatrices, fFov):
+    """Test for all vertices and cameras, whether a vertex is within the field of view of a camera,
+    and whether the line of sight to the camera is not blocked by the geometry in the BVH tree.
+    The FOV test is done for all cameras and vertices at once, ray casts are only done for vertices within the FOV.
+
+    Args:
+        xVertices (np.ndarray): Vertex positions of shape 3xN in world coordinates
+        xBvhTree (BVHTree): Obstacle geometry in world coordinates
+        lCameraMatrices (list[mathutils.Matrix] | np.ndarray): World matrices of the C cameras,
+            which look along their negative z-axis
+        fFov (float): Field of view of the cameras in degrees
+
+    Returns:
+        np.ndarray: Boolean masks of shape CxN
+    """
+    xCamMatrices = np.array([np.array(matCamera) for matCamera in lCameraMatrices]).reshape([-1, 4, 4])
+    xCamPositions = xCamMatrices[:, 0:3, 3]
+    xCamDirections = -xCamMatrices[:, 0:3, 2]
+
+    # Ray directions from the vertices to the cameras of shape Cx3xN
+    xRayDir = xCamPositions[:, :, np.newaxis] - xVertices[np.newaxis, :, :]
+    xDist = np.linalg.norm(xRayDir, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xCos = -np.einsum("ci,cin->cn", xCamDirections, xRayDir) / (
+            xDist * np.linalg.norm(xCamDirections, axis=1)[:, np.newaxis]
+        )
+        xAngle = np.degrees(np.arccos(np.clip(xCos, -1.0, 1.0)))
+    # Endwith
+
+    xMasks = np.zeros(xDist.shape, dtype=bool)
+    for iCam in range(xMasks.shape[0]):
+        # Only vertices within the FOV need a ray cast
+        xInFov = np.flatnonzero(xAngle[iCam] < fFov / 2)
+        for i, lOrigin, lDir, fDist in zip(
+            xInFov.tolist(),
+            xVertices[:, xInFov].T.tolist(),
+            xRayDir[iCam][:, xInFov].T.tolist(),
+            xDist[iCam, xInFov].tolist(),
+        ):
+            # Avoid hitting and registering the camera as obstacle
+            if xBvhTree.ray_cast(mathutils.Vector(lOrigin), mathutils.Vector(lDir), 0.99 * fDist)[0] is None:
+                xMasks[iCam, i] = True
+            # Endif
+        # Endfor
+    # Endfor
+    return xMasks
+
+
+# Enddef
+def ComputePlacementWeights(xVertices, xNormals, xBvhTree, fR_bu, fH_bu, fSoftSigma_bu=None):
+    """Compute the placement map of an asset plane. Only works on arrays and the BVH tree,
+    so that it can also run in worker processes.
+
+    Args:
+        xVertices (np.ndarray): Vertex positions of shape 3xN in world coordinates
+        xNormals (np.ndarray): Vertex normals of shape 3xN in world coordinates
+        xBvhTree (BVHTree): Scene geometry without the asset plane in world coordinates
+        fR_bu (float): Radius of the asset in Blender units
+        fH_bu (float): Height of the asset in Blender units
+        fSoftSigma_bu (float, optional): Standard deviation of the soft mask falloff in Blender units.
+            Defaults to None.
+
+    Returns:
+        np.ndarray: Boolean mask of the blocked vertices, or float32 placement weights for a soft mask
+    """
+    xHits = np.zeros([xVertices.shape[1]], dtype=bool)
+    for i, (lOrigin, lDir) in enumerate(zip(xVertices.T.tolist(), xNormals.T.tolist())):
+        if xBvhTree.ray_cast(mathutils.Vector(lOrigin), mathutils.Vector(lDir), fH_bu)[0] is not None:
+            xHits[i] = True
+        # Endif
+    # Endfor
+
+    if fSoftSigma_bu is None:
+        # All vertices within the asset radius of a vertex with an obstacle above it are blocked
+        return DilateMask(xVertices, xHits, fR_bu)
+    # Endif
+
+    # Placement weights rise with the distance to the blocked vertices
+    return 1.0 - GetGaussianFalloff(GetSeedDistances(xVertices, xHits), fR_bu, fSoftSigma_bu)
+
+
+# Enddef
+def ComputeVisibilityWeights(xVertices, xCamMatrices, xBvhTree, fR_bu, fFov, fSoftSigma_bu=None, fCamDistSigma_bu=None):
+    """Compute the visibility maps of an asset plane for several cameras. Only works on arrays and the BVH tree,
+    so that it can also run in worker processes.
+
+    Args:
+        xVertices (np.ndarray): Vertex positions of shape 3xN in world coordinates
+        xCamMatrices (np.ndarray): World matrices of the C cameras of shape Cx4x4
+        xBvhTree (BVHTree): Obstacle geometry in world coordinates
+        fR_bu (float): Radius of the asset in Blender units
+        fFov (float): Field of view of the cameras in degrees
+        fSoftSigma_bu (float, optional): Standard deviation of the gaussian falloff of the weights with the distance
+            to the visible vertices beyond fR_bu in Blender units. Defaults to None.
+        fCamDistSigma_bu (float, optional): Standard deviation of the gaussian falloff of the weights with the
+            distance to the camera in Blender units. Defaults to None.
+
+    Returns:
+        np.ndarray: Boolean masks, or float32 weights for soft masks, of shape CxN
+    """
+    bSoft = fSoftSigma_bu is not None or fCamDistSigma_bu is not None
+    xVisible = GetLineOfSightMasks(xVertices, xBvhTree, xCamMatrices, fFov)
+    xWeights = np.zeros(xVisible.shape, dtype=np.float32 if bSoft else bool)
+    for iCam, xCamVisible in enumerate(xVisible):
+        if fSoftSigma_bu is None:
+            xWeights[iCam] = DilateMask(xVertices, xCamVisible, fR_bu)
+        else:
+            xWeights[iCam] = GetGaussianFalloff(GetSeedDistances(xVertices, xCamVisible), fR_bu, fSoftSigma_bu)
+        # Endif
+        if fCamDistSigma_bu is not None:
+            xCamDist2 = np.sum(np.square(xVertices - xCamMatrices[iCam, 0:3, 3:4]), axis=0)
+            xWeights[iCam] *= np.exp(-xCamDist2 / (2.0 * fCamDistSigma_bu * fCamDistSigma_bu))
+        # Endif
+    # Endfor
+    return xWeights
+
+
+# Enddef
+def GetObstacleArrays(lGeometry):
+    """Concatenate obstacle geometry into one vertex and one triangle array
+
+    Args:
+        lGeometry (list[tuple]): Vertices, triangles and the index of the plane owning them, or -1,
+            per geometry as returned by CSceneBvh.GetGeometry
+
+    Returns:
+        dict[str, np.ndarray]: The arrays "aVex", "aTris" and "aTriOwner"
+    """
+    lVex, lTris, lOwner = [], [], []
+    iVexCnt = 0
+    for aVex, aTris, iOwner in lGeometry:
+        lVex.append(aVex)
+        lTris.append(aTris.astype(np.int32) + iVexCnt)
+        lOwner.append(np.full(len(aTris), iOwner, dtype=np.int32))
+        iVexCnt += len(aVex)
+    # Endfor
+    return {
+        "aVex": np.concatenate(lVex).astype(np.float32).reshape(-1, 3),
+        "aTris": np.concatenate(lTris).reshape(-1, 3),
+        "aTriOwner": np.concatenate(lOwner),
+    }
+
+
+# Enddef
+def RunMapWorker(sTaskFile):
+    """Compute the placement or visibility maps listed in a task file and save every map as .npy file.
+    This function is called in the worker processes started by asset_placement.
+    The plane vertices and the obstacle geometry are memory mapped from the .npy files in the array folder.
+    A BVH tree of all triangles is built once and shared by the planes that own no triangles, e.g. for
+    visibility maps. Placement maps get a tree per plane, which excludes the triangles of the plane itself.
+
+    Args:
+        sTaskFile (str): JSON file with the array folder "sArrayPath" and the tasks "lTasks",
+            each with the plane index "iPlane", the kind "sKind", which is "placement" or "visibility",
+            the parameters "dicParams" of the map and the file "sResult" the map is saved to
+    """
+    with open(sTaskFile, "r") as xFile:
+        dicTasks = json.load(xFile)
+    # Endwith
+
+    pathArrays = Path(dicTasks["sArrayPath"])
+
+    def GetArray(sName):
+        return np.load(pathArrays / f"{sName}.npy", mmap_mode="r")
+
+    # Enddef
+
+    xTris = GetArray("aTris")
+    xTriOwner = GetArray("aTriOwner")
+    setOwners = set(np.unique(xTriOwner).tolist())
+    lVex = GetArray("aVex").tolist()
+    xSharedBvhTree = None
+    for dicTask in dicTasks["lTasks"]:
+        iPlane = dicTask["iPlane"]
+        dicParams = dicTask["dicParams"]
+
+        if iPlane in setOwners:
+            # Triangles of the plane itself are excluded, otherwise the cast rays hit the plane
+            xBvhTree = BVHTree.FromPolygons(lVex, xTris[xTriOwner != iPlane].tolist(), all_triangles=True)
+        else:
+            if xSharedBvhTree is None:
+                xSharedBvhTree = BVHTree.FromPolygons(lVex, xTris.tolist(), all_triangles=True)
+            # Endif
+            xBvhTree = xSharedBvhTree
+        # Endif
+        xVertices = np.array(GetArray(f"xVertices.{iPlane}"))
+
+        if dicTask["sKind"] == "placement":
+            xWeights = ComputePlacementWeights(
+                xVertices,
+                np.array(GetArray(f"xNormals.{iPlane}")),
+                xBvhTree,
+                dicParams["fR_bu"],
+                dicParams["fH_bu"],
+                dicParams["fSoftSigma_bu"],
+            )
+        else:
+            xWeights = ComputeVisibilityWeights(
+                xVertices,
+                np.array(GetArray("xCamMatrices")[dicParams["lCams"]]),
+                xBvhTree,
+                dicParams["fR_bu"],
+                dicParams["fFov"],
+                dicParams["fSoftSigma_bu"],
+                dicParams["fCamDistSigma_bu"],
+            )
+        # Endif
+        np.save(dicTask["sResult"], xWeights)
+    # Endfor
+
+
+# Enddef
@@ -29,9 +29,11 @@
 import bpy
 import mathutils
 import math
+import copy
 import numpy as np
 from anybase import assertion
 from anyblend import object, collection
+from anyblend.cls_oriented_box import COrientedBox
 
 
 class CBoundingBox:
@@ -169,11 +171,9 @@ class CBoundingBox:
         setObjNames = set([x.name for x in _lObjects])
 
         if _bCompoundObject is True:
+            xIndex = object.CreateObjectHierarchyIndex()
             for objX in _lObjects:
-                lChildren = object.GetObjectChildrenNames(objX, bRecursive=True)
-                for sChild in lChildren:
-                    setObjNames.add(sChild)
-                # endfor
+                setObjNames.update(object.GetObjectChildrenNames(objX, bRecursive=True, _xIndex=xIndex))
             # endfor
         # endif
 
@@ -182,7 +182,7 @@ class CBoundingBox:
             for sObjName in setObjNames:
                 objX = bpy.data.objects[sObjName]
                 if _bUseMesh is True:
-                    lC.append(object.GetMeshVex(objX, sFrame="LOCAL", bEvaluated=True))
+                    lC.append(object.GetMeshVex(objX, sFrame="LOCAL", bEvaluated=True, bCopy=False))
                 else:
                     lC.extend(mathutils.Vector(x) for x in objX.bound_box)
                 # endif
@@ -191,7 +191,7 @@ class CBoundingBox:
             for sObjName in setObjNames:
                 objX = bpy.data.objects[sObjName]
                 if _bUseMesh is True:
-                    lC.append(object.GetMeshVex(objX, sFrame="WORLD", bEvaluated=True))
+                    lC.append(object.GetMeshVex(objX, sFrame="WORLD", bEvaluated=True, bCopy=False))
                 else:
                     lC.extend(objX.matrix_world @ mathutils.Vector(x) for x in objX.bound_box)
                 # endif
@@ -405,17 +405,53 @@ class CBoundingBox:
             _lEulerAngles=_lEulerAngles, _bAnglesInDeg=_bAnglesInDeg, _lOriginOffset=_lOriginOffset
         )
 
-        self._vCenter = (matTrans @ self._vCenter.to_4d()).to_3d()
-        matTrans3 = matTrans.to_3x3()
+        self.Transform(matTrans)
+
+        return matTrans
+
+    # enddef
+
+    # ######################################################################################
+    def Transform(self, _matTrans: mathutils.Matrix):
+        """Apply a rigid transformation (rotation and translation) to the bounding box.
+        The box sizes are not changed, so the matrix must not contain any scaling.
+
+        Args:
+            _matTrans (mathutils.Matrix): 4x4 rigid transformation matrix.
+        """
+        self._vCenter = (_matTrans @ self._vCenter.to_4d()).to_3d()
+        matTrans3 = _matTrans.to_3x3()
         for i in range(len(self._lBase)):
             self._lBase[i] = matTrans3 @ self._lBase[i]
         # endfor
 
         for i in range(len(self._lCorners)):
-            self._lCorners[i] = (matTrans @ self._lCorners[i].to_4d()).to_3d()
+            self._lCorners[i] = (_matTrans @ self._lCorners[i].to_4d()).to_3d()
         # endfor
 
-        return matTrans
+        vA = self._lCorners[0]
+        vB = self._lCorners[6]
+        self._vCornerMin = mathutils.Vector((min(vA[0], vB[0]), min(vA[1], vB[1]), min(vA[2], vB[2])))
+
+    # enddef
+
+    # ######################################################################################
+    def Transformed(self, _matTrans: mathutils.Matrix) -> "CBoundingBox":
+        """Return a transformed copy of the bounding box. See Transform()."""
+        xBox = copy.deepcopy(self)
+        xBox.Transform(_matTrans)
+        return xBox
+
+    # enddef
+
+    # ######################################################################################
+    def GetOrientedBox(self) -> COrientedBox:
+        """Get the box as 'COrientedBox', which works on numpy arrays without mathutils."""
+        return COrientedBox(
+            _aCenter=np.array(self._vCenter),
+            _aBase=np.array([list(x) for x in self._lBase]),
+            _aHalfSize=np.array(self._tHalfSize),
+        )
 
     # enddef
 
@@ -518,7 +554,7 @@ class CBoundingBox:
             raise RuntimeError("Testing object inside bounding box only implemented for mesh objects")
         # endif
 
-        aVex = object.GetMeshVex(_objX, sFrame="WORLD", bEvaluated=True)
+        aVex = object.GetMeshVex(_objX, sFrame="WORLD", bEvaluated=True, bCopy=False)
         aRelVex = aVex - np.array(list(self.vCenter))
 
         lBase = [np.array(list(x)).reshape(1, 3) for x in self.lBase]
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_collection_index.py
+# Created Date: Monday, October 19th 2026, 9:12:40 am
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+import bpy
+from typing import Optional
+
+
+# ################################################################################################
+# Index of the collection hierarchy of a view layer.
+# Stores the parent collection of every collection and object, and the path of child names
+# from the root layer collection to every layer collection. Only names are stored, so that no
+# references to removed Blender data are kept. Every lookup result is validated against the
+# current scene data. If the validation fails or an element is not found, the index is rebuilt
+# once with a single pass over the layer collection tree.
+# The parent of an element that is linked to more than one collection is the first one found
+# in a depth-first traversal from the root, as with the recursive search functions.
+class CCollectionIndex:
+    def __init__(self):
+        # Parent collection name per collection name. 'None' refers to the root collection.
+        self._dicClnParent: dict[str, Optional[str]] = {}
+        # Collection name per object name. 'None' refers to the root collection.
+        self._dicObjCln: dict[str, Optional[str]] = {}
+        # Path of child layer collection names from the root layer collection.
+        self._dicLayerPath: dict[str, tuple[str, ...]] = {}
+        self._bValid: bool = False
+
+    # enddef
+
+    @property
+    def bValid(self) -> bool:
+        return self._bValid
+
+    # enddef
+
+    # ##############################################################################
+    def Invalidate(self):
+        self._dicClnParent.clear()
+        self._dicObjCln.clear()
+        self._dicLayerPath.clear()
+        self._bValid = False
+
+    # enddef
+
+    # ##############################################################################
+    def _DoBuild(self, _xLayCol, _sClnName: Optional[str], _tPath: tuple[str, ...]):
+        for objX in _xLayCol.collection.objects:
+            self._dicObjCln.setdefault(objX.name, _sClnName)
+        # endfor
+
+        for xChild in _xLayCol.children:
+            sChild: str = xChild.name
+            tChildPath = _tPath + (sChild,)
+            self._dicClnParent.setdefault(sChild, _sClnName)
+            self._dicLayerPath.setdefault(sChild, tChildPath)
+            self._DoBuild(xChild, sChild, tChildPath)
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    def Build(self, _xLayColRoot: bpy.types.LayerCollection):
+        self.Invalidate()
+        self._DoBuild(_xLayColRoot, None, tuple())
+        self._bValid = True
+
+    # enddef
+
+    # ##############################################################################
+    def _Resolve(self, _xLayColRoot: bpy.types.LayerCollection, _sClnName: Optional[str]) -> bpy.types.Collection:
+        if _sClnName is None:
+            return _xLayColRoot.collection
+        # endif
+        return bpy.data.collections.get(_sClnName)
+
+    # enddef
+
+    # ##############################################################################
+    def _LookupParent(
+        self, _xLayColRoot: bpy.types.LayerCollection, _dicParent: dict, _sName: str, _sAttr: str
+    ) -> tuple[bool, Optional[bpy.types.Collection]]:
+        if _sName not in _dicParent:
+            return False, None
+        # endif
+
+        clnParent = self._Resolve(_xLayColRoot, _dicParent[_sName])
+        if clnParent is None or getattr(clnParent, _sAttr).get(_sName) is None:
+            return False, None
+        # endif
+
+        return True, clnParent
+
+    # enddef
+
+    # ##############################################################################
+    def _GetParent(
+        self, _xLayColRoot: bpy.types.LayerCollection, _dicParent: dict, _sName: str, _sAttr: str
+    ) -> Optional[bpy.types.Collection]:
+        bBuilt: bool = False
+        if self._bValid is False:
+            self.Build(_xLayColRoot)
+            bBuilt = True
+        # endif
+
+        bOK, clnParent = self._LookupParent(_xLayColRoot, _dicParent, _sName, _sAttr)
+        if bOK is False and bBuilt is False:
+            self.Build(_xLayColRoot)
+            bOK, clnParent = self._LookupParent(_xLayColRoot, _dicParent, _sName, _sAttr)
+        # endif
+
+        return clnParent
+
+    # enddef
+
+    # ##############################################################################
+    def GetParentCollection(
+        self, _xLayColRoot: bpy.types.LayerCollection, _sClnName: str
+    ) -> Optional[bpy.types.Collection]:
+        return self._GetParent(_xLayColRoot, self._dicClnParent, _sClnName, "children")
+
+    # enddef
+
+    # ##############################################################################
+    def GetCollectionOfObject(
+        self, _xLayColRoot: bpy.types.LayerCollection, _sObjName: str
+    ) -> Optional[bpy.types.Collection]:
+        return self._GetParent(_xLayColRoot, self._dicObjCln, _sObjName, "objects")
+
+    # enddef
+
+    # ##############################################################################
+    def _LookupLayerCollection(
+        self, _xLayColRoot: bpy.types.LayerCollection, _sClnName: str
+    ) -> Optional[bpy.types.LayerCollection]:
+        tPath = self._dicLayerPath.get(_sClnName)
+        if tPath is None:
+            return None
+        # endif
+
+        xLayCol = _xLayColRoot
+        for sName in tPath:
+            xLayCol = xLayCol.children.get(sName)
+            if xLayCol is None:
+                return None
+            # endif
+        # endfor
+
+        return xLayCol
+
+    # enddef
+
+    # ##############################################################################
+    def GetLayerCollection(
+        self, _xLayColRoot: bpy.types.LayerCollection, _sClnName: str
+    ) -> Optional[bpy.types.LayerCollection]:
+        if _xLayColRoot.name == _sClnName:
+            return _xLayColRoot
+        # endif
+
+        bBuilt: bool = False
+        if self._bValid is False:
+            self.Build(_xLayColRoot)
+            bBuilt = True
+        # endif
+
+        xLayCol = self._LookupLayerCollection(_xLayColRoot, _sClnName)
+        if xLayCol is None and bBuilt is False:
+            self.Build(_xLayColRoot)
+            xLayCol = self._LookupLayerCollection(_xLayColRoot, _sClnName)
+        # endif
+
+        return xLayCol
+
+    # enddef
+
+    # ##############################################################################
+    def AddCollection(self, _sClnName: str, _sParentName: Optional[str]):
+        """Register a collection that was linked as child to the given parent collection.
+        A parent name of 'None' refers to the root collection.
+        """
+        if self._bValid is False:
+            return
+        # endif
+
+        if _sParentName is None:
+            tParentPath = tuple()
+        else:
+            tParentPath = self._dicLayerPath.get(_sParentName)
+            if tParentPath is None:
+                # Parent is not known, so we cannot update the index incrementally
+                self.Invalidate()
+                return
+            # endif
+        # endif
+
+        self._dicClnParent.setdefault(_sClnName, _sParentName)
+        self._dicLayerPath.setdefault(_sClnName, tParentPath + (_sClnName,))
+
+    # enddef
+
+    # ##############################################################################
+    def SetObjectCollection(self, _sObjName: str, _sClnName: Optional[str]):
+        """Register the collection an object was linked to.
+        A collection name of 'None' refers to the root collection.
+        """
+        if self._bValid is False:
+            return
+        # endif
+
+        self._dicObjCln[_sObjName] = _sClnName
+
+    # enddef
+
+
+# endclass
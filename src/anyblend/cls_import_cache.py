@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_import_cache.py
+# Created Date: Monday, October 19th 2026, 5:21:44 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import os
+import bpy
+import json
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+
+# ################################################################################################
+# Cache of processed asset imports, stored as .blend libraries.
+# Each entry is identified by the hash of the content of the imported file, together with
+# the import parameters and the Blender version. An entry consists of a .blend file that contains
+# the imported objects with all their data, and a JSON file with the ordered list of object names.
+# Children of the imported objects are stored with the entry, as they are not a dependency of their parent.
+# Entries are written to temporary files first and then renamed, so that processes
+# sharing a cache folder never read partially written entries.
+class CImportCache:
+    # Content hashes per file path, size and modification time
+    _dicFileHash: dict[tuple[str, int, int], str] = {}
+
+    # Files that are read together with an imported file of the given type
+    _dicSideFileSuffix: dict[str, list[str]] = {
+        ".obj": [".mtl"],
+        ".gltf": [".bin"],
+    }
+
+    def __init__(self, _pathCache: Path):
+        self._pathCache: Path = Path(_pathCache)
+
+    # enddef
+
+    @property
+    def pathCache(self) -> Path:
+        return self._pathCache
+
+    # enddef
+
+    # ##############################################################################
+    @classmethod
+    def GetFileHash(cls, _pathFile: Path) -> str:
+        xStat = _pathFile.stat()
+        tId = (_pathFile.resolve().as_posix(), xStat.st_size, xStat.st_mtime_ns)
+        sHash = cls._dicFileHash.get(tId)
+        if sHash is None:
+            xHash = hashlib.sha256()
+            with _pathFile.open("rb") as xFile:
+                while True:
+                    xChunk = xFile.read(1 << 20)
+                    if len(xChunk) == 0:
+                        break
+                    # endif
+                    xHash.update(xChunk)
+                # endwhile
+            # endwith
+            sHash = xHash.hexdigest()
+            cls._dicFileHash[tId] = sHash
+        # endif
+
+        return sHash
+
+    # enddef
+
+    # ##############################################################################
+    def GetKey(self, _pathFile: Path, _dicParams: dict) -> str:
+        """Get the cache key of an import.
+
+        Args:
+            _pathFile (Path): The imported file.
+            _dicParams (dict): The import parameters. Must be serializable to JSON.
+
+        Returns:
+            str: The cache key.
+        """
+        lFileHashes: list[str] = [CImportCache.GetFileHash(_pathFile)]
+        for sSuffix in CImportCache._dicSideFileSuffix.get(_pathFile.suffix, []):
+            pathSide = _pathFile.with_suffix(sSuffix)
+            if pathSide.exists():
+                lFileHashes.append(CImportCache.GetFileHash(pathSide))
+            # endif
+        # endfor
+
+        dicKey = {
+            "lFileHashes": lFileHashes,
+            "sSuffix": _pathFile.suffix,
+            "lBlenderVersion": list(bpy.app.version),
+            "dicParams": _dicParams,
+        }
+        sKey = json.dumps(dicKey, sort_keys=True)
+        return hashlib.sha256(sKey.encode("utf-8")).hexdigest()
+
+    # enddef
+
+    # ##############################################################################
+    def _GetEntryPaths(self, _sKey: str) -> tuple[Path, Path]:
+        return self._pathCache / f"{_sKey}.blend", self._pathCache / f"{_sKey}.json"
+
+    # enddef
+
+    # ##############################################################################
+    def Has(self, _sKey: str) -> bool:
+        pathBlend, pathInfo = self._GetEntryPaths(_sKey)
+        return pathBlend.exists() and pathInfo.exists()
+
+    # enddef
+
+    # ##############################################################################
+    def Store(
+        self,
+        _sKey: str,
+        _lObjects: list[str],
+        *,
+        _lChildren: Optional[list[str]] = None,
+        _pathSource: Optional[Path] = None,
+    ):
+        """Store the given objects, with all data they depend on, as cache entry.
+
+        Args:
+            _sKey (str): The cache key.
+            _lObjects (list[str]): Names of the objects to store.
+            _lChildren (list[str], optional): Names of all descendants of the objects. These are stored
+                                              and loaded with the objects, but not returned by 'Load()'.
+            _pathSource (Path, optional): The imported file, stored for reference.
+        """
+        lChildren: list[str] = [] if _lChildren is None else [x for x in _lChildren if x not in _lObjects]
+        self._pathCache.mkdir(parents=True, exist_ok=True)
+        pathBlend, pathInfo = self._GetEntryPaths(_sKey)
+        sTmpId = f"{os.getpid()}.tmp"
+
+        setIds = set(bpy.data.objects[x] for x in _lObjects + lChildren)
+        pathTmpBlend = pathBlend.with_suffix(f".{sTmpId}.blend")
+        bpy.data.libraries.write(pathTmpBlend.as_posix(), setIds, path_remap="ABSOLUTE", compress=True)
+        os.replace(pathTmpBlend, pathBlend)
+
+        dicInfo = {
+            "lObjects": list(_lObjects),
+            "lChildren": lChildren,
+            "sSource": None if _pathSource is None else _pathSource.as_posix(),
+        }
+        pathTmpInfo = pathInfo.with_suffix(f".{sTmpId}.json")
+        with pathTmpInfo.open("w") as xFile:
+            json.dump(dicInfo, xFile, indent=4)
+        # endwith
+        os.replace(pathTmpInfo, pathInfo)
+
+    # enddef
+
+    # ##############################################################################
+    def Load(self, _sKey: str, *, _clnTarget: bpy.types.Collection, _bLink: bool = False) -> Optional[list[str]]:
+        """Load the objects of a cache entry, together with their children, into the given collection.
+
+        Args:
+            _sKey (str): The cache key.
+            _clnTarget (bpy.types.Collection): The collection the objects are linked to.
+            _bLink (bool, optional): If true, the object data is linked from the cache library
+                                     and only local copies of the objects are created. Otherwise,
+                                     the objects are appended with all their data. Defaults to False.
+
+        Returns:
+            Optional[list[str]]: The names of the loaded objects in the stored order,
+                                 or None, if there is no entry for the key.
+        """
+        if not self.Has(_sKey):
+            return None
+        # endif
+
+        pathBlend, pathInfo = self._GetEntryPaths(_sKey)
+        with pathInfo.open("r") as xFile:
+            dicInfo = json.load(xFile)
+        # endwith
+        lNames: list[str] = dicInfo["lObjects"]
+        lChildren: list[str] = dicInfo.get("lChildren", [])
+
+        with bpy.data.libraries.load(pathBlend.as_posix(), link=_bLink) as (xDataFrom, xDataTo):
+            lMissing = [x for x in lNames + lChildren if x not in xDataFrom.objects]
+            if len(lMissing) > 0:
+                raise RuntimeError(f"Objects {lMissing} missing in import cache file: {(pathBlend.as_posix())}")
+            # endif
+            xDataTo.objects = lNames + lChildren
+        # endwith
+
+        lObjects: list[bpy.types.Object] = list(xDataTo.objects)
+        if _bLink is True:
+            # Linked objects cannot be transformed. Local copies share the linked object data.
+            # The parents of the copies still refer to the linked objects and are replaced by their copies.
+            lLinked = lObjects
+            lObjects = [x.copy() for x in lLinked]
+            dicCopies = {objL.session_uid: objC for objL, objC in zip(lLinked, lObjects)}
+            for objX in lObjects:
+                if objX.parent is not None and objX.parent.session_uid in dicCopies:
+                    matParentInv = objX.matrix_parent_inverse.copy()
+                    objX.parent = dicCopies[objX.parent.session_uid]
+                    objX.matrix_parent_inverse = matParentInv
+                # endif
+            # endfor
+            bpy.data.batch_remove(ids=lLinked)
+        # endif
+
+        for objX in lObjects:
+            _clnTarget.objects.link(objX)
+        # endfor
+
+        return [x.name for x in lObjects[: len(lNames)]]
+
+    # enddef
+
+
+# endclass
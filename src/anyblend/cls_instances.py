@@ -29,19 +29,52 @@
 import bpy
 import mathutils
 import math
-import random
+import numpy as np
 
+from dataclasses import dataclass
 from typing import Optional, Union, Any, Callable
 from anyblend import collection, object
 from .cls_boundbox import CBoundingBox
 from . import viewlayer
+from . import rng
+
+
+# ################################################################################################
+def _GetRigidMatrix(_matX: mathutils.Matrix) -> mathutils.Matrix:
+    vLoc, qRot, vScale = _matX.decompose()
+    return mathutils.Matrix.Translation(vLoc) @ qRot.to_matrix().to_4x4()
+
+
+# enddef
+
+
+# ################################################################################################
+# Immutable record of the data of an instance source, which all copies of the source inherit.
+# The bounding box is stored relative to the rigid frame of the origin object, so that the
+# bounding box of a copy is obtained by a single transformation, instead of walking the object
+# hierarchy and evaluating the bounding box from scene data again.
+@dataclass(frozen=True)
+class CInstanceSource:
+    sName: str
+    # Names of the top level objects of the source
+    tObjects: tuple[str, ...]
+    # Index into tObjects of the object that defines the instance origin
+    iOriginIdx: int
+    # World scale of the origin object. A copy with a different scale cannot use the local bounding box.
+    tOriginScale: tuple[float, float, float]
+    # Bounding box in the rigid frame of the origin object. Must not be modified.
+    xBoundBoxLocal: CBoundingBox
+
+
+# endclass
 
 
 # ################################################################################################
 class _CInstance:
-    def __init__(self, *, _sName):
+    def __init__(self, *, _sName, _xSource: Optional[CInstanceSource] = None):
         self._sName = _sName
         self._xBoundBox = None
+        self._xSource: Optional[CInstanceSource] = _xSource
 
     # enddef
 
@@ -57,6 +90,63 @@ class _CInstance:
 
     # enddef
 
+    @property
+    def xSource(self) -> CInstanceSource:
+        if self._xSource is None:
+            self._xSource = self._CreateSource()
+        # endif
+        return self._xSource
+
+    # enddef
+
+    def _GetOriginObject(self) -> bpy.types.Object:
+        raise RuntimeError("Cannot obtain origin object from abstract base class")
+
+    # enddef
+
+    # #################################################################################################
+    def _CreateSource(self) -> CInstanceSource:
+        raise RuntimeError("Cannot create instance source record in abstract base class")
+
+    # enddef
+
+    # #################################################################################################
+    def _CreateSourceFromObjects(self, _lObjects: list[str], _iOriginIdx: int) -> CInstanceSource:
+        objOrig = self._GetOriginObject()
+        matOrig = objOrig.matrix_world
+        vScale = matOrig.to_scale()
+
+        return CInstanceSource(
+            sName=self.sName,
+            tObjects=tuple(_lObjects),
+            iOriginIdx=_iOriginIdx,
+            tOriginScale=tuple(vScale),
+            xBoundBoxLocal=self.xBoundBox.Transformed(_GetRigidMatrix(matOrig).inverted()),
+        )
+
+    # enddef
+
+    # #################################################################################################
+    def _InitBoundingBoxFromSource(self) -> bool:
+        """Set the bounding box from the source record, using the current transformation of the
+        origin object. Returns false, if the source record cannot be used for this instance.
+        """
+        xSrc: CInstanceSource = self._xSource
+        if xSrc is None:
+            return False
+        # endif
+
+        matOrig = self._GetOriginObject().matrix_world
+        vScale = matOrig.to_scale()
+        if any(abs(vScale[i] - xSrc.tOriginScale[i]) > 1e-6 for i in range(3)):
+            return False
+        # endif
+
+        self._xBoundBox = xSrc.xBoundBoxLocal.Transformed(_GetRigidMatrix(matOrig))
+        return True
+
+    # enddef
+
     @property
     def vOrigin(self) -> mathutils.Vector:
         raise RuntimeError("Cannot obtain vOrigin from abstract base class")
@@ -105,7 +195,7 @@ class _CInstance:
 
 # ################################################################################################
 class CObjectInstance(_CInstance):
-    def __init__(self, *, _sName: str = None, _objX=None):
+    def __init__(self, *, _sName: str = None, _objX=None, _xSource: Optional[CInstanceSource] = None):
         if _sName is None:
             if _objX is None:
                 raise RuntimeError("An object name or an object have to be given for initialization")
@@ -115,8 +205,10 @@ class CObjectInstance(_CInstance):
             sName = _sName
         # endif
 
-        super().__init__(_sName=sName)
-        self.EvalBoundingBox()
+        super().__init__(_sName=sName, _xSource=_xSource)
+        if not self._InitBoundingBoxFromSource():
+            self.EvalBoundingBox()
+        # endif
 
     # enddef
 
@@ -136,11 +228,22 @@ class CObjectInstance(_CInstance):
 
     # enddef
 
+    def _GetOriginObject(self) -> bpy.types.Object:
+        return self.xObject
+
+    # enddef
+
+    # #################################################################################################
+    def _CreateSource(self) -> CInstanceSource:
+        return self._CreateSourceFromObjects([self.sName], 0)
+
+    # enddef
+
     # #################################################################################################
     def Copy(self, *, _bLinked: bool = False, _clnTarget=None):
         objTrg = object.CopyObject(self.xObject, _bLinked=_bLinked, _bHierarchy=True, _clnTarget=_clnTarget)
 
-        return CObjectInstance(_objX=objTrg)
+        return CObjectInstance(_objX=objTrg, _xSource=self.xSource)
 
     # enddef
 
@@ -233,6 +336,8 @@ class CCollectionInstance(_CInstance):
         _clnX=None,
         _sName: str = None,
         _lObjectTypes: Optional[list[str]] = None,
+        _lObjects: Optional[list[str]] = None,
+        _xSource: Optional[CInstanceSource] = None,
     ):
         if _sName is None:
             if _clnX is None:
@@ -246,14 +351,24 @@ class CCollectionInstance(_CInstance):
                 raise RuntimeError(f"Collection '{sName}' not found")
             # endif
         # endif
-        super().__init__(_sName=sName)
+        super().__init__(_sName=sName, _xSource=_xSource)
 
         self._lObjectTypes: list[str] = _lObjectTypes
-        self._lObjects: list[str] = collection.GetCollectionObjects(
-            _clnX, _bChildren=False, _bRecursive=False, _lObjectTypes=_lObjectTypes
-        )
+        self._iOriginIdx: int = None
 
-        self.EvalBoundingBox()
+        if _lObjects is not None and _xSource is not None:
+            # The top level objects of a copy correspond one-to-one to those of the source.
+            self._lObjects: list[str] = list(_lObjects)
+            self._iOriginIdx = _xSource.iOriginIdx
+        else:
+            self._lObjects: list[str] = collection.GetCollectionObjects(
+                _clnX, _bChildren=False, _bRecursive=False, _lObjectTypes=_lObjectTypes
+            )
+        # endif
+
+        if not self._InitBoundingBoxFromSource():
+            self.EvalBoundingBox()
+        # endif
 
     # enddef
 
@@ -269,32 +384,59 @@ class CCollectionInstance(_CInstance):
 
     @property
     def vOrigin(self) -> mathutils.Vector:
-        objOrig = None
-        # Try to find first empty in list of objects
-        for sObjName in self._lObjects:
-            objX = bpy.data.objects.get(sObjName)
-            if objX.type == "EMPTY":
-                objOrig = objX
-                break
-            # endif
-        # endfor
+        return self._GetOriginObject().matrix_world.to_translation().to_3d()
+
+    # enddef
 
-        # If not empty was found, use the first object in the list
+    def _GetOriginObject(self) -> bpy.types.Object:
+        if self._iOriginIdx is None:
+            # Try to find first empty in list of objects.
+            # If no empty was found, use the first object in the list.
+            self._iOriginIdx = 0
+            for iIdx, sObjName in enumerate(self._lObjects):
+                objX = bpy.data.objects.get(sObjName)
+                if objX.type == "EMPTY":
+                    self._iOriginIdx = iIdx
+                    break
+                # endif
+            # endfor
+        # endif
+
+        sObjName = self._lObjects[self._iOriginIdx]
+        objOrig = bpy.data.objects.get(sObjName)
         if objOrig is None:
-            objOrig = bpy.data.objects.get(self._lObjects[0])
+            raise RuntimeError(f"Object '{sObjName}' not available")
         # endif
 
-        return objOrig.matrix_world.to_translation().to_3d()
+        return objOrig
+
+    # enddef
+
+    # #################################################################################################
+    def _CreateSource(self) -> CInstanceSource:
+        self._GetOriginObject()
+        return self._CreateSourceFromObjects(self._lObjects, self._iOriginIdx)
 
     # enddef
 
     # #################################################################################################
     def Copy(self, *, _bLinked: bool = False, _clnTarget=None):
+        dicObjectMap: dict[str, str] = {}
         clnTrg = object.CopyCollection(
-            self.xCollection, _bLinked=_bLinked, _bObjectHierarchy=True, _clnTarget=_clnTarget, _xContext=bpy.context
+            self.xCollection,
+            _bLinked=_bLinked,
+            _bObjectHierarchy=True,
+            _clnTarget=_clnTarget,
+            _xContext=bpy.context,
+            _dicObjectMap=dicObjectMap,
         )
 
-        return CCollectionInstance(_clnX=clnTrg, _lObjectTypes=self._lObjectTypes)
+        return CCollectionInstance(
+            _clnX=clnTrg,
+            _lObjectTypes=self._lObjectTypes,
+            _lObjects=[dicObjectMap[x] for x in self._lObjects],
+            _xSource=self.xSource,
+        )
 
     # enddef
 
@@ -508,6 +650,40 @@ class CInstances:
 
     # enddef
 
+    # ###################################################################################
+    def Hide(self, _bHide: bool = True):
+        """Hide or show all instances in one batch.
+        The layer collections of all collection instances are excluded in a single traversal,
+        and the render visibility of all object instances and their children is set with a single 'foreach_set'.
+
+        Args:
+            _bHide (bool, optional): Hide the instances if true, show them otherwise. Defaults to True.
+        """
+        lCollections: list[str] = []
+        lObjects: list[bpy.types.Object] = []
+        for xInst in self._dicElement.values():
+            if isinstance(xInst, CCollectionInstance):
+                lCollections.append(xInst.sName)
+            else:
+                objX = xInst.xObject
+                lObjects.append(objX)
+                lObjects.extend(objX.children_recursive)
+            # endif
+        # endfor
+
+        if len(lCollections) > 0:
+            collection.ExcludeCollections(bpy.context, lCollections, _bHide)
+        # endif
+
+        if len(lObjects) > 0:
+            for objX in lObjects:
+                objX.hide_set(_bHide)
+            # endfor
+            object.HideObjects(lObjects, _bHide, _sProp="hide_render")
+        # endif
+
+    # enddef
+
     # ###################################################################################
     def CreateRandomInstances(
         self,
@@ -517,6 +693,7 @@ class CInstances:
         _sName=None,
         _funcGetTargetCollection: Optional[Callable[[_CInstance, bpy.types.Collection], bpy.types.Collection]] = None,
         _funcProcInstance: Optional[Callable[[_CInstance, bpy.types.Collection], None]] = None,
+        _xRng: Optional[np.random.Generator] = None,
     ) -> "CInstances":
         if _iInstanceCount <= 0:
             raise RuntimeError(f"Invalid instance count '{_iInstanceCount}'")
@@ -542,10 +719,11 @@ class CInstances:
         # selection can be very biased. The following process avoids
         # that two consecutive random values are the same.
         # This gives a more even mix of all source objects.
-        lSelIdx = [random.randrange(0, iElCnt)]
+        xRng = rng.GetGenerator(_xRng)
+        lSelIdx = [int(xRng.integers(0, iElCnt))]
         for iIdx in range(_iInstanceCount - 1):
             while True:
-                iElIdx = random.randrange(0, iElCnt)
+                iElIdx = int(xRng.integers(0, iElCnt))
                 if iElIdx != lSelIdx[iIdx] or iElCnt == 1:
                     break
                 # endif
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_mesh_vex_cache.py
+# Created Date: Monday, October 19th 2026, 2:40:07 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import bpy
+import mathutils
+from mathutils.bvhtree import BVHTree
+import numpy as np
+from typing import Optional
+
+
+# ################################################################################################
+class _CMeshVexEntry:
+    def __init__(self, *, _iMeshUid: int, _iEvalMeshUid: int, _aVex: Optional[np.ndarray]):
+        # Session uid of the original mesh of the object
+        self.iMeshUid: int = _iMeshUid
+        # Session uid of the evaluated mesh the vertices were read from.
+        # Blender creates a new evaluated mesh whenever the geometry is re-evaluated.
+        self.iEvalMeshUid: int = _iEvalMeshUid
+        # Vertices in the mesh frame as float64 array of shape (n, 3)
+        self.aVex: np.ndarray = _aVex
+        # Transformed vertices per frame and data type.
+        # Each value is the tuple of frame matrix elements and the vertex array.
+        self.dicFrame: dict[tuple, tuple[tuple, np.ndarray]] = {}
+        # BVH tree of the evaluated mesh in the mesh frame
+        self.xBvhTree: Optional[BVHTree] = None
+
+    # enddef
+
+
+# endclass
+
+
+# ################################################################################################
+# Cache of the vertex arrays and BVH trees of evaluated mesh objects.
+# Entries are stored per original object and are only valid for the evaluated mesh they were
+# read from, which is checked on every lookup. The transformed vertices are stored per frame and
+# data type, and are recomputed from the cached mesh vertices if the frame matrix changed.
+# BVH trees are built in the mesh frame, so that they stay valid when the object is moved.
+# All returned arrays are read-only, since they are shared between callers.
+# Use 'OnDepsgraphUpdate()' from a 'depsgraph_update_post' handler to release entries of
+# objects whose geometry changed, and of objects that were deleted. Objects without modifiers
+# evaluate to their original mesh, so an edit of such a mesh is only noticed by the handler,
+# or on lookup if it changed the number of vertices.
+# The cache holds at most '_iMaxEntryCnt' entries, the least recently used ones are released first.
+class CMeshVexCache:
+    def __init__(self, *, _iMaxEntryCnt: int = 256):
+        self._dicEntry: dict[int, _CMeshVexEntry] = {}
+        self._iMaxEntryCnt: int = _iMaxEntryCnt
+        # Number of objects in the blend data when deleted objects were last released
+        self._iObjCnt: int = -1
+
+    # enddef
+
+    def __len__(self) -> int:
+        return len(self._dicEntry)
+
+    # enddef
+
+    # ##############################################################################
+    def Clear(self):
+        self._dicEntry.clear()
+
+    # enddef
+
+    # ##############################################################################
+    def InvalidateObject(self, _iObjUid: int):
+        self._dicEntry.pop(_iObjUid, None)
+
+    # enddef
+
+    # ##############################################################################
+    def InvalidateMesh(self, _iMeshUid: int):
+        lRemove = [iObjUid for iObjUid, xEntry in self._dicEntry.items() if xEntry.iMeshUid == _iMeshUid]
+        for iObjUid in lRemove:
+            del self._dicEntry[iObjUid]
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    def InvalidateDeletedObjects(self):
+        setObjUid: set[int] = {x.session_uid for x in bpy.data.objects}
+        lRemove = [iObjUid for iObjUid in self._dicEntry if iObjUid not in setObjUid]
+        for iObjUid in lRemove:
+            del self._dicEntry[iObjUid]
+        # endfor
+        self._iObjCnt = len(setObjUid)
+
+    # enddef
+
+    # ##############################################################################
+    def OnDepsgraphUpdate(self, _xDepsgraph: bpy.types.Depsgraph):
+        if len(self._dicEntry) == 0:
+            return
+        # endif
+
+        for xUpdate in _xDepsgraph.updates:
+            if xUpdate.is_updated_geometry is False:
+                continue
+            # endif
+
+            xId = xUpdate.id.original
+            if isinstance(xId, bpy.types.Object):
+                self.InvalidateObject(xId.session_uid)
+            elif isinstance(xId, bpy.types.Mesh):
+                self.InvalidateMesh(xId.session_uid)
+            # endif
+        # endfor
+
+        # Deleting objects changes the number of objects. Entries of objects that were deleted
+        # while as many others were added, are eventually released by the size limit.
+        if len(bpy.data.objects) != self._iObjCnt:
+            self.InvalidateDeletedObjects()
+        # endif
+
+    # enddef
+
+    # ##############################################################################
+    def _GetEntry(self, _objEval: bpy.types.Object) -> _CMeshVexEntry:
+        objOrig: bpy.types.Object = _objEval.original
+        meshEval: bpy.types.Mesh = _objEval.data
+        iObjUid: int = objOrig.session_uid
+
+        # Entries are moved to the end on every lookup, so that the first entries are the least recently used
+        xEntry = self._dicEntry.pop(iObjUid, None)
+        if (
+            xEntry is not None
+            and xEntry.iEvalMeshUid == meshEval.session_uid
+            and (xEntry.aVex is None or len(xEntry.aVex) == len(meshEval.vertices))
+        ):
+            self._dicEntry[iObjUid] = xEntry
+            return xEntry
+        # endif
+
+        while len(self._dicEntry) >= max(self._iMaxEntryCnt, 1):
+            del self._dicEntry[next(iter(self._dicEntry))]
+        # endwhile
+
+        xEntry = _CMeshVexEntry(_iMeshUid=objOrig.data.session_uid, _iEvalMeshUid=meshEval.session_uid, _aVex=None)
+        self._dicEntry[iObjUid] = xEntry
+        return xEntry
+
+    # enddef
+
+    # ##############################################################################
+    def _GetMeshVex(self, _objEval: bpy.types.Object, _xEntry: _CMeshVexEntry) -> np.ndarray:
+        if _xEntry.aVex is None:
+            meshEval: bpy.types.Mesh = _objEval.data
+            iVexCnt = len(meshEval.vertices)
+            aVex = np.empty(iVexCnt * 3, dtype=np.float64)
+            meshEval.vertices.foreach_get("co", aVex)
+            aVex.shape = (iVexCnt, 3)
+            aVex.flags.writeable = False
+            _xEntry.aVex = aVex
+        # endif
+
+        return _xEntry.aVex
+
+    # enddef
+
+    # ##############################################################################
+    def GetBvhTree(self, _objEval: bpy.types.Object, _xDepsgraph: bpy.types.Depsgraph) -> BVHTree:
+        """Get the BVH tree of an evaluated mesh object in the mesh frame.
+
+        Args:
+            _objEval (bpy.types.Object): The evaluated mesh object.
+            _xDepsgraph (bpy.types.Depsgraph): The depsgraph the object was evaluated with.
+
+        Returns:
+            BVHTree: The BVH tree.
+        """
+        xEntry = self._GetEntry(_objEval)
+        if xEntry.xBvhTree is None:
+            xEntry.xBvhTree = BVHTree.FromObject(_objEval, _xDepsgraph)
+        # endif
+
+        return xEntry.xBvhTree
+
+    # enddef
+
+    # ##############################################################################
+    def GetVex(
+        self, _objEval: bpy.types.Object, *, _sFrame: str, _matFrame: Optional[mathutils.Matrix], _xDType=np.float64
+    ) -> np.ndarray:
+        """Get the vertices of an evaluated mesh object.
+
+        Args:
+            _objEval (bpy.types.Object): The evaluated mesh object.
+            _sFrame (str): Name of the frame, used to distinguish the cached variants.
+            _matFrame (mathutils.Matrix, optional): The frame matrix. If None, the mesh vertices are returned.
+            _xDType (optional): The numpy data type of the returned array. Defaults to np.float64.
+
+        Returns:
+            np.ndarray: Read-only vertex array of shape (n, 3).
+        """
+        xEntry = self._GetEntry(_objEval)
+        aMeshVex = self._GetMeshVex(_objEval, xEntry)
+        xDType = np.dtype(_xDType)
+        tKey = (_sFrame, xDType.str)
+
+        if _matFrame is None:
+            tMatrix = tuple()
+        else:
+            tMatrix = tuple(x for xRow in _matFrame for x in xRow)
+        # endif
+
+        tFrame = xEntry.dicFrame.get(tKey)
+        if tFrame is not None and tFrame[0] == tMatrix:
+            return tFrame[1]
+        # endif
+
+        if _matFrame is None:
+            aVex = aMeshVex.astype(xDType, copy=False)
+        else:
+            mFrameT = np.array(_matFrame.to_3x3()).transpose()
+            mTrans = np.array(_matFrame.translation)
+            aVex = ((aMeshVex @ mFrameT) + mTrans).astype(xDType, copy=False)
+        # endif
+        aVex.flags.writeable = False
+
+        xEntry.dicFrame[tKey] = (tMatrix, aVex)
+        return aVex
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_object_hierarchy.py
+# Created Date: Monday, October 19th 2026, 1:14:52 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+import bpy
+from typing import Optional
+
+
+# ################################################################################################
+# Index of the parent/child relations of all objects in 'bpy.data.objects'.
+# Accessing 'Object.children' scans all objects of the file, so that recursive
+# hierarchy walks scale with the number of objects times the hierarchy depth.
+# This index is built with a single pass over all objects and stores the children
+# per parent session uid, in the same order as 'Object.children'.
+# The index is a snapshot for a batch of hierarchy lookups. It is rebuilt when the number
+# of objects changed or a stored child failed validation, e.g. because it was removed or
+# re-parented. New children of existing objects are not detected, so an index must not be
+# used across parenting of existing objects, unless 'Invalidate()' is called.
+class CObjectHierarchy:
+    def __init__(self):
+        self._dicChildren: dict[int, list[bpy.types.Object]] = {}
+        self._iObjectCount: int = -1
+        self._bValid: bool = False
+
+    # enddef
+
+    @property
+    def bValid(self) -> bool:
+        return self._bValid
+
+    # enddef
+
+    # ##############################################################################
+    def Invalidate(self):
+        self._dicChildren.clear()
+        self._iObjectCount = -1
+        self._bValid = False
+
+    # enddef
+
+    # ##############################################################################
+    def Build(self):
+        self.Invalidate()
+
+        xObjects = bpy.data.objects
+        for objX in xObjects:
+            objParent = objX.parent
+            if objParent is not None:
+                self._dicChildren.setdefault(objParent.session_uid, []).append(objX)
+            # endif
+        # endfor
+
+        self._iObjectCount = len(xObjects)
+        self._bValid = True
+
+    # enddef
+
+    # ##############################################################################
+    def _LookupChildren(self, _objParent: bpy.types.Object) -> Optional[list[bpy.types.Object]]:
+        iUid: int = _objParent.session_uid
+        lChildren = self._dicChildren.get(iUid)
+        if lChildren is None:
+            return []
+        # endif
+
+        try:
+            for objChild in lChildren:
+                objP = objChild.parent
+                if objP is None or objP.session_uid != iUid:
+                    return None
+                # endif
+            # endfor
+        except ReferenceError:
+            # A child object has been removed
+            return None
+        # endtry
+
+        return lChildren
+
+    # enddef
+
+    # ##############################################################################
+    def _Update(self) -> bool:
+        # Counting the objects iterates over all objects in C, which is still
+        # much faster than a single access to 'Object.children'.
+        if self._bValid is False or self._iObjectCount != len(bpy.data.objects):
+            self.Build()
+            return True
+        # endif
+        return False
+
+    # enddef
+
+    # ##############################################################################
+    def _GetChildren(self, _objParent: bpy.types.Object, _bBuilt: bool) -> tuple[list[bpy.types.Object], bool]:
+        lChildren = self._LookupChildren(_objParent)
+        if lChildren is None and _bBuilt is False:
+            self.Build()
+            _bBuilt = True
+            lChildren = self._LookupChildren(_objParent)
+        # endif
+
+        if lChildren is None:
+            return list(_objParent.children), _bBuilt
+        # endif
+
+        return list(lChildren), _bBuilt
+
+    # enddef
+
+    # ##############################################################################
+    def GetChildren(self, _objParent: bpy.types.Object) -> list[bpy.types.Object]:
+        """Get the direct children of an object.
+
+        Args:
+            _objParent (bpy.types.Object): The parent object.
+
+        Returns:
+            list[bpy.types.Object]: The children in the same order as 'Object.children'.
+        """
+        lChildren, _ = self._GetChildren(_objParent, self._Update())
+        return lChildren
+
+    # enddef
+
+    # ##############################################################################
+    def GetDescendants(self, _objParent: bpy.types.Object) -> list[bpy.types.Object]:
+        """Get all children of an object recursively.
+
+        Args:
+            _objParent (bpy.types.Object): The parent object.
+
+        Returns:
+            list[bpy.types.Object]: The descendants in depth-first order,
+                                    where each child is followed by its' own children.
+        """
+        lChildren, bBuilt = self._GetChildren(_objParent, self._Update())
+
+        lResult: list[bpy.types.Object] = []
+        lStack: list[bpy.types.Object] = list(reversed(lChildren))
+        while len(lStack) > 0:
+            objX = lStack.pop()
+            lResult.append(objX)
+            lChildren, bBuilt = self._GetChildren(objX, bBuilt)
+            lStack.extend(reversed(lChildren))
+        # endwhile
+
+        return lResult
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_oriented_box.py
+# Created Date: Monday, October 19th 2026, 7:26:40 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+import numpy as np
+
+
+# ################################################################################################
+# Oriented bounding box on numpy arrays, with the same intersection tests as 'CBoundingBox',
+# but without depending on bpy or mathutils. Use 'CBoundingBox.GetOrientedBox()' to create
+# one from a box of Blender objects.
+class COrientedBox:
+    # Signs of the half sizes along the box axes for the corners, in the order of 'CBoundingBox.lCorners'
+    aCornerSigns: np.ndarray = np.array(
+        [
+            [-1, -1, -1],
+            [-1, -1, 1],
+            [-1, 1, 1],
+            [-1, 1, -1],
+            [1, -1, -1],
+            [1, -1, 1],
+            [1, 1, 1],
+            [1, 1, -1],
+        ],
+        dtype=np.float64,
+    )
+
+    def __init__(self, *, _aCenter: np.ndarray, _aBase: np.ndarray, _aHalfSize: np.ndarray):
+        """Create an oriented box.
+
+        Args:
+            _aCenter (np.ndarray): The center of shape (3,).
+            _aBase (np.ndarray): The unit axes of the box as rows of shape (3, 3).
+            _aHalfSize (np.ndarray): The half sizes along the axes of shape (3,).
+        """
+        self.aCenter: np.ndarray = np.array(_aCenter, dtype=np.float64).reshape(3)
+        self.aBase: np.ndarray = np.array(_aBase, dtype=np.float64).reshape(3, 3)
+        self.aHalfSize: np.ndarray = np.array(_aHalfSize, dtype=np.float64).reshape(3)
+        self.fRadius: float = float(np.linalg.norm(self.aHalfSize))
+
+    # enddef
+
+    # ##############################################################################
+    @property
+    def aCorners(self) -> np.ndarray:
+        return self.aCenter + (COrientedBox.aCornerSigns * self.aHalfSize) @ self.aBase
+
+    # enddef
+
+    # ##############################################################################
+    def Move(self, _aDelta: np.ndarray):
+        self.aCenter = self.aCenter + np.asarray(_aDelta, dtype=np.float64).reshape(3)
+
+    # enddef
+
+    # ##############################################################################
+    def Moved(self, _aDelta: np.ndarray) -> "COrientedBox":
+        """Return a copy of the box moved by the given delta."""
+        return COrientedBox(_aCenter=self.aCenter + _aDelta, _aBase=self.aBase, _aHalfSize=self.aHalfSize)
+
+    # enddef
+
+    # ##############################################################################
+    def GetDelta(self, _lRelDelta: list[float]) -> np.ndarray:
+        """Get the vector from the center to a position given relative to the box size along the box axes,
+        e.g. [0, 0, -0.5] for the center of the bottom face.
+        """
+        return (np.asarray(_lRelDelta, dtype=np.float64) * 2.0 * self.aHalfSize) @ self.aBase
+
+    # enddef
+
+    # ##############################################################################
+    def AllPointsToOneSideOfBox(self, _aPoints: np.ndarray) -> bool:
+        aSep = (np.asarray(_aPoints, dtype=np.float64) - self.aCenter) @ self.aBase.T
+        return bool(np.any(np.all(aSep > self.aHalfSize, axis=0) | np.all(aSep < -self.aHalfSize, axis=0)))
+
+    # enddef
+
+    # ##############################################################################
+    @staticmethod
+    def TestIntersect(_xBoxA: "COrientedBox", _xBoxB: "COrientedBox") -> bool:
+        # If the two boxes' centers are farther away that the sum
+        # of the radii of their enclosing spheres, they cannot intersect.
+        if np.linalg.norm(_xBoxA.aCenter - _xBoxB.aCenter) > _xBoxA.fRadius + _xBoxB.fRadius:
+            return False
+        # endif
+
+        # if all corner points of one bounding box are on the outside
+        # of one of the side planes of the other bounding box, then
+        # the boxes do not intersect. Need to test in both directions.
+        if _xBoxA.AllPointsToOneSideOfBox(_xBoxB.aCorners) is True:
+            return False
+        elif _xBoxB.AllPointsToOneSideOfBox(_xBoxA.aCorners) is True:
+            return False
+        # endif
+
+        return True
+
+    # enddef
+
+    # ##############################################################################
+    def Intersects(self, _xBox: "COrientedBox") -> bool:
+        return COrientedBox.TestIntersect(self, _xBox)
+
+    # enddef
+
+    # ##############################################################################
+    @staticmethod
+    def GetIntersectCandidates(_xBox: "COrientedBox", _aCenters: np.ndarray, _aRadii: np.ndarray) -> np.ndarray:
+        """Indices of the boxes with the given centers and radii whose enclosing spheres intersect
+        the enclosing sphere of the box. Only these boxes need the full intersection test.
+        """
+        if len(_aRadii) == 0:
+            return np.empty(0, dtype=np.int64)
+        # endif
+        aDist = np.linalg.norm(np.asarray(_aCenters).reshape(-1, 3) - _xBox.aCenter, axis=1)
+        return np.flatnonzero(aDist <= _aRadii + _xBox.fRadius)
+
+    # enddef
+
+
+# endclass
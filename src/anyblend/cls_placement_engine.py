@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_placement_engine.py
+# Created Date: Monday, October 19th 2026, 7:41:18 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+# Placement of random points on weighted surfaces under distance, camera view and bounding box constraints.
+# The engine only works on numpy arrays: the surfaces in a 'CSurfaceSampler', the camera world matrix
+# and the instance and obstacle boxes as 'COrientedBox'. It does not depend on bpy or mathutils,
+# so that placements can be computed in worker processes, tested and benchmarked with a plain Python
+# interpreter, or precomputed offline. The functions in 'anyblend.points' export the scene data into it.
+#
+# Example:
+#   xSampler = CSurfaceSampler()
+#   xSampler.AddFromArrays(_sName="ground", _aVex=aVex, _lPolys=lPolys, _lWeights=lWeights)
+#   xEngine = CPlacementEngine(xSampler, _fMinDist=1.0)
+#   lPoints = xEngine.PlacePoints(10)
+
+import math
+import numpy as np
+from typing import Iterator, Optional
+
+from anyblend import rng
+from anyblend.cls_surface_sampler import CSurfaceSampler
+from anyblend.cls_oriented_box import COrientedBox
+
+
+# ################################################################################################
+class CPlacementEngine:
+    # Sampling modes:
+    #   "POLY": select a polygon with a probability given by its mean vertex weight,
+    #           and remove polygons from the selection, where a position did not fulfill the constraints.
+    #   "AREA": select polygons by their weighted area and sample uniformly on them, with up to
+    #           '_iMaxTrials' positions per point.
+    setSamplingModes: set[str] = {"POLY", "AREA"}
+
+    def __init__(
+        self,
+        _xSampler: CSurfaceSampler,
+        *,
+        _sSampling: str = "POLY",
+        _fMinDist: float = 0.0,
+        _fMaxDist: float = math.inf,
+        _fMinHorizViewAngleSep_deg: float = 0.0,
+        _bUseCameraFov: bool = False,
+        _lCamFovBorder_deg: Optional[list[float]] = None,
+        _lCamDistRange: Optional[list[float]] = None,
+        _aCamWorld: Optional[np.ndarray] = None,
+        _lCamFov_deg: Optional[list[float]] = None,
+        _iMaxTrials: int = 20,
+        _lBoxes: Optional[list[COrientedBox]] = None,
+        _aBoxAnchors: Optional[np.ndarray] = None,
+        _lObstacleBoxes: Optional[list[COrientedBox]] = None,
+        _xRng: Optional[np.random.Generator] = None,
+    ):
+        """Create a placement engine. See 'anyblend.points.GetRndPointsOnSurface()' for the constraints.
+
+        Args:
+            _xSampler (CSurfaceSampler): The surfaces to place points on.
+            _sSampling (str, optional): The sampling mode "POLY" or "AREA". Defaults to "POLY".
+            _fMinDist (float, optional): Minimal distance between points. Defaults to 0.0.
+            _fMaxDist (float, optional): Maximal distance between points. Defaults to math.inf.
+            _fMinHorizViewAngleSep_deg (float, optional): Minimal horizontal view angle separation
+                                                          of the points in degrees. Defaults to 0.0.
+            _bUseCameraFov (bool, optional): Constrain the points to the camera FoV. Defaults to False.
+            _lCamFovBorder_deg (list[float], optional): Horizontal and vertical border around the camera FoV
+                                                        in degrees. Defaults to [0.0, 0.0].
+            _lCamDistRange (list[float], optional): Minimal and maximal distance from the camera.
+                                                    Defaults to [0.0, inf].
+            _aCamWorld (np.ndarray, optional): The 4x4 camera world matrix. Defaults to None.
+            _lCamFov_deg (list[float], optional): The horizontal and vertical camera FoV in degrees.
+                                                  Defaults to None.
+            _iMaxTrials (int, optional): Maximal number of trials, see the sampling modes. Defaults to 20.
+            _lBoxes (list[COrientedBox], optional): The box of every point. If given, the boxes of
+                                                    the placed points must not intersect. Defaults to None.
+            _aBoxAnchors (np.ndarray, optional): The position in every box of shape (n, 3),
+                                                 which is moved to the placed point. Defaults to None.
+            _lObstacleBoxes (list[COrientedBox], optional): Boxes the point boxes must not intersect.
+                                                            Defaults to None.
+            _xRng (np.random.Generator, optional): The random number generator. Engines with independent
+                                                   generators can run concurrently. If None, a generator
+                                                   seeded from the global state of 'random' is used.
+                                                   Defaults to None.
+
+        Raises:
+            RuntimeError: if the constraints are inconsistent.
+        """
+        if _sSampling not in CPlacementEngine.setSamplingModes:
+            raise RuntimeError(f"Invalid sampling mode '{_sSampling}'")
+        # endif
+
+        self._xSampler: CSurfaceSampler = _xSampler
+        self._xRng: np.random.Generator = rng.GetGenerator(_xRng)
+        self._sSampling: str = _sSampling
+        self._iMaxTrials: int = _iMaxTrials
+
+        self._fMinDist: float = _fMinDist
+        self._fMaxDist: float = math.inf if _fMaxDist is None else _fMaxDist
+        self._lCamDistRange: list[float] = [0.0, math.inf] if _lCamDistRange is None else list(_lCamDistRange)
+        self._bHasDistConstraint: bool = self._fMinDist > 1e-7 or self._fMaxDist != math.inf
+        self._bHasAngleConstraint: bool = _fMinHorizViewAngleSep_deg > 1e-6
+        self._bUseCameraFov: bool = _bUseCameraFov
+        self._fMinHorizViewAngleSep_rad: float = math.radians(abs(_fMinHorizViewAngleSep_deg))
+
+        self._aCamWorldInv: Optional[np.ndarray] = None
+        self._aCamOrig: Optional[np.ndarray] = None
+        self._lCamMaxViewAngle_rad: Optional[list[float]] = None
+        if self._bHasAngleConstraint is True or self._bUseCameraFov is True:
+            if _aCamWorld is None:
+                raise RuntimeError("No camera world matrix given")
+            # endif
+
+            if self._bUseCameraFov is True and _lCamFov_deg is None:
+                raise RuntimeError("No horizontal camera field of view given")
+            # endif
+
+            if _lCamFov_deg is not None:
+                lCamFovBorder_deg = [0.0, 0.0] if _lCamFovBorder_deg is None else _lCamFovBorder_deg
+                if abs(_lCamFov_deg[0]) / 2.0 - lCamFovBorder_deg[0] <= 0.1:
+                    raise RuntimeError("Horizontal camera FoV border is too large")
+                # endif
+                if abs(_lCamFov_deg[1]) / 2.0 - lCamFovBorder_deg[1] <= 0.1:
+                    raise RuntimeError("Vertical camera FoV border is too large")
+                # endif
+                lCamFov_rad = [math.radians(abs(x)) for x in _lCamFov_deg]
+                self._lCamMaxViewAngle_rad = [
+                    lCamFov_rad[i] / 2.0 - math.radians(lCamFovBorder_deg[i]) for i in range(2)
+                ]
+            # endif
+
+            aCamWorld = np.asarray(_aCamWorld, dtype=np.float64).reshape(4, 4)
+            self._aCamWorldInv = np.linalg.inv(aCamWorld)
+            self._aCamOrig = aCamWorld[0:3, 3].copy()
+        # endif
+
+        self._lBoxes: Optional[list[COrientedBox]] = _lBoxes
+        self._aBoxAnchors: Optional[np.ndarray] = None
+        if self._lBoxes is not None:
+            if _aBoxAnchors is None or len(_aBoxAnchors) != len(_lBoxes):
+                raise RuntimeError("A box anchor is needed for every point box")
+            # endif
+            self._aBoxAnchors = np.asarray(_aBoxAnchors, dtype=np.float64).reshape(-1, 3)
+        # endif
+
+        self._lObstacleBoxes: list[COrientedBox] = [] if _lObstacleBoxes is None else list(_lObstacleBoxes)
+        self._aObstacleCenters: np.ndarray = np.array([x.aCenter for x in self._lObstacleBoxes]).reshape(-1, 3)
+        self._aObstacleRadii: np.ndarray = np.array([x.fRadius for x in self._lObstacleBoxes])
+
+        # Polygons that are left to choose from in the "POLY" sampling mode
+        self._lPlyIdx: list[int] = list(range(0, self._xSampler.iTotalPolyCount))
+
+        # State of the placed points
+        self._lPoints: list[np.ndarray] = []
+        self._lHorizViewDirs: list[np.ndarray] = []
+        self._lPlacedBoxes: list[COrientedBox] = []
+        self._lPlacedCenters: list[np.ndarray] = []
+        self._lPlacedRadii: list[float] = []
+
+    # enddef
+
+    # ##############################################################################
+    @property
+    def lPoints(self) -> list[np.ndarray]:
+        return self._lPoints
+
+    # enddef
+
+    @property
+    def xSampler(self) -> CSurfaceSampler:
+        return self._xSampler
+
+    # enddef
+
+    # ##############################################################################
+    def _GetCameraPos(self, _aPos: np.ndarray) -> np.ndarray:
+        return _aPos @ self._aCamWorldInv[0:3, 0:3].T + self._aCamWorldInv[0:3, 3]
+
+    # enddef
+
+    # ##############################################################################
+    def _GetViewAngles(self, _aPos_cam: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Horizontal and vertical view angle, i.e. the angle to the optical axis
+        # of the position projected onto the camera XZ and YZ planes
+        aHorizAngle = np.abs(np.arctan2(_aPos_cam[..., 0], -_aPos_cam[..., 2]))
+        aVertAngle = np.abs(np.arctan2(_aPos_cam[..., 1], -_aPos_cam[..., 2]))
+        return aHorizAngle, aVertAngle
+
+    # enddef
+
+    # ##############################################################################
+    def FilterPolygons(self):
+        """Weight the surface vertices by the camera FoV and distance constraints.
+        In this way, polygons outside the FoV or distance range are not used for finding positions.
+        """
+        if self._bUseCameraFov is False:
+            raise RuntimeError("Filtering polygons needs the camera FoV constraint")
+        # endif
+
+        fMaxH, fMaxV = self._lCamMaxViewAngle_rad
+        fMinDist, fMaxDist = self._lCamDistRange
+        lWeights = []
+        for xObjData in self._xSampler.lObjects:
+            aVex = np.asarray(xObjData.aVex, dtype=np.float64).reshape(-1, 3)
+            aHorizAngle, aVertAngle = self._GetViewAngles(self._GetCameraPos(aVex))
+            aCamDist = np.linalg.norm(aVex - self._aCamOrig, axis=1)
+
+            aW = np.maximum(0.0, 1.0 - np.maximum(0.0, aHorizAngle - fMaxH) / fMaxH)
+            aW *= np.maximum(0.0, 1.0 - np.maximum(0.0, aVertAngle - fMaxV) / fMaxV)
+            if fMinDist > 0.0:
+                aW *= np.maximum(0.0, 1.0 - np.maximum(0.0, fMinDist - aCamDist) / fMinDist)
+            # endif
+            if fMaxDist > 0.0 and fMaxDist != math.inf:
+                aW *= np.maximum(0.0, 1.0 - np.maximum(0.0, aCamDist - fMaxDist) / fMaxDist)
+            # endif
+            lWeights.append(aW)
+        # endfor
+
+        self._xSampler.SetVertexWeights(lWeights)
+
+    # enddef
+
+    # ##############################################################################
+    def _GetPointBox(self, _iPntIdx: int, _aPos: np.ndarray) -> COrientedBox:
+        return self._lBoxes[_iPntIdx].Moved(_aPos - self._aBoxAnchors[_iPntIdx])
+
+    # enddef
+
+    # ##############################################################################
+    def _IsBoxFree(self, _xBox: COrientedBox) -> bool:
+        # Only boxes whose enclosing spheres intersect need the full test
+        aPlacedCenters = np.array(self._lPlacedCenters).reshape(-1, 3)
+        aPlacedRadii = np.array(self._lPlacedRadii)
+        for iIdx in COrientedBox.GetIntersectCandidates(_xBox, aPlacedCenters, aPlacedRadii).tolist():
+            if _xBox.Intersects(self._lPlacedBoxes[iIdx]) is True:
+                return False
+            # endif
+        # endfor
+
+        for iIdx in COrientedBox.GetIntersectCandidates(_xBox, self._aObstacleCenters, self._aObstacleRadii).tolist():
+            if _xBox.Intersects(self._lObstacleBoxes[iIdx]) is True:
+                return False
+            # endif
+        # endfor
+
+        return True
+
+    # enddef
+
+    # ##############################################################################
+    def TestPosition(self, _iPntIdx: int, _aPos: np.ndarray) -> tuple[bool, Optional[np.ndarray]]:
+        """Test whether a position fulfills all constraints for the given point index,
+        with respect to the points placed so far.
+
+        Returns:
+            tuple[bool, Optional[np.ndarray]]: Whether all constraints are fulfilled,
+                                              and the horizontal view direction in camera coordinates.
+        """
+        aHorizViewDir_cam = None
+        if self._bHasAngleConstraint is True or self._bUseCameraFov is True:
+            aPos_cam = self._GetCameraPos(_aPos)
+            aHorizPos_cam = np.array([aPos_cam[0], 0.0, aPos_cam[2]])
+            fNorm = np.linalg.norm(aHorizPos_cam)
+            aHorizViewDir_cam = aHorizPos_cam / fNorm if fNorm > 0.0 else aHorizPos_cam
+        # endif
+
+        if self._bUseCameraFov is True:
+            fCamDist = np.linalg.norm(_aPos - self._aCamOrig)
+            fHorizAngle, fVertAngle = self._GetViewAngles(aPos_cam)
+            if not (
+                fHorizAngle <= self._lCamMaxViewAngle_rad[0]
+                and fVertAngle <= self._lCamMaxViewAngle_rad[1]
+                and fCamDist >= self._lCamDistRange[0]
+                and fCamDist <= self._lCamDistRange[1]
+            ):
+                return False, aHorizViewDir_cam
+            # endif
+        # endif
+
+        if self._bHasDistConstraint is True and len(self._lPoints) > 0:
+            aDist = np.linalg.norm(np.array(self._lPoints) - _aPos, axis=1)
+            if not np.all((aDist >= self._fMinDist) & (aDist <= self._fMaxDist)):
+                return False, aHorizViewDir_cam
+            # endif
+        # endif
+
+        if self._bHasAngleConstraint is True and len(self._lHorizViewDirs) > 0:
+            aAngle = np.arccos(np.clip(np.array(self._lHorizViewDirs) @ aHorizViewDir_cam, -1.0, 1.0))
+            if not np.all(aAngle >= self._fMinHorizViewAngleSep_rad):
+                return False, aHorizViewDir_cam
+            # endif
+        # endif
+
+        if self._lBoxes is not None:
+            if self._IsBoxFree(self._GetPointBox(_iPntIdx, _aPos)) is False:
+                return False, aHorizViewDir_cam
+            # endif
+        # endif
+
+        return True, aHorizViewDir_cam
+
+    # enddef
+
+    # ##############################################################################
+    def _AddPoint(self, _iPntIdx: int, _aPos: np.ndarray, _aHorizViewDir_cam: Optional[np.ndarray]):
+        self._lPoints.append(_aPos)
+
+        if self._lBoxes is not None:
+            xBox = self._GetPointBox(_iPntIdx, _aPos)
+            self._lPlacedBoxes.append(xBox)
+            self._lPlacedCenters.append(xBox.aCenter)
+            self._lPlacedRadii.append(xBox.fRadius)
+        # endif
+
+        if self._bHasAngleConstraint is True:
+            self._lHorizViewDirs.append(_aHorizViewDir_cam)
+        # endif
+
+    # enddef
+
+    # ##############################################################################
+    def _SelectPoly(self) -> int:
+        # Find a poly with a selection probability
+        # defined the the vertex weights.
+        for iTest in range(0, self._iMaxTrials):
+            iPlyIdx = self._lPlyIdx[self._xRng.integers(len(self._lPlyIdx))]
+
+            fWeight = self._xSampler.GetPolyWeight(iPlyIdx)
+            fRnd = self._xRng.uniform(0, self._xSampler.fMaxWeight)
+
+            if fRnd < fWeight:
+                break
+            # endif
+        # endfor test
+
+        return iPlyIdx
+
+    # enddef
+
+    # ##############################################################################
+    def PlacePoint(self, _iPntIdx: int) -> Optional[np.ndarray]:
+        """Find a position for the point with the given index, which fulfills all constraints.
+
+        Args:
+            _iPntIdx (int): The index of the point, which selects its box.
+
+        Returns:
+            Optional[np.ndarray]: The position in world coordinates, or None if no position was found.
+        """
+        if self._sSampling == "POLY":
+            # Try to find a position as long as there are polynomials to chose from
+            while len(self._lPlyIdx) > 0:
+                iPlyIdx = self._SelectPoly()
+                aPos = np.asarray(self._xSampler.GetRandomPosOnPoly(iPlyIdx, _xRng=self._xRng), dtype=np.float64)
+
+                bOK, aHorizViewDir_cam = self.TestPosition(_iPntIdx, aPos)
+                if bOK is True:
+                    self._AddPoint(_iPntIdx, aPos, aHorizViewDir_cam)
+                    return aPos
+                # endif
+
+                # Remove polynomial from polynomials to randomly choose from,
+                # so that it is not selected again.
+                self._lPlyIdx.remove(iPlyIdx)
+            # endwhile
+        else:
+            for iAttempt in range(self._iMaxTrials):
+                aPos = np.asarray(self._xSampler.SampleUniformlyByWeightAndArea(_xRng=self._xRng), dtype=np.float64)
+
+                bOK, aHorizViewDir_cam = self.TestPosition(_iPntIdx, aPos)
+                if bOK is True:
+                    self._AddPoint(_iPntIdx, aPos, aHorizViewDir_cam)
+                    return aPos
+                # endif
+            # endfor
+        # endif
+
+        return None
+
+    # enddef
+
+    # ##############################################################################
+    def PlacePoints(self, _iPntCnt: int) -> list[Optional[np.ndarray]]:
+        """Place the given number of points, see 'PlacePoint()'."""
+        return [self.PlacePoint(iPntIdx) for iPntIdx in range(_iPntCnt)]
+
+    # enddef
+
+    # ##############################################################################
+    def IterPoints(self, _iPntCnt: int) -> Iterator[tuple[int, np.ndarray]]:
+        """Place the given number of points lazily, see 'PlacePoint()'.
+        A point is only placed when the next item is requested, so the placement can be stopped at any time.
+
+        Returns:
+            Iterator[tuple[int, np.ndarray]]: The index and position of every placed point.
+                                              Points without a valid position are skipped.
+        """
+        for iPntIdx in range(_iPntCnt):
+            aPos = self.PlacePoint(iPntIdx)
+            if aPos is not None:
+                yield iPntIdx, aPos
+            # endif
+        # endfor
+
+    # enddef
+
+
+# endclass
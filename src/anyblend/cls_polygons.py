@@ -27,209 +27,20 @@
 ###
 
 import bpy
-import random
-import numpy as np
-from dataclasses import dataclass
-from typing import Optional, Tuple
-from collections.abc import Iterable
+from typing import Optional
 
 from anybase import assertion
 
 from anyblend import object
+from anyblend.cls_surface_sampler import CObjectData, CSurfaceSampler
 
+# 'CObjectData' moved to 'cls_surface_sampler' and is re-exported for existing imports from this module
+__all__ = ["CObjectData", "CPolygons"]
 
-@dataclass
-class CObjectData:
-    sName: str = None
-    lWeights: list[float] = None
-    lPoly: list[list[int]] = None
-    aVex: np.ndarray = None
-    fMaxWeight: float = None
-
-
-# endclass
-
-
-class CPolygons:
-    def __init__(self):
-        self._lObjects: list[CObjectData] = []
-        self._dicObjects: dict[str, int] = {}
-        self._iTotalPolyCount: int = 0
-        self._lAccumPolyCount: list[int] = []
-        self._fMaxWeight: float = 0.0
-        self._aDistribution: np.ndarray = None
-
-    # enddef
-
-    # ####################################################################################
-    @property
-    def iTotalPolyCount(self) -> int:
-        return self._iTotalPolyCount
-
-    # enddef
-
-    @property
-    def fMaxWeight(self) -> float:
-        return self._fMaxWeight
-
-    # enddef
-
-    @property
-    def lObjectVertexIndices(self) -> Iterable[tuple[int, CObjectData]]:
-        for xObjData in self._lObjects:
-            iVexCnt = len(xObjData.lWeights)
-            for iVexIdx in range(iVexCnt):
-                yield iVexIdx, xObjData
-            # endfor
-        # endfor
-
-    # enddef
-
-    # ####################################################################################
-    def _Update(self):
-        self._iTotalPolyCount = 0
-        self._lAccumPolyCount = [0]
-        for xData in self._lObjects:
-            iPolyCnt = len(xData.lPoly)
-            self._iTotalPolyCount += iPolyCnt
-            self._lAccumPolyCount.append(self._iTotalPolyCount)
-        # endfor
-
-    # enddef
-
-    # ####################################################################################
-    def _GetObjectPolyIdx(self, _iAbsPolyIdx) -> Tuple[int, CObjectData]:
-        if _iAbsPolyIdx < 0:
-            raise RuntimeError(f"Polynomial index '{_iAbsPolyIdx}' out of range")
-        # endif
-
-        for iObjIdx in range(1, len(self._lAccumPolyCount)):
-            if _iAbsPolyIdx < self._lAccumPolyCount[iObjIdx]:
-                iObjPolyIdx = _iAbsPolyIdx - self._lAccumPolyCount[iObjIdx - 1]
-                xData = self._lObjects[iObjIdx - 1]
-                return iObjPolyIdx, xData
-            # endif
-        # endfor
-
-        print(f"_iAbsPolxIdx: {_iAbsPolyIdx}")
-        print(f"_Accum: {self._lAccumPolyCount}")
-
-        raise RuntimeError(f"Polynomial index '{_iAbsPolyIdx}' out of range")
-
-    # enddef
-
-    # ####################################################################################
-    def GetPolyVertices(self, _iAbsPolyIdx: int) -> np.ndarray:
-        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
-        lVexIdx = xData.lPoly[iPolyIdx]
-        return xData.aVex[lVexIdx]
-
-    # enddef
-
-    # ####################################################################################
-    def GetPolyWeight(self, _iAbsPolyIdx: int) -> np.ndarray:
-        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
-        lVexIdx = xData.lPoly[iPolyIdx]
-        fWeight = sum([xData.lWeights[i] for i in lVexIdx]) / len(lVexIdx)
-        return fWeight
-
-    # enddef
-
-    # ####################################################################################
-    def GetRandomPosOnPoly(self, _iAbsPolyIdx: int) -> np.ndarray:
-        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
-        lVexIdx = xData.lPoly[iPolyIdx]
-        aVex = xData.aVex[lVexIdx]
-        lWeights = [xData.lWeights[i] * random.uniform(0.01, 1.0) for i in lVexIdx]
-        aWeights = np.array(lWeights).reshape(len(lWeights), 1)
-
-        aVex = aVex * aWeights
-        aVex = np.sum(aVex, axis=0) / np.sum(aWeights)
-
-        return aVex
-
-    # enddef
-
-    # ####################################################################################
-    def GetRandomPosOnPolyUniformlySimplex(self, _iAbsPolyIdx: int) -> np.ndarray:
-        # https://cs.stackexchange.com/questions/3227/uniform-sampling-from-a-simplex
-
-        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
-        lVexIdx = xData.lPoly[iPolyIdx]
-        aVex = xData.aVex[lVexIdx]
-        aCalculateProbs = np.zeros(len(lVexIdx) + 1)
-        aCalculateProbs[1:-1] = np.sort(np.random.uniform(size=(len(lVexIdx) - 1)))
-        aCalculateProbs[-1] = 1
-        aProbs = aCalculateProbs[1:] - aCalculateProbs[:-1]
-        aWeights = np.array([xData.lWeights[i] for i in lVexIdx])
-        aVex = aVex * aProbs[:, None] * aWeights[:, None]
-        aVex = np.sum(aVex, axis=0) / np.sum(aProbs * aWeights)
-
-        return aVex
-
-    # enddef
-
-    # ####################################################################################
-    def _CalcWeightAndAreaDistribution(self):
-        lAreas = []
-        lWeights = []
-        for xData in self._lObjects:
-            for lVexIdx in xData.lPoly:
-                lPairwiseDistances = []
-
-                lVexPairs = []
-                for i, iVexId1 in enumerate(lVexIdx):
-                    for iVexId2 in lVexIdx[i + 1 :]:
-                        lVexPairs.append((iVexId1, iVexId2))
-                    # endfor
-                # endfor
-
-                for iVexId1, iVexId2 in lVexPairs:
-                    aVecSub = xData.aVex[iVexId1] - xData.aVex[iVexId2]
-                    lPairwiseDistances.append(np.linalg.norm(aVecSub))
-                # endfor
-
-                iAreaApprox = (
-                    np.min(lPairwiseDistances)
-                    * np.median(lPairwiseDistances)
-                    * (0.5 if len(lPairwiseDistances) == 3 else 1)
-                )
-
-                lAreas.append(iAreaApprox)
-                lWeights.append(sum([xData.lWeights[i] for i in lVexIdx]) / len(lVexIdx))
-            # endfor
-        # endfor
-
-        aAreas = np.array(lAreas)
-        aWeights = np.array(lWeights)
-
-        aCumSum = np.cumsum(aAreas * aWeights)
-        # print(f"aCumSum: {aCumSum}")
-        if aCumSum.shape[0] > 0:
-            self._aDistribution = aCumSum / aCumSum[-1]
-        else:
-            self._aDistribution = aCumSum
-        # endif
-
-    # enddef
-
-    # ####################################################################################
-    def SampleUniformlyByWeightAndArea(self) -> np.ndarray:
-        if self._aDistribution is None:
-            self._CalcWeightAndAreaDistribution()
-        # endif
-
-        if self._aDistribution.shape[0] > 0:
-            iPolyId = np.argmax(np.random.uniform() < self._aDistribution)
-        else:
-            iPolyId = 0
-        # endif
-        # print(f"iPolyId: {iPolyId}")
-        return self.GetRandomPosOnPolyUniformlySimplex(iPolyId)
-        # return self.GetRandomPosOnPoly(iPolyId)
-
-    # enddef
 
+# Polygon surfaces of Blender mesh objects for random sampling.
+# The sampling itself is done by 'CSurfaceSampler' on arrays exported from the objects.
+class CPolygons(CSurfaceSampler):
     # ####################################################################################
     def AddFromObject(self, *, _sObjectName: str, _sVexGrpName: Optional[str] = None) -> bool:
         """Add polygons from a Blender mesh object
@@ -263,49 +74,19 @@ class CPolygons:
             raise RuntimeError(f"Object '{_sObjectName}' is not a mesh object")
         # endif
 
-        xData = CObjectData()
-        xData.sName = _sObjectName
-
         # Get evaluated object
         xDG = bpy.context.evaluated_depsgraph_get()
         objEval = objOrig.evaluated_get(xDG)
 
-        xData.aVex = object.GetMeshVex(objEval, sFrame="WORLD")
-        if _sVexGrpName is None:
-            xData.lWeights = [1.0 for i in range(xData.aVex.shape[0])]
-        else:
-            xData.lWeights = object.GetVertexWeights(objEval, _sVexGrpName)
+        aVex = object.GetMeshVex(objEval, sFrame="WORLD", bCopy=False)
+        lWeights = None
+        if _sVexGrpName is not None:
+            lWeights = object.GetVertexWeights(objEval, _sVexGrpName)
         # endif
 
-        mshEval = objEval.data
-        xData.lPoly = []
-
-        xData.fMaxWeight = 0.0
-        for plyX in mshEval.polygons:
-            lW = [xData.lWeights[i] for i in plyX.vertices]
-            fMax = max(lW)
-            xData.fMaxWeight = fMax if fMax > xData.fMaxWeight else xData.fMaxWeight
-
-            fSum = sum(lW)
-            if fSum > 0.0:
-                xData.lPoly.append(list(plyX.vertices))
-            # endif
-        # endfor
-        # print(f"lPoly: {xData.lPoly}")
-
-        # Check if any polygons are left after weighting
-        iPlyCnt = len(xData.lPoly)
-        if iPlyCnt == 0:
-            return False
-        # endif
-
-        self._fMaxWeight = max(self._fMaxWeight, xData.fMaxWeight)
-
-        self._dicObjects[_sObjectName] = len(self._lObjects)
-        self._lObjects.append(xData)
+        lPolys = [list(plyX.vertices) for plyX in objEval.data.polygons]
 
-        self._Update()
-        return True
+        return self.AddFromArrays(_sName=_sObjectName, _aVex=aVex, _lPolys=lPolys, _lWeights=lWeights)
 
     # enddef
 
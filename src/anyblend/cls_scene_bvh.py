@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_scene_bvh.py
+# Created Date: Monday, October 19th 2026, 3:36:52 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+import bpy
+import hashlib
+import numpy as np
+from typing import Optional
+from mathutils.bvhtree import BVHTree
+
+from .mesh import build as meshbuild
+
+
+# ################################################################################################
+class _CSceneBvhEntry:
+    def __init__(self, *, _tState: tuple, _aVex: np.ndarray, _aTris: np.ndarray):
+        # Session uids of the evaluated data and world matrices of all instances
+        self.tState: tuple = _tState
+        # World space vertices of shape (n, 3) and triangle vertex indices of shape (m, 3).
+        # Released, when the BVH tree is built.
+        self.aVex: Optional[np.ndarray] = _aVex
+        self.aTris: Optional[np.ndarray] = _aTris
+        # Hash of the geometry, which is the same in every Blender session
+        self.sFingerprint: str = hashlib.sha256(_aVex.tobytes() + _aTris.tobytes()).hexdigest()
+        # BVH tree, built on first use
+        self.xBvhTree: Optional[BVHTree] = None
+
+    # enddef
+
+
+# endclass
+
+
+# ################################################################################################
+# World space BVH tree of the evaluated geometry of a scene, for batches of ray casts
+# without going through 'Scene.ray_cast()'. The geometry can be restricted to a set of objects
+# and objects can be excluded, where the instances created by an object count as part of it.
+# As with 'Scene.ray_cast()', only objects visible in the view layer are considered.
+# The trees are cached per object filter. The cache key consists of the evaluated data and
+# the world matrix of every instance. As the session uid of evaluated data changes when it is
+# re-evaluated, the tree is rebuilt whenever the geometry or the placement of an object changes.
+class CSceneBvh:
+    # Mesh object types whose evaluated geometry is added to the tree
+    setGeometryTypes: set[str] = {"MESH", "CURVE", "SURFACE", "FONT", "META"}
+
+    # Maximal number of cached trees
+    iMaxCacheSize: int = 8
+
+    def __init__(self):
+        self._dicCache: dict[tuple, _CSceneBvhEntry] = {}
+
+    # enddef
+
+    # ##############################################################################
+    def Clear(self):
+        self._dicCache.clear()
+
+    # enddef
+
+    # ##############################################################################
+    def _GetInstances(
+        self,
+        _xDepsgraph: bpy.types.Depsgraph,
+        _setIncludeUids: Optional[frozenset[int]],
+        _setExcludeUids: frozenset[int],
+    ) -> list[tuple[bpy.types.ID, bpy.types.Object, np.ndarray]]:
+        # The objects returned by the instance iterator are only valid during the iteration.
+        # Therefore, the evaluated data and the evaluated object are stored, which persist with the depsgraph.
+        lInstances: list[tuple[bpy.types.ID, bpy.types.Object, np.ndarray]] = []
+        for xInst in _xDepsgraph.object_instances:
+            objEval: bpy.types.Object = xInst.object
+            if objEval.type not in CSceneBvh.setGeometryTypes:
+                continue
+            # endif
+
+            objOwner: bpy.types.Object = xInst.parent.original if xInst.is_instance else objEval.original
+            iOwnerUid: int = objOwner.session_uid
+            if iOwnerUid in _setExcludeUids or (_setIncludeUids is not None and iOwnerUid not in _setIncludeUids):
+                continue
+            # endif
+            if objOwner.visible_get() is False:
+                continue
+            # endif
+
+            objData: bpy.types.Object = objEval.original.evaluated_get(_xDepsgraph) if xInst.is_instance else objEval
+            lInstances.append((objEval.data, objData, np.array(xInst.matrix_world, dtype=np.float32)))
+        # endfor
+
+        return lInstances
+
+    # enddef
+
+    # ##############################################################################
+    def _GetGeometry(
+        self, _lInstances: list[tuple[bpy.types.ID, bpy.types.Object, np.ndarray]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Triangles of the same evaluated mesh are only read once for all its instances
+        dicMeshTris: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        lVex: list[np.ndarray] = []
+        lTris: list[np.ndarray] = []
+        iVexCnt: int = 0
+
+        for xData, objEval, matWorld in _lInstances:
+            if isinstance(xData, bpy.types.Mesh):
+                meshEval: bpy.types.Mesh = xData
+                tArrays = dicMeshTris.get(meshEval.session_uid)
+                if tArrays is None:
+                    tArrays = meshbuild.GetTriangleArrays(meshEval)
+                    dicMeshTris[meshEval.session_uid] = tArrays
+                # endif
+            else:
+                meshEval = objEval.to_mesh()
+                tArrays = meshbuild.GetTriangleArrays(meshEval) if meshEval is not None else None
+                objEval.to_mesh_clear()
+                if tArrays is None:
+                    continue
+                # endif
+            # endif
+
+            aVex, aTris = tArrays
+            if len(aTris) == 0:
+                continue
+            # endif
+
+            lVex.append(aVex @ matWorld[0:3, 0:3].T + matWorld[0:3, 3])
+            lTris.append(aTris + iVexCnt)
+            iVexCnt += len(aVex)
+        # endfor
+
+        if len(lTris) == 0:
+            return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int32)
+        # endif
+
+        return np.concatenate(lVex).astype(np.float32), np.concatenate(lTris)
+
+    # enddef
+
+    # ##############################################################################
+    def _GetUids(
+        self,
+        _lIncludeObjects: Optional[list[bpy.types.Object]],
+        _lExcludeObjects: Optional[list[bpy.types.Object]],
+    ) -> tuple[Optional[frozenset[int]], frozenset[int]]:
+        setIncludeUids: Optional[frozenset[int]] = None
+        if _lIncludeObjects is not None:
+            setIncludeUids = frozenset(x.original.session_uid for x in _lIncludeObjects)
+        # endif
+        setExcludeUids: frozenset[int] = frozenset()
+        if _lExcludeObjects is not None:
+            setExcludeUids = frozenset(x.original.session_uid for x in _lExcludeObjects)
+        # endif
+
+        return setIncludeUids, setExcludeUids
+
+    # enddef
+
+    # ##############################################################################
+    def _GetEntry(
+        self,
+        _xDepsgraph: Optional[bpy.types.Depsgraph],
+        _lIncludeObjects: Optional[list[bpy.types.Object]],
+        _lExcludeObjects: Optional[list[bpy.types.Object]],
+    ) -> _CSceneBvhEntry:
+        xDepsgraph = bpy.context.evaluated_depsgraph_get() if _xDepsgraph is None else _xDepsgraph
+        setIncludeUids, setExcludeUids = self._GetUids(_lIncludeObjects, _lExcludeObjects)
+
+        lInstances = self._GetInstances(xDepsgraph, setIncludeUids, setExcludeUids)
+        tFilter = (xDepsgraph.scene_eval.session_uid, setIncludeUids, setExcludeUids)
+        tState = tuple((xData.session_uid, matWorld.tobytes()) for xData, _, matWorld in lInstances)
+
+        xEntry = self._dicCache.get(tFilter)
+        if xEntry is not None and xEntry.tState == tState:
+            return xEntry
+        # endif
+
+        aVex, aTris = self._GetGeometry(lInstances)
+        xEntry = _CSceneBvhEntry(_tState=tState, _aVex=aVex, _aTris=aTris)
+        if tFilter not in self._dicCache and len(self._dicCache) >= CSceneBvh.iMaxCacheSize:
+            self._dicCache.pop(next(iter(self._dicCache)))
+        # endif
+        self._dicCache[tFilter] = xEntry
+
+        return xEntry
+
+    # enddef
+
+    # ##############################################################################
+    def GetBvhTree(
+        self,
+        *,
+        _xDepsgraph: Optional[bpy.types.Depsgraph] = None,
+        _lIncludeObjects: Optional[list[bpy.types.Object]] = None,
+        _lExcludeObjects: Optional[list[bpy.types.Object]] = None,
+    ) -> BVHTree:
+        """Get the world space BVH tree of the evaluated scene geometry.
+
+        Args:
+            _xDepsgraph (bpy.types.Depsgraph, optional): The depsgraph. Defaults to the evaluated depsgraph
+                                                         of the current context.
+            _lIncludeObjects (list[bpy.types.Object], optional): If given, only these objects and
+                                                                 the instances they create are added.
+            _lExcludeObjects (list[bpy.types.Object], optional): Objects that are not added.
+
+        Returns:
+            BVHTree: The BVH tree.
+        """
+        xEntry = self._GetEntry(_xDepsgraph, _lIncludeObjects, _lExcludeObjects)
+        if xEntry.xBvhTree is None:
+            xEntry.xBvhTree = BVHTree.FromPolygons(xEntry.aVex.tolist(), xEntry.aTris.tolist(), all_triangles=True)
+            xEntry.aVex = None
+            xEntry.aTris = None
+        # endif
+
+        return xEntry.xBvhTree
+
+    # enddef
+
+    # ##############################################################################
+    def GetFingerprint(
+        self,
+        *,
+        _xDepsgraph: Optional[bpy.types.Depsgraph] = None,
+        _lIncludeObjects: Optional[list[bpy.types.Object]] = None,
+        _lExcludeObjects: Optional[list[bpy.types.Object]] = None,
+    ) -> str:
+        """Get a hash of the geometry of the BVH tree returned by 'GetBvhTree()' for the same arguments.
+        In contrast to the session uids of the data, the hash is the same in every Blender session,
+        and can be used to identify results that depend on the scene geometry. The tree itself is not built.
+
+        Returns:
+            str: The SHA-256 hash of the world space vertices and triangles.
+        """
+        return self._GetEntry(_xDepsgraph, _lIncludeObjects, _lExcludeObjects).sFingerprint
+
+    # enddef
+
+    # ##############################################################################
+    def GetGeometry(
+        self,
+        *,
+        _xDepsgraph: Optional[bpy.types.Depsgraph] = None,
+        _lIncludeObjects: Optional[list[bpy.types.Object]] = None,
+        _lExcludeObjects: Optional[list[bpy.types.Object]] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get the world space geometry of the BVH tree returned by 'GetBvhTree()' for the same arguments,
+        e.g. to build the tree in another process.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The vertices of shape (n, 3) and triangle vertex indices of shape (m, 3).
+        """
+        xEntry = self._GetEntry(_xDepsgraph, _lIncludeObjects, _lExcludeObjects)
+        if xEntry.aVex is not None:
+            return xEntry.aVex, xEntry.aTris
+        # endif
+
+        # The arrays have been released when the tree was built
+        xDepsgraph = bpy.context.evaluated_depsgraph_get() if _xDepsgraph is None else _xDepsgraph
+        setIncludeUids, setExcludeUids = self._GetUids(_lIncludeObjects, _lExcludeObjects)
+        return self._GetGeometry(self._GetInstances(xDepsgraph, setIncludeUids, setExcludeUids))
+
+    # enddef
+
+
+# endclass
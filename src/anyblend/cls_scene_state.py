@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_scene_state.py
+# Created Date: Monday, October 19th 2026, 11:05:18 am
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+import bpy
+import mathutils
+import numpy as np
+from typing import Optional
+
+from . import collection
+
+
+# ################################################################################################
+def _GetSessionUids(_xData) -> np.ndarray:
+    aUid = np.empty(len(_xData), dtype=np.uint32)
+    _xData.foreach_get("session_uid", aUid)
+    return aUid
+
+
+# enddef
+
+
+# ################################################################################################
+def _GetBoolProp(_xData, _sProp: str) -> np.ndarray:
+    aValue = np.empty(len(_xData), dtype=bool)
+    _xData.foreach_get(_sProp, aValue)
+    return aValue
+
+
+# enddef
+
+
+# ################################################################################################
+def _GetIndicesOf(_xData, _aIdx: np.ndarray) -> list:
+    # Access by index walks the data list in C. For many indices a single iteration is faster.
+    if len(_aIdx) <= 64:
+        return [_xData[int(i)] for i in _aIdx]
+    # endif
+
+    setIdx = set(_aIdx.tolist())
+    return [x for i, x in enumerate(_xData) if i in setIdx]
+
+
+# enddef
+
+
+# ################################################################################################
+# Snapshot of the scene state, that can be restored with costs proportional to the changes.
+# Stores the set of datablocks, the viewport and render visibility flags of objects and collections,
+# the exclusion and viewport visibility of the layer collections and the object basis matrices.
+# All datablocks are identified by their session uid and read with 'foreach_get', so that
+# detecting changes is done on arrays, and only changed elements are accessed from Python.
+#
+# Example:
+#   xState = CSceneState()
+#   xState.Snapshot()
+#   ... create variation & render ...
+#   xState.Restore()
+#
+# The object visibility set with 'hide_set()' is stored per view layer and is not captured.
+class CSceneState:
+    # Data sets whose additions are removed on restore
+    lDataSets: list[str] = [
+        "objects",
+        "collections",
+        "meshes",
+        "curves",
+        "materials",
+        "textures",
+        "images",
+        "node_groups",
+        "actions",
+        "particles",
+        "lights",
+        "cameras",
+    ]
+
+    def __init__(self):
+        self._dicUids: dict[str, np.ndarray] = {}
+        self._aObjUid: np.ndarray = None
+        self._aObjHideViewport: np.ndarray = None
+        self._aObjHideRender: np.ndarray = None
+        self._aObjMatrixBasis: np.ndarray = None
+        self._aClnUid: np.ndarray = None
+        self._aClnHideViewport: np.ndarray = None
+        self._aClnHideRender: np.ndarray = None
+        self._dicLayerCollections: dict[str, tuple[bool, bool]] = {}
+        self._xContext = None
+
+    # enddef
+
+    @property
+    def bHasSnapshot(self) -> bool:
+        return self._aObjUid is not None
+
+    # enddef
+
+    # ##############################################################################
+    def _DoStoreLayerCollections(self, _xLayCol):
+        for xChild in _xLayCol.children:
+            self._dicLayerCollections[xChild.name] = (xChild.exclude, xChild.hide_viewport)
+            self._DoStoreLayerCollections(xChild)
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    def Snapshot(self, _xContext: Optional[bpy.types.Context] = None):
+        """Store the current scene state.
+
+        Args:
+            _xContext (bpy.types.Context, optional): The context whose view layer is stored. Defaults to bpy.context.
+        """
+        self._xContext = bpy.context if _xContext is None else _xContext
+
+        self._dicUids = {}
+        for sDataSet in CSceneState.lDataSets:
+            self._dicUids[sDataSet] = np.sort(_GetSessionUids(getattr(bpy.data, sDataSet)))
+        # endfor
+
+        xObjects = bpy.data.objects
+        self._aObjUid = _GetSessionUids(xObjects)
+        self._aObjHideViewport = _GetBoolProp(xObjects, "hide_viewport")
+        self._aObjHideRender = _GetBoolProp(xObjects, "hide_render")
+        self._aObjMatrixBasis = np.empty(len(xObjects) * 16, dtype=np.float32)
+        xObjects.foreach_get("matrix_basis", self._aObjMatrixBasis)
+        self._aObjMatrixBasis.shape = (len(xObjects), 16)
+
+        xCollections = bpy.data.collections
+        self._aClnUid = _GetSessionUids(xCollections)
+        self._aClnHideViewport = _GetBoolProp(xCollections, "hide_viewport")
+        self._aClnHideRender = _GetBoolProp(xCollections, "hide_render")
+
+        self._dicLayerCollections = {}
+        self._DoStoreLayerCollections(collection.GetRootLayerCollection(self._xContext))
+
+    # enddef
+
+    # ##############################################################################
+    def _RemoveAdded(self):
+        lRemove: list = []
+        for sDataSet in CSceneState.lDataSets:
+            xData = getattr(bpy.data, sDataSet)
+            aUid = _GetSessionUids(xData)
+            aIdx = np.flatnonzero(~np.isin(aUid, self._dicUids[sDataSet], assume_unique=True))
+            if len(aIdx) > 0:
+                lRemove.extend(_GetIndicesOf(xData, aIdx))
+            # endif
+        # endfor
+
+        if len(lRemove) > 0:
+            bpy.data.batch_remove(ids=lRemove)
+        # endif
+
+    # enddef
+
+    # ##############################################################################
+    def _MapToSnapshot(self, _xData, _aSnapUid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Returns the indices of the current elements that are part of the snapshot,
+        # and the corresponding indices into the snapshot arrays.
+        if len(_aSnapUid) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # endif
+
+        aUid = _GetSessionUids(_xData)
+        aSortIdx = np.argsort(_aSnapUid)
+        aPos = np.searchsorted(_aSnapUid, aUid, sorter=aSortIdx)
+        aPos = np.minimum(aPos, len(_aSnapUid) - 1)
+        aSnapIdx = aSortIdx[aPos]
+        aValid = _aSnapUid[aSnapIdx] == aUid
+
+        return np.flatnonzero(aValid), aSnapIdx[aValid]
+
+    # enddef
+
+    # ##############################################################################
+    def _RestoreBoolProp(self, _xData, _sProp: str, _aIdx: np.ndarray, _aSnapIdx: np.ndarray, _aSnap: np.ndarray):
+        aValue = _GetBoolProp(_xData, _sProp)[_aIdx]
+        aTrg = _aSnap[_aSnapIdx]
+        aChanged = np.flatnonzero(aValue != aTrg)
+        for xEl, bValue in zip(_GetIndicesOf(_xData, _aIdx[aChanged]), aTrg[aChanged].tolist()):
+            setattr(xEl, _sProp, bValue)
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    def _RestoreObjects(self):
+        xObjects = bpy.data.objects
+        aIdx, aSnapIdx = self._MapToSnapshot(xObjects, self._aObjUid)
+
+        self._RestoreBoolProp(xObjects, "hide_viewport", aIdx, aSnapIdx, self._aObjHideViewport)
+        self._RestoreBoolProp(xObjects, "hide_render", aIdx, aSnapIdx, self._aObjHideRender)
+
+        aMatrix = np.empty(len(xObjects) * 16, dtype=np.float32)
+        xObjects.foreach_get("matrix_basis", aMatrix)
+        aMatrix.shape = (len(xObjects), 16)
+        aTrg = self._aObjMatrixBasis[aSnapIdx]
+        aChanged = np.flatnonzero(np.any(aMatrix[aIdx] != aTrg, axis=1))
+        for objX, aMat in zip(_GetIndicesOf(xObjects, aIdx[aChanged]), aTrg[aChanged]):
+            # 'foreach_get' returns the matrix in column-major order
+            objX.matrix_basis = mathutils.Matrix(aMat.reshape(4, 4).T.tolist())
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    def _RestoreCollections(self):
+        xCollections = bpy.data.collections
+        aIdx, aSnapIdx = self._MapToSnapshot(xCollections, self._aClnUid)
+
+        self._RestoreBoolProp(xCollections, "hide_viewport", aIdx, aSnapIdx, self._aClnHideViewport)
+        self._RestoreBoolProp(xCollections, "hide_render", aIdx, aSnapIdx, self._aClnHideRender)
+
+    # enddef
+
+    # ##############################################################################
+    def _DoRestoreLayerCollections(self, _xLayCol):
+        for xChild in _xLayCol.children:
+            tState = self._dicLayerCollections.get(xChild.name)
+            if tState is not None:
+                bExclude, bHideViewport = tState
+                if xChild.exclude != bExclude:
+                    xChild.exclude = bExclude
+                # endif
+                if xChild.hide_viewport != bHideViewport:
+                    xChild.hide_viewport = bHideViewport
+                # endif
+            # endif
+            self._DoRestoreLayerCollections(xChild)
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    def Restore(self, *, _bRemoveAdded: bool = True):
+        """Restore the stored scene state.
+        Removes all datablocks that were added since the snapshot in one batch, and resets
+        the visibility flags, layer collection states and object transforms that were changed.
+        Datablocks that were removed since the snapshot cannot be restored.
+
+        Args:
+            _bRemoveAdded (bool, optional): If true, removes the datablocks added since the snapshot.
+        """
+        if not self.bHasSnapshot:
+            raise RuntimeError("No scene state snapshot available")
+        # endif
+
+        if _bRemoveAdded is True:
+            self._RemoveAdded()
+        # endif
+
+        self._RestoreObjects()
+        self._RestoreCollections()
+        self._DoRestoreLayerCollections(collection.GetRootLayerCollection(self._xContext))
+
+    # enddef
+
+
+# endclass
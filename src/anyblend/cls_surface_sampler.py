@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_surface_sampler.py
+# Created Date: Monday, October 19th 2026, 7:12:05 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+# Random sampling of positions on weighted polygon surfaces.
+# Only works on numpy arrays and does not depend on bpy or mathutils,
+# so that it can be used in worker processes and plain Python interpreters.
+# The random functions draw from the given generator, or from a new one seeded
+# from the global state of 'random' if none is given, see 'rng.GetGenerator()'.
+# See 'CPolygons' for adding the surfaces of Blender objects.
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from collections.abc import Iterable
+
+from anyblend import rng
+
+
+@dataclass
+class CObjectData:
+    sName: str = None
+    lWeights: list[float] = None
+    lPoly: list[list[int]] = None
+    aVex: np.ndarray = None
+    fMaxWeight: float = None
+
+
+# endclass
+
+
+class CSurfaceSampler:
+    def __init__(self):
+        self._lObjects: list[CObjectData] = []
+        self._dicObjects: dict[str, int] = {}
+        self._iTotalPolyCount: int = 0
+        self._lAccumPolyCount: list[int] = []
+        self._fMaxWeight: float = 0.0
+        self._aDistribution: np.ndarray = None
+
+    # enddef
+
+    # ####################################################################################
+    @property
+    def iTotalPolyCount(self) -> int:
+        return self._iTotalPolyCount
+
+    # enddef
+
+    @property
+    def fMaxWeight(self) -> float:
+        return self._fMaxWeight
+
+    # enddef
+
+    @property
+    def lObjects(self) -> list[CObjectData]:
+        return self._lObjects
+
+    # enddef
+
+    @property
+    def lObjectVertexIndices(self) -> Iterable[tuple[int, CObjectData]]:
+        for xObjData in self._lObjects:
+            iVexCnt = len(xObjData.lWeights)
+            for iVexIdx in range(iVexCnt):
+                yield iVexIdx, xObjData
+            # endfor
+        # endfor
+
+    # enddef
+
+    # ####################################################################################
+    def _Update(self):
+        self._iTotalPolyCount = 0
+        self._lAccumPolyCount = [0]
+        for xData in self._lObjects:
+            iPolyCnt = len(xData.lPoly)
+            self._iTotalPolyCount += iPolyCnt
+            self._lAccumPolyCount.append(self._iTotalPolyCount)
+        # endfor
+
+    # enddef
+
+    # ####################################################################################
+    def _GetObjectPolyIdx(self, _iAbsPolyIdx) -> Tuple[int, CObjectData]:
+        if _iAbsPolyIdx < 0:
+            raise RuntimeError(f"Polynomial index '{_iAbsPolyIdx}' out of range")
+        # endif
+
+        for iObjIdx in range(1, len(self._lAccumPolyCount)):
+            if _iAbsPolyIdx < self._lAccumPolyCount[iObjIdx]:
+                iObjPolyIdx = _iAbsPolyIdx - self._lAccumPolyCount[iObjIdx - 1]
+                xData = self._lObjects[iObjIdx - 1]
+                return iObjPolyIdx, xData
+            # endif
+        # endfor
+
+        print(f"_iAbsPolxIdx: {_iAbsPolyIdx}")
+        print(f"_Accum: {self._lAccumPolyCount}")
+
+        raise RuntimeError(f"Polynomial index '{_iAbsPolyIdx}' out of range")
+
+    # enddef
+
+    # ####################################################################################
+    def GetPolyVertices(self, _iAbsPolyIdx: int) -> np.ndarray:
+        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
+        lVexIdx = xData.lPoly[iPolyIdx]
+        return xData.aVex[lVexIdx]
+
+    # enddef
+
+    # ####################################################################################
+    def GetPolyWeight(self, _iAbsPolyIdx: int) -> np.ndarray:
+        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
+        lVexIdx = xData.lPoly[iPolyIdx]
+        fWeight = sum([xData.lWeights[i] for i in lVexIdx]) / len(lVexIdx)
+        return fWeight
+
+    # enddef
+
+    # ####################################################################################
+    def GetRandomPosOnPoly(self, _iAbsPolyIdx: int, *, _xRng: Optional[np.random.Generator] = None) -> np.ndarray:
+        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
+        lVexIdx = xData.lPoly[iPolyIdx]
+        aVex = xData.aVex[lVexIdx]
+        aRnd = rng.GetGenerator(_xRng).uniform(0.01, 1.0, size=len(lVexIdx))
+        aWeights = (np.array([xData.lWeights[i] for i in lVexIdx]) * aRnd).reshape(len(lVexIdx), 1)
+
+        aVex = aVex * aWeights
+        aVex = np.sum(aVex, axis=0) / np.sum(aWeights)
+
+        return aVex
+
+    # enddef
+
+    # ####################################################################################
+    def GetRandomPosOnPolyUniformlySimplex(
+        self, _iAbsPolyIdx: int, *, _xRng: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        # https://cs.stackexchange.com/questions/3227/uniform-sampling-from-a-simplex
+
+        iPolyIdx, xData = self._GetObjectPolyIdx(_iAbsPolyIdx)
+        lVexIdx = xData.lPoly[iPolyIdx]
+        aVex = xData.aVex[lVexIdx]
+        aCalculateProbs = np.zeros(len(lVexIdx) + 1)
+        aCalculateProbs[1:-1] = np.sort(rng.GetGenerator(_xRng).uniform(size=(len(lVexIdx) - 1)))
+        aCalculateProbs[-1] = 1
+        aProbs = aCalculateProbs[1:] - aCalculateProbs[:-1]
+        aWeights = np.array([xData.lWeights[i] for i in lVexIdx])
+        aVex = aVex * aProbs[:, None] * aWeights[:, None]
+        aVex = np.sum(aVex, axis=0) / np.sum(aProbs * aWeights)
+
+        return aVex
+
+    # enddef
+
+    # ####################################################################################
+    def _CalcWeightAndAreaDistribution(self):
+        lAreas = []
+        lWeights = []
+        for xData in self._lObjects:
+            for lVexIdx in xData.lPoly:
+                lPairwiseDistances = []
+
+                lVexPairs = []
+                for i, iVexId1 in enumerate(lVexIdx):
+                    for iVexId2 in lVexIdx[i + 1 :]:
+                        lVexPairs.append((iVexId1, iVexId2))
+                    # endfor
+                # endfor
+
+                for iVexId1, iVexId2 in lVexPairs:
+                    aVecSub = xData.aVex[iVexId1] - xData.aVex[iVexId2]
+                    lPairwiseDistances.append(np.linalg.norm(aVecSub))
+                # endfor
+
+                iAreaApprox = (
+                    np.min(lPairwiseDistances)
+                    * np.median(lPairwiseDistances)
+                    * (0.5 if len(lPairwiseDistances) == 3 else 1)
+                )
+
+                lAreas.append(iAreaApprox)
+                lWeights.append(sum([xData.lWeights[i] for i in lVexIdx]) / len(lVexIdx))
+            # endfor
+        # endfor
+
+        aAreas = np.array(lAreas)
+        aWeights = np.array(lWeights)
+
+        aCumSum = np.cumsum(aAreas * aWeights)
+        # print(f"aCumSum: {aCumSum}")
+        if aCumSum.shape[0] > 0:
+            self._aDistribution = aCumSum / aCumSum[-1]
+        else:
+            self._aDistribution = aCumSum
+        # endif
+
+    # enddef
+
+    # ####################################################################################
+    def SampleUniformlyByWeightAndArea(self, *, _xRng: Optional[np.random.Generator] = None) -> np.ndarray:
+        if self._aDistribution is None:
+            self._CalcWeightAndAreaDistribution()
+        # endif
+
+        xRng = rng.GetGenerator(_xRng)
+        if self._aDistribution.shape[0] > 0:
+            iPolyId = np.argmax(xRng.uniform() < self._aDistribution)
+        else:
+            iPolyId = 0
+        # endif
+        # print(f"iPolyId: {iPolyId}")
+        return self.GetRandomPosOnPolyUniformlySimplex(iPolyId, _xRng=xRng)
+        # return self.GetRandomPosOnPoly(iPolyId, _xRng=xRng)
+
+    # enddef
+
+    # ####################################################################################
+    def SetVertexWeights(self, _lWeights: list[np.ndarray]):
+        """Replace the vertex weights of all surfaces, e.g. to restrict sampling to a region.
+
+        Args:
+            _lWeights (list[np.ndarray]): The weights per vertex for every surface, in the order they were added.
+        """
+        if len(_lWeights) != len(self._lObjects):
+            raise RuntimeError(f"Expected vertex weights for {len(self._lObjects)} surfaces, got {len(_lWeights)}")
+        # endif
+
+        for xData, aWeights in zip(self._lObjects, _lWeights):
+            if len(aWeights) != len(xData.lWeights):
+                raise RuntimeError(f"Number of vertex weights does not match the vertices of surface '{xData.sName}'")
+            # endif
+            xData.lWeights = np.asarray(aWeights, dtype=np.float64).tolist()
+        # endfor
+
+        # The sampling distribution depends on the weights
+        self._aDistribution = None
+
+    # enddef
+
+    # ####################################################################################
+    def AddFromArrays(
+        self,
+        *,
+        _sName: str,
+        _aVex: np.ndarray,
+        _lPolys: list[list[int]],
+        _lWeights: Optional[list[float]] = None,
+    ) -> bool:
+        """Add a polygon surface given by arrays.
+
+        Parameters
+        ----------
+        _sName : str
+            Unique name of the surface.
+
+        _aVex : np.ndarray
+            The vertex positions of shape (n, 3) in world coordinates.
+
+        _lPolys : list[list[int]]
+            The vertex indices of every polygon.
+
+        _lWeights : list[float] (optional)
+            The weight of every vertex. If 'None', uses equal unit weights.
+
+        Raises
+        ------
+        RuntimeError
+            Surface with the same name has already been added.
+
+        Returns
+        -------
+        bool
+            False, if no polygon with a non-zero weight sum is left.
+        """
+        if _sName in self._dicObjects:
+            raise RuntimeError(f"Object '{_sName}' has already been added")
+        # endif
+
+        xData = CObjectData()
+        xData.sName = _sName
+        xData.aVex = _aVex
+        if _lWeights is None:
+            xData.lWeights = [1.0 for i in range(xData.aVex.shape[0])]
+        else:
+            xData.lWeights = list(_lWeights)
+        # endif
+
+        xData.lPoly = []
+
+        xData.fMaxWeight = 0.0
+        for lPolyVex in _lPolys:
+            lW = [xData.lWeights[i] for i in lPolyVex]
+            fMax = max(lW)
+            xData.fMaxWeight = fMax if fMax > xData.fMaxWeight else xData.fMaxWeight
+
+            fSum = sum(lW)
+            if fSum > 0.0:
+                xData.lPoly.append(list(lPolyVex))
+            # endif
+        # endfor
+        # print(f"lPoly: {xData.lPoly}")
+
+        # Check if any polygons are left after weighting
+        iPlyCnt = len(xData.lPoly)
+        if iPlyCnt == 0:
+            return False
+        # endif
+
+        self._fMaxWeight = max(self._fMaxWeight, xData.fMaxWeight)
+
+        self._dicObjects[_sName] = len(self._lObjects)
+        self._lObjects.append(xData)
+        self._aDistribution = None
+
+        self._Update()
+        return True
+
+    # enddef
+
+
+# endclass
@@ -27,7 +27,12 @@
 ###
 
 import bpy
-from typing import Union
+from typing import Union, Optional
+
+from .cls_collection_index import CCollectionIndex
+
+# Collection hierarchy indices per scene and view layer
+_dicCollectionIndex: dict[tuple[str, str], CCollectionIndex] = {}
 
 
 #################################################################
@@ -79,36 +84,73 @@ def GetRootCollection(_xContext):
 
 
 #################################################################
-def GetCollection(_sName: str, bDoThrow: bool = False) -> bpy.types.Collection:
-    clnAct = bpy.data.collections.get(_sName)
-    if clnAct is None and bDoThrow:
-        raise RuntimeError("Collection '{}' not found".format(_sName))
+def GetCollectionIndex(_xContext=None) -> CCollectionIndex:
+    """Get the collection hierarchy index of the view layer of the given context.
+    The index is built lazily on the first lookup and rebuilt when a lookup
+    finds it to be out of date.
+    """
+    if _xContext is None:
+        _xContext = bpy.context
     # endif
 
-    return clnAct
+    tKey = (_xContext.scene.name, _xContext.view_layer.name)
+    xIndex = _dicCollectionIndex.get(tKey)
+    if xIndex is None:
+        xIndex = CCollectionIndex()
+        _dicCollectionIndex[tKey] = xIndex
+    # endif
+
+    return xIndex
 
 
 # enddef
 
 
 #################################################################
-def _DoGetParentCollection(_clnStart, _clnX):
-    if _clnX.name in _clnStart.children:
-        return _clnStart
-    # endif
+def InvalidateCollectionIndex():
+    """Invalidate the collection hierarchy indices of all view layers.
+    Call this after changing the collection hierarchy outside of this module,
+    if lookups need to reflect the new first parent of elements linked to more than one collection.
+    """
+    for xIndex in _dicCollectionIndex.values():
+        xIndex.Invalidate()
+    # endfor
+
+
+# enddef
 
-    if len(_clnStart.children) == 0:
+
+#################################################################
+def _GetIndexName(_xContext, _clnX) -> Optional[str]:
+    # The root collection is referenced by 'None' in the collection index
+    if _clnX == GetRootCollection(_xContext):
         return None
     # endif
+    return _clnX.name
 
-    for clnChild in _clnStart.children:
-        clnParent = _DoGetParentCollection(clnChild, _clnX)
-        if clnParent is not None:
-            return clnParent
-        # endif
-    # endfor
 
-    return None
+# enddef
+
+
+#################################################################
+def GetLayerCollection(_xContext, _sName: str) -> Optional[bpy.types.LayerCollection]:
+    """Get the layer collection of the given name in the view layer of the context,
+    using the collection hierarchy index.
+    """
+    return GetCollectionIndex(_xContext).GetLayerCollection(GetRootLayerCollection(_xContext), _sName)
+
+
+# enddef
+
+
+#################################################################
+def GetCollection(_sName: str, bDoThrow: bool = False) -> bpy.types.Collection:
+    clnAct = bpy.data.collections.get(_sName)
+    if clnAct is None and bDoThrow:
+        raise RuntimeError("Collection '{}' not found".format(_sName))
+    # endif
+
+    return clnAct
 
 
 # enddef
@@ -120,8 +162,7 @@ def GetParentCollection(_clnX, *, _xContext=None):
         _xContext = bpy.context
     # endif
 
-    clnRoot = GetRootCollection(_xContext)
-    return _DoGetParentCollection(clnRoot, _clnX)
+    return GetCollectionIndex(_xContext).GetParentCollection(GetRootLayerCollection(_xContext), _clnX.name)
 
 
 # enddef
@@ -195,29 +236,7 @@ def FindObjectInCollection(_clX, _objX):
 
 #################################################################
 def FindCollectionOfObject(_xContext, _objX):
-    clRoot = GetRootLayerCollection(_xContext).collection
-    clX, objX = FindObjectInCollection(clRoot, _objX)
-
-    return clX
-
-
-# enddef
-
-
-#################################################################
-def _DoFindParentCollectionOfCollection(_clnParent, _clnChild):
-    if _clnChild.name in _clnParent.children:
-        return _clnParent, _clnChild
-    # endif
-
-    for clnChild in _clnParent.children:
-        clnParent, clnTheChild = _DoFindParentCollectionOfCollection(clnChild, _clnChild)
-        if clnTheChild is not None:
-            return clnParent, clnTheChild
-        # endif
-    # endfor
-
-    return None, None
+    return GetCollectionIndex(_xContext).GetCollectionOfObject(GetRootLayerCollection(_xContext), _objX.name)
 
 
 # enddef
@@ -225,10 +244,7 @@ def _DoFindParentCollectionOfCollection(_clnParent, _clnChild):
 
 #################################################################
 def FindParentCollectionOfCollection(_xContext, _clnChild) -> bpy.types.Collection:
-    clnRoot = GetRootLayerCollection(_xContext).collection
-    clnParent, clnChild = _DoFindParentCollectionOfCollection(clnRoot, _clnChild)
-
-    return clnParent
+    return GetCollectionIndex(_xContext).GetParentCollection(GetRootLayerCollection(_xContext), _clnChild.name)
 
 
 # enddef
@@ -264,7 +280,7 @@ def FindLayerCollection(_xLayCol, _sName):
 
 #################################################################
 def SetActiveCollection(_xContext, _sName):
-    xLC = FindLayerCollection(_xContext.view_layer.layer_collection, _sName)
+    xLC = GetLayerCollection(_xContext, _sName)
     if xLC is not None:
         _xContext.view_layer.active_layer_collection = xLC
     else:
@@ -277,7 +293,7 @@ def SetActiveCollection(_xContext, _sName):
 
 #################################################################
 def IsExcluded(_xContext, _sName):
-    xLC = FindLayerCollection(_xContext.view_layer.layer_collection, _sName)
+    xLC = GetLayerCollection(_xContext, _sName)
     return xLC.exclude
 
 
@@ -286,7 +302,7 @@ def IsExcluded(_xContext, _sName):
 
 #################################################################
 def ExcludeCollection(_xContext, _sName, _bExclude=True):
-    xLC = FindLayerCollection(_xContext.view_layer.layer_collection, _sName)
+    xLC = GetLayerCollection(_xContext, _sName)
     if xLC is not None:
         xLC.exclude = _bExclude
     else:
@@ -297,6 +313,117 @@ def ExcludeCollection(_xContext, _sName, _bExclude=True):
 # enddef
 
 
+#################################################################
+def _DoCollectLayerCollections(_xLayCol, _setNames: set, _lLayCol: list):
+    for xChild in _xLayCol.children:
+        if xChild.name in _setNames:
+            _lLayCol.append(xChild)
+        # endif
+        _DoCollectLayerCollections(xChild, _setNames, _lLayCol)
+    # endfor
+
+
+# enddef
+
+
+#################################################################
+def FindLayerCollections(_xContext, _xNames) -> dict[str, bpy.types.LayerCollection]:
+    """Find the layer collections of the given names with a single traversal
+    of the layer collection tree of the context's view layer.
+
+    Args:
+        _xContext (bpy.types.Context): The context.
+        _xNames (iterable): The collection names.
+
+    Returns:
+        dict: Layer collection per name. Names that were not found are not contained.
+    """
+    setNames = set(_xNames)
+    lLayCol: list = []
+    _DoCollectLayerCollections(GetRootLayerCollection(_xContext), setNames, lLayCol)
+
+    dicLayCol = {}
+    for xLayCol in lLayCol:
+        dicLayCol.setdefault(xLayCol.name, xLayCol)
+    # endfor
+
+    return dicLayCol
+
+
+# enddef
+
+
+#################################################################
+def AreExcluded(_xContext, _xNames) -> dict[str, bool]:
+    """Get the exclusion state of the layer collections with the given names.
+
+    Returns:
+        dict: Exclusion state per name.
+    """
+    dicLayCol = FindLayerCollections(_xContext, _xNames)
+    return {sName: xLayCol.exclude for sName, xLayCol in dicLayCol.items()}
+
+
+# enddef
+
+
+#################################################################
+def ExcludeCollections(_xContext, _xNames, _bExclude=True):
+    """Exclude or include the layer collections with the given names.
+    The layer collections are found with a single traversal of the layer collection tree,
+    and only those layer collections whose state changes are modified.
+
+    Args:
+        _xContext (bpy.types.Context): The context.
+        _xNames (iterable): The collection names.
+        _bExclude (bool, optional): Exclude if true, include if false. Defaults to True.
+
+    Raises:
+        Exception: If a layer collection is not found.
+    """
+    setNames = set(_xNames)
+    dicLayCol = FindLayerCollections(_xContext, setNames)
+
+    setMissing = setNames - dicLayCol.keys()
+    if len(setMissing) > 0:
+        raise Exception("Layer collection(s) not found: {0}".format(", ".join(sorted(setMissing))))
+    # endif
+
+    for xLayCol in dicLayCol.values():
+        if xLayCol.exclude != _bExclude:
+            xLayCol.exclude = _bExclude
+        # endif
+    # endfor
+
+
+# enddef
+
+
+#################################################################
+def HideCollections(_xNames, _bHide=True, *, bHideViewport=True, bHideRender=True):
+    """Set the viewport and/or render visibility flags of the given collections.
+    Only collections whose state changes are modified.
+
+    Args:
+        _xNames (iterable): The collection names.
+        _bHide (bool, optional): The value of the hide flags. Defaults to True.
+        bHideViewport (bool, optional): If true, sets 'hide_viewport'.
+        bHideRender (bool, optional): If true, sets 'hide_render'.
+    """
+    for sName in set(_xNames):
+        clnX = GetCollection(sName, bDoThrow=True)
+        if bHideViewport is True and clnX.hide_viewport != _bHide:
+            clnX.hide_viewport = _bHide
+        # endif
+        if bHideRender is True and clnX.hide_render != _bHide:
+            clnX.hide_render = _bHide
+        # endif
+    # endfor
+
+
+# enddef
+
+
 #################################################################
 def ProvideCollection(_xContext, _sName, bActivate=True, clnParent=None, bEnsureLayerCollectionExists=False):
     # There was a case, where the collection already existed but without
@@ -305,7 +432,7 @@ def ProvideCollection(_xContext, _sName, bActivate=True, clnParent=None, bEnsure
     clX = GetCollection(_sName)
 
     if bEnsureLayerCollectionExists is True:
-        clLayX = FindLayerCollection(_xContext.view_layer.layer_collection, _sName)
+        clLayX = GetLayerCollection(_xContext, _sName)
 
         if clX is None or clLayX is None:
             if clX is not None:
@@ -335,6 +462,7 @@ def CreateCollection(_xContext, _sName, bActivate=True, clnParent=None):
 
     xCollection = bpy.data.collections.new(_sName)
     xColAct.children.link(xCollection)
+    GetCollectionIndex(_xContext).AddCollection(xCollection.name, _GetIndexName(_xContext, xColAct))
 
     if bActivate:
         SetActiveCollection(_xContext, xCollection.name)
@@ -418,11 +546,14 @@ def CreateCollectionHierarchy(
 def MoveObjectToActiveCollection(_xContext, _objX, bMoveObjectHierarchy=True):
     clnAct = GetActiveCollection(_xContext)
     clnObj = FindCollectionOfObject(_xContext, _objX)
+    xIndex = GetCollectionIndex(_xContext)
+    sClnAct = _GetIndexName(_xContext, clnAct)
 
     if clnObj is not None:
         clnObj.objects.unlink(_objX)
     # endif
     clnAct.objects.link(_objX)
+    xIndex.SetObjectCollection(_objX.name, sClnAct)
 
     if bMoveObjectHierarchy is True:
         for objChild in _objX.children:
@@ -433,6 +564,7 @@ def MoveObjectToActiveCollection(_xContext, _objX, bMoveObjectHierarchy=True):
                 clnX.objects.unlink(objChild)
             # endif
             clnAct.objects.link(objChild)
+            xIndex.SetObjectCollection(objChild.name, sClnAct)
         # endfor
     # endif
 
@@ -477,24 +609,54 @@ def AddObjectToCollectionHierarchy(
 
 
 #################################################################
-def _RemoveCollection(xColl, bRecursive=True, bRemoveObjects=True):
-    # print(f"> Cln: {xColl.name}")
-    if bRemoveObjects:
-        lObj = [x for x in xColl.objects if x.users <= 1]
-        for xObj in lObj:
-            # print(f"> > Obj: {xObj.name}")
-            bpy.data.objects.remove(xObj)
-        # endfor
-        del lObj
+def _CollectCollectionTree(xColl, bRecursive, dicObjLinks: dict, lColl: list, setColl: set):
+    # Collect the collections of the tree and count for every object
+    # how often it is linked to a collection in the tree.
+    if xColl in setColl:
+        return
     # endif
+    setColl.add(xColl)
+    lColl.append(xColl)
+
+    for xObj in xColl.objects:
+        dicObjLinks[xObj] = dicObjLinks.get(xObj, 0) + 1
+    # endfor
 
     if bRecursive:
         for xChild in xColl.children:
-            _RemoveCollection(xChild, bRecursive=True, bRemoveObjects=bRemoveObjects)
+            _CollectCollectionTree(xChild, bRecursive, dicObjLinks, lColl, setColl)
         # endfor
     # endif
 
-    bpy.data.collections.remove(xColl)
+
+# enddef
+
+
+#################################################################
+def _GetObjectsUsedInTree(dicObjLinks: dict) -> list:
+    # Objects that are not used outside of the collection tree,
+    # i.e. all their users are links to collections in the tree.
+    return [x for x, iLinks in dicObjLinks.items() if x.users <= max(iLinks, 1)]
+
+
+# enddef
+
+
+#################################################################
+def _RemoveCollection(xColl, bRecursive=True, bRemoveObjects=True):
+    dicObjLinks: dict = {}
+    lColl: list = []
+    _CollectCollectionTree(xColl, bRecursive, dicObjLinks, lColl, set())
+
+    # Objects that are not used outside of the removed collections
+    # are removed together with the collections in one batch.
+    lRemove: list = []
+    if bRemoveObjects:
+        lRemove.extend(_GetObjectsUsedInTree(dicObjLinks))
+    # endif
+    lRemove.extend(lColl)
+
+    bpy.data.batch_remove(ids=lRemove)
 
 
 # enddef
@@ -537,17 +699,10 @@ def RemoveCollection(
 
 #################################################################
 def _RemoveCollectionObjects(xColl, bRecursive=True):
-    lObj = [x for x in xColl.objects if x.users <= 1]
-    for xObj in lObj:
-        bpy.data.objects.remove(xObj)
-    # endfor
-    del lObj
+    dicObjLinks: dict = {}
+    _CollectCollectionTree(xColl, bRecursive, dicObjLinks, [], set())
 
-    if bRecursive:
-        for xChild in xColl.children:
-            _RemoveCollectionObjects(xChild, bRecursive=True)
-        # endfor
-    # endif
+    bpy.data.batch_remove(ids=_GetObjectsUsedInTree(dicObjLinks))
 
 
 # enddef
@@ -575,33 +730,88 @@ def RemoveCollectionObjects(_sName, bRecursive=True, bRemoveOrphaned=True, bIgno
 
 
 #################################################################
-def FindOrphaned(lExclude=None, bIgnoreFakeUser=False):
-    lData = [
+def _GetOrphanDataSets() -> list:
+    # The first six entries must keep their order, since the result of FindOrphaned()
+    # is matched by position when it is passed as exclusion list.
+    return [
         bpy.data.objects,
         bpy.data.meshes,
         bpy.data.particles,
         bpy.data.materials,
         bpy.data.textures,
         bpy.data.images,
+        bpy.data.node_groups,
+        bpy.data.actions,
+        bpy.data.curves,
     ]
 
-    lOrphanList = []
 
-    # Loop over data sets
-    for iIdx, xData in enumerate(lData):
-        # Find orphaned elements
-        if bIgnoreFakeUser:
-            lOrphan = [x for x in xData if x.users == 0 or (x.use_fake_user and x.users == 1)]
-        else:
-            lOrphan = [x for x in xData if x.users == 0]
-        # endif
+# enddef
+
+
+#################################################################
+def _GetOrphanPurgeDataSets() -> list:
+    # Data sets in the order of their dependencies, so that datablocks
+    # which become orphaned by removing their users are removed in the same pass.
+    return [
+        bpy.data.objects,
+        bpy.data.meshes,
+        bpy.data.curves,
+        bpy.data.particles,
+        bpy.data.materials,
+        bpy.data.textures,
+        bpy.data.node_groups,
+        bpy.data.images,
+        bpy.data.actions,
+    ]
+
+
+# enddef
+
+
+#################################################################
+def _IsOrphan(_xId, _bIgnoreFakeUser: bool) -> bool:
+    if _bIgnoreFakeUser:
+        return _xId.users == 0 or (_xId.use_fake_user and _xId.users == 1)
+    # endif
+    return _xId.users == 0
+
+
+# enddef
 
-        if lExclude is not None:
-            lEx = lExclude[iIdx].get("lOrphan")
-            lOrphan = [x for x in lOrphan if x not in lEx]
-        # endif
 
-        lOrphanList.append({"xSrc": lData[iIdx], "lOrphan": lOrphan})
+#################################################################
+def _GetExcludeSet(_lExclude) -> set:
+    setExclude = set()
+    if _lExclude is not None:
+        for dicExclude in _lExclude:
+            setExclude.update(dicExclude.get("lOrphan"))
+        # endfor
+    # endif
+    return setExclude
+
+
+# enddef
+
+
+#################################################################
+def FindOrphaned(lExclude=None, bIgnoreFakeUser=False):
+    """Find the datablocks without users.
+
+    Args:
+        lExclude (list, optional): The result of a previous call to FindOrphaned().
+                                   The orphans listed there are not returned again.
+        bIgnoreFakeUser (bool, optional): If true, datablocks whose only user is the fake user are orphans.
+
+    Returns:
+        list: One dictionary per data set, with the data set under "xSrc" and the orphans under "lOrphan".
+    """
+    setExclude = _GetExcludeSet(lExclude)
+
+    lOrphanList = []
+    for xData in _GetOrphanDataSets():
+        lOrphan = [x for x in xData if _IsOrphan(x, bIgnoreFakeUser) and x not in setExclude]
+        lOrphanList.append({"xSrc": xData, "lOrphan": lOrphan})
     # endfor
 
     return lOrphanList
@@ -612,25 +822,27 @@ def FindOrphaned(lExclude=None, bIgnoreFakeUser=False):
 
 #################################################################
 def RemoveOrphaned(lExclude=None, bIgnoreFakeUser=False):
-    # Loop over all given data sets until no more orphans are found
-    while True:
-        bHasOrphans = False
+    """Remove all orphaned datablocks, until no more orphans are found.
+    The orphans of each data set are removed in one batch.
 
-        lOrphanList = FindOrphaned(lExclude=lExclude, bIgnoreFakeUser=bIgnoreFakeUser)
+    Args:
+        lExclude (list, optional): The result of a previous call to FindOrphaned().
+                                   The orphans listed there are not removed.
+        bIgnoreFakeUser (bool, optional): If true, datablocks whose only user is the fake user are removed.
+    """
+    setExclude = _GetExcludeSet(lExclude)
+    lData = _GetOrphanPurgeDataSets()
 
-        # Loop over data sets
-        for dicOrphan in lOrphanList:
-            xSrc = dicOrphan.get("xSrc")
-            lOrphan = dicOrphan.get("lOrphan")
+    # Loop over all data sets until no more orphans are found
+    while True:
+        bHasOrphans = False
 
+        for xData in lData:
+            lOrphan = [x for x in xData if _IsOrphan(x, bIgnoreFakeUser) and x not in setExclude]
             if len(lOrphan) > 0:
                 bHasOrphans = True
+                bpy.data.batch_remove(ids=lOrphan)
             # endif
-
-            # Remove all orphaned elements
-            for xEl in lOrphan:
-                xSrc.remove(xEl)
-            # endfor
         # endfor
 
         if not bHasOrphans:
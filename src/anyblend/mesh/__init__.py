@@ -28,6 +28,7 @@
 
 try:
     import _bpy
+    from . import build
     from . import surf
 except Exception:
     pass
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: /build.py
+# Created Date: Monday, October 19th 2026, 4:02:11 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+import bpy
+import numpy as np
+from typing import Optional, Union
+
+from .types import CMeshArrays
+
+
+# ################################################################################################
+def CreateGridFaces(_iRowCnt: int, _iColCnt: int, *, _bNormUp: bool = True, _iVexOffset: int = 0) -> np.ndarray:
+    """Create the quad faces of a regular grid of vertices, that are stored row by row.
+
+    Args:
+        _iRowCnt (int): Number of vertex rows.
+        _iColCnt (int): Number of vertex columns.
+        _bNormUp (bool, optional): Orientation of the faces. Defaults to True.
+        _iVexOffset (int, optional): Offset added to all vertex indices. Defaults to 0.
+
+    Returns:
+        np.ndarray: Integer array of shape ((_iRowCnt - 1) * (_iColCnt - 1), 4) with the vertex indices.
+    """
+    aIdx = np.arange(_iRowCnt * _iColCnt, dtype=np.int32).reshape(_iRowCnt, _iColCnt) + _iVexOffset
+    a00 = aIdx[:-1, :-1].ravel()
+    a01 = aIdx[:-1, 1:].ravel()
+    a11 = aIdx[1:, 1:].ravel()
+    a10 = aIdx[1:, :-1].ravel()
+
+    if _bNormUp is True:
+        return np.stack([a00, a01, a11, a10], axis=1)
+    # endif
+    return np.stack([a00, a10, a11, a01], axis=1)
+
+
+# enddef
+
+
+# ################################################################################################
+def FlattenFaces(_xFaces: Union[np.ndarray, list]) -> tuple[np.ndarray, np.ndarray]:
+    """Convert faces to a flat array of loop vertex indices and an array of face sizes.
+
+    Args:
+        _xFaces (Union[np.ndarray, list]): Either an integer array of shape (n, k) of faces with k vertices,
+                                           or a list of vertex index lists of arbitrary lengths.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The loop vertex indices and the number of vertices per face.
+    """
+    if isinstance(_xFaces, np.ndarray):
+        if _xFaces.ndim != 2:
+            raise RuntimeError(f"Face array must have two dimensions, but has {_xFaces.ndim}")
+        # endif
+        iFaceCnt, iFaceSize = _xFaces.shape
+        return _xFaces.astype(np.int32, copy=False).ravel(), np.full(iFaceCnt, iFaceSize, dtype=np.int32)
+    # endif
+
+    aSizes = np.fromiter((len(x) for x in _xFaces), dtype=np.int32, count=len(_xFaces))
+    iLoopCnt = int(aSizes.sum())
+    aLoops = np.fromiter((i for lFace in _xFaces for i in lFace), dtype=np.int32, count=iLoopCnt)
+    return aLoops, aSizes
+
+
+# enddef
+
+
+# ################################################################################################
+def _SetElementData(_xElements, _meshX: bpy.types.Mesh, _sAttrName: str, _sAttrProp: str, _sProp: str, _aData):
+    # Since Blender 4.0, vertex positions and corner vertices are stored as generic attributes,
+    # which can be copied directly. Setting them via the element properties converts each value.
+    xAttr = _meshX.attributes.get(_sAttrName)
+    if xAttr is not None:
+        xAttr.data.foreach_set(_sAttrProp, _aData)
+    else:
+        _xElements.foreach_set(_sProp, _aData)
+    # endif
+
+
+# enddef
+
+
+# ################################################################################################
+def SetSmooth(_meshX: bpy.types.Mesh, _bSmooth: bool):
+    """Set the smooth shading flag of all faces of a mesh."""
+    if _bSmooth is True and hasattr(_meshX, "shade_smooth"):
+        _meshX.shade_smooth()
+    elif _bSmooth is False and hasattr(_meshX, "shade_flat"):
+        _meshX.shade_flat()
+    elif len(_meshX.polygons) > 0:
+        _meshX.polygons.foreach_set("use_smooth", np.full(len(_meshX.polygons), _bSmooth, dtype=bool))
+    # endif
+
+
+# enddef
+
+
+# ################################################################################################
+def SetMeshData(
+    _meshX: bpy.types.Mesh,
+    _aVex: np.ndarray,
+    *,
+    _xFaces: Optional[Union[np.ndarray, list]] = None,
+    _xEdges: Optional[Union[np.ndarray, list]] = None,
+    _bSmooth: Optional[bool] = None,
+    _aFaceSizes: Optional[np.ndarray] = None,
+):
+    """Fill an empty mesh with vertices, edges and faces given as arrays.
+    This replaces 'Mesh.from_pydata()' without creating Python tuples per element.
+    All elements are set with 'foreach_set' and the edges of the faces are created by Blender.
+
+    Args:
+        _meshX (bpy.types.Mesh): The empty mesh.
+        _aVex (np.ndarray): Vertex array of shape (n, 3).
+        _xFaces (Union[np.ndarray, list], optional): Faces, as described for 'FlattenFaces()'.
+        _xEdges (Union[np.ndarray, list], optional): Loose edges as array of shape (m, 2).
+        _bSmooth (bool, optional): If not None, sets the smooth shading flag of all faces.
+        _aFaceSizes (np.ndarray, optional): If given, '_xFaces' is the flat array of loop vertex indices
+                                            and this array contains the number of loops per face.
+    """
+    if len(_meshX.vertices) > 0:
+        raise RuntimeError(f"Mesh '{_meshX.name}' is not empty")
+    # endif
+
+    aVex = np.asarray(_aVex, dtype=np.float32).reshape(-1, 3)
+    iVexCnt = aVex.shape[0]
+    _meshX.vertices.add(iVexCnt)
+    _SetElementData(_meshX.vertices, _meshX, "position", "vector", "co", aVex.ravel())
+
+    if _xEdges is not None and len(_xEdges) > 0:
+        aEdges = np.asarray(_xEdges, dtype=np.int32).reshape(-1, 2)
+        _meshX.edges.add(aEdges.shape[0])
+        _meshX.edges.foreach_set("vertices", aEdges.ravel())
+    # endif
+
+    if _xFaces is not None and len(_xFaces) > 0:
+        if _aFaceSizes is None:
+            aLoops, aSizes = FlattenFaces(_xFaces)
+        else:
+            aLoops = np.asarray(_xFaces, dtype=np.int32)
+            aSizes = np.asarray(_aFaceSizes, dtype=np.int32)
+            if int(aSizes.sum()) != aLoops.shape[0]:
+                raise RuntimeError("Face sizes do not match number of loops")
+            # endif
+        # endif
+        if aLoops.size > 0 and (aLoops.min() < 0 or aLoops.max() >= iVexCnt):
+            raise RuntimeError("Face vertex index out of range")
+        # endif
+
+        aLoopStart = np.zeros(aSizes.shape[0], dtype=np.int32)
+        np.cumsum(aSizes[:-1], out=aLoopStart[1:])
+
+        _meshX.loops.add(aLoops.shape[0])
+        _SetElementData(_meshX.loops, _meshX, ".corner_vert", "value", "vertex_index", aLoops)
+        _meshX.polygons.add(aSizes.shape[0])
+        _meshX.polygons.foreach_set("loop_start", aLoopStart)
+        # Since Blender 4.0 the face sizes are derived from the loop starts
+        if bpy.app.version[0] < 4:
+            _meshX.polygons.foreach_set("loop_total", aSizes)
+        # endif
+    # endif
+
+    _meshX.update(calc_edges=True)
+
+    if _bSmooth is not None:
+        SetSmooth(_meshX, _bSmooth)
+    # endif
+
+
+# enddef
+
+
+# ################################################################################################
+def CreateMesh(
+    _sName: str,
+    _aVex: np.ndarray,
+    *,
+    _xFaces: Optional[Union[np.ndarray, list]] = None,
+    _xEdges: Optional[Union[np.ndarray, list]] = None,
+    _bSmooth: Optional[bool] = None,
+) -> bpy.types.Mesh:
+    """Create a new mesh from vertex and face arrays. See 'SetMeshData()' for the arguments."""
+    meshX = bpy.data.meshes.new(_sName)
+    SetMeshData(meshX, _aVex, _xFaces=_xFaces, _xEdges=_xEdges, _bSmooth=_bSmooth)
+    return meshX
+
+
+# enddef
+
+
+# ################################################################################################
+def _GetElementData(_xElements, _meshX: bpy.types.Mesh, _sAttrName: str, _sAttrProp: str, _sProp: str, _aOut):
+    xAttr = _meshX.attributes.get(_sAttrName)
+    if xAttr is not None:
+        xAttr.data.foreach_get(_sAttrProp, _aOut)
+    else:
+        _xElements.foreach_get(_sProp, _aOut)
+    # endif
+
+
+# enddef
+
+
+# ################################################################################################
+def GetMeshArrays(_meshX: bpy.types.Mesh) -> CMeshArrays:
+    """Read the vertices, edges, faces, smooth flags, material indices and UV coordinates of a mesh.
+
+    Args:
+        _meshX (bpy.types.Mesh): The mesh.
+
+    Returns:
+        CMeshArrays: The mesh element arrays.
+    """
+    iVexCnt = len(_meshX.vertices)
+    iEdgeCnt = len(_meshX.edges)
+    iLoopCnt = len(_meshX.loops)
+    iFaceCnt = len(_meshX.polygons)
+
+    aVex = np.empty(iVexCnt * 3, dtype=np.float32)
+    _GetElementData(_meshX.vertices, _meshX, "position", "vector", "co", aVex)
+
+    aEdges = np.empty(iEdgeCnt * 2, dtype=np.int32)
+    _GetElementData(_meshX.edges, _meshX, ".edge_verts", "value", "vertices", aEdges)
+
+    aLoops = np.empty(iLoopCnt, dtype=np.int32)
+    _GetElementData(_meshX.loops, _meshX, ".corner_vert", "value", "vertex_index", aLoops)
+
+    aFaceSizes = np.empty(iFaceCnt, dtype=np.int32)
+    _meshX.polygons.foreach_get("loop_total", aFaceSizes)
+    aSmooth = np.empty(iFaceCnt, dtype=bool)
+    _meshX.polygons.foreach_get("use_smooth", aSmooth)
+    aMaterialIdx = np.empty(iFaceCnt, dtype=np.int32)
+    _meshX.polygons.foreach_get("material_index", aMaterialIdx)
+
+    dicUV: dict[str, np.ndarray] = {}
+    for xUvLayer in _meshX.uv_layers:
+        aUV = np.empty(iLoopCnt * 2, dtype=np.float32)
+        _GetElementData(xUvLayer.data, _meshX, xUvLayer.name, "vector", "uv", aUV)
+        dicUV[xUvLayer.name] = aUV.reshape(-1, 2)
+    # endfor
+
+    return CMeshArrays(
+        aVex=aVex.reshape(-1, 3),
+        aEdges=aEdges.reshape(-1, 2),
+        aLoops=aLoops,
+        aFaceSizes=aFaceSizes,
+        aSmooth=aSmooth,
+        aMaterialIdx=aMaterialIdx,
+        dicUV=dicUV,
+    )
+
+
+# enddef
+
+
+# ################################################################################################
+def GetTriangleArrays(_meshX: bpy.types.Mesh) -> tuple[np.ndarray, np.ndarray]:
+    """Read the vertices and the loop triangles of a mesh.
+
+    Args:
+        _meshX (bpy.types.Mesh): The mesh.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The vertices of shape (n, 3) and the vertex indices
+                                       of the triangles of shape (m, 3).
+    """
+    aVex = np.empty(len(_meshX.vertices) * 3, dtype=np.float32)
+    _GetElementData(_meshX.vertices, _meshX, "position", "vector", "co", aVex)
+
+    aTris = np.empty(len(_meshX.loop_triangles) * 3, dtype=np.int32)
+    _meshX.loop_triangles.foreach_get("vertices", aTris)
+
+    return aVex.reshape(-1, 3), aTris.reshape(-1, 3)
+
+
+# enddef
+
+
+# ################################################################################################
+def GetEdgeArrays(_meshX: bpy.types.Mesh) -> tuple[np.ndarray, np.ndarray]:
+    """Read the vertices and the edges of a mesh.
+
+    Args:
+        _meshX (bpy.types.Mesh): The mesh.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The vertices of shape (n, 3) and the vertex indices
+                                       of the edges of shape (m, 2).
+    """
+    aVex = np.empty(len(_meshX.vertices) * 3, dtype=np.float32)
+    _GetElementData(_meshX.vertices, _meshX, "position", "vector", "co", aVex)
+
+    aEdges = np.empty(len(_meshX.edges) * 2, dtype=np.int32)
+    _GetElementData(_meshX.edges, _meshX, ".edge_verts", "value", "vertices", aEdges)
+
+    return aVex.reshape(-1, 3), aEdges.reshape(-1, 2)
+
+
+# enddef
+
+
+# ################################################################################################
+def SetMeshArrays(_meshX: bpy.types.Mesh, _xArrays: CMeshArrays):
+    """Fill an empty mesh with the given mesh element arrays.
+
+    Args:
+        _meshX (bpy.types.Mesh): The empty mesh.
+        _xArrays (CMeshArrays): The mesh element arrays.
+    """
+    SetMeshData(
+        _meshX, _xArrays.aVex, _xFaces=_xArrays.aLoops, _aFaceSizes=_xArrays.aFaceSizes, _xEdges=_xArrays.aEdges
+    )
+
+    if len(_meshX.polygons) > 0:
+        _meshX.polygons.foreach_set("use_smooth", np.asarray(_xArrays.aSmooth, dtype=bool))
+        if np.any(_xArrays.aMaterialIdx != 0):
+            _meshX.polygons.foreach_set("material_index", np.asarray(_xArrays.aMaterialIdx, dtype=np.int32))
+        # endif
+    # endif
+
+    for sUvName, aUV in _xArrays.dicUV.items():
+        xUvLayer = _meshX.uv_layers.new(name=sUvName)
+        _SetElementData(xUvLayer.data, _meshX, xUvLayer.name, "vector", "uv", np.asarray(aUV, dtype=np.float32).ravel())
+    # endfor
+
+
+# enddef
+
+
+# ################################################################################################
+# Generic attribute data types: property for 'foreach_get/set', number of components and numpy type
+_dicAttributeTypes: dict[str, tuple[str, int, type]] = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "INT32_2D": ("value", 2, np.int32),
+    "INT16_2D": ("value", 2, np.int32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+    "QUATERNION": ("value", 4, np.float32),
+    "FLOAT4X4": ("value", 16, np.float32),
+}
+
+
+# ################################################################################################
+def GetAttributeArray(_meshX: bpy.types.Mesh, _sName: str) -> Optional[tuple[str, str, np.ndarray]]:
+    """Read a generic attribute of a mesh.
+
+    Args:
+        _meshX (bpy.types.Mesh): The mesh.
+        _sName (str): The attribute name.
+
+    Returns:
+        Optional[tuple[str, str, np.ndarray]]: The data type, the domain and the values of shape
+                                               (number of elements, number of components),
+                                               or None if the data type is not supported, e.g. strings.
+    """
+    xAttr = _meshX.attributes[_sName]
+    tType = _dicAttributeTypes.get(xAttr.data_type)
+    if tType is None:
+        return None
+    # endif
+
+    sProp, iCompCnt, xDType = tType
+    aData = np.empty(len(xAttr.data) * iCompCnt, dtype=xDType)
+    xAttr.data.foreach_get(sProp, aData)
+    return xAttr.data_type, xAttr.domain, aData.reshape(-1, iCompCnt)
+
+
+# enddef
+
+
+# ################################################################################################
+def AddAttributeArray(_meshX: bpy.types.Mesh, _sName: str, _sDataType: str, _sDomain: str, _aData: np.ndarray):
+    """Add a generic attribute to a mesh and set its values. See 'GetAttributeArray()'."""
+    sProp, iCompCnt, xDType = _dicAttributeTypes[_sDataType]
+    xAttr = _meshX.attributes.get(_sName)
+    if xAttr is None or xAttr.data_type != _sDataType or xAttr.domain != _sDomain:
+        xAttr = _meshX.attributes.new(_sName, _sDataType, _sDomain)
+    # endif
+    xAttr.data.foreach_set(sProp, np.asarray(_aData, dtype=xDType).ravel())
+
+
+# enddef
+
+
+# ################################################################################################
+def GetCornerNormals(_meshX: bpy.types.Mesh) -> np.ndarray:
+    """Get the normal of every face corner, including custom normals, as array of shape (number of loops, 3)."""
+    aNormals = np.empty(len(_meshX.loops) * 3, dtype=np.float32)
+    # Since Blender 4.1, corner normals are always available
+    if hasattr(_meshX, "corner_normals"):
+        _meshX.corner_normals.foreach_get("vector", aNormals)
+    else:
+        _meshX.calc_normals_split()
+        _meshX.loops.foreach_get("normal", aNormals)
+    # endif
+    return aNormals.reshape(-1, 3)
+
+
+# enddef
+
+
+# ################################################################################################
+def GetFlippedLoopOrder(_aFaceSizes: np.ndarray) -> np.ndarray:
+    """Get the loop order that flips the winding of all faces, in the same way as 'bpy.ops.mesh.flip_normals()':
+    the first loop of each face is kept and the order of the others is reversed.
+
+    Args:
+        _aFaceSizes (np.ndarray): The number of loops per face.
+
+    Returns:
+        np.ndarray: The index of the original loop for every loop of the flipped faces.
+    """
+    aSizes = np.asarray(_aFaceSizes, dtype=np.int64)
+    aStart = np.zeros(aSizes.shape[0], dtype=np.int64)
+    np.cumsum(aSizes[:-1], out=aStart[1:])
+    aFaceIdx = np.repeat(np.arange(aSizes.shape[0]), aSizes)
+    aLocal = np.arange(int(aSizes.sum()), dtype=np.int64) - aStart[aFaceIdx]
+    return aStart[aFaceIdx] + np.where(aLocal == 0, 0, aSizes[aFaceIdx] - aLocal)
+
+
+# enddef
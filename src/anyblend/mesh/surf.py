@@ -27,6 +27,12 @@
 ###
 
 import bpy
+import math
+import numpy as np
+from pathlib import Path
+from typing import Optional, Union
+
+from . import build
 
 
 def CreateVexFaceLists(_lGrid, _dScale, _bNormUp):
@@ -70,15 +76,30 @@ def CreateVexFaceLists(_lGrid, _dScale, _bNormUp):
 # enddef
 
 
+def CreateVexFaceArrays(_xGrid, _dScale, _bNormUp):
+    """Array version of 'CreateVexFaceLists()'.
+    The grid can be given as array of shape (rows, cols, 3) or as nested lists of vectors.
+    """
+    aGrid = np.asarray(_xGrid, dtype=np.float64)
+    iRowCnt, iColCnt = aGrid.shape[0:2]
+
+    aVex = (aGrid * _dScale).reshape(-1, 3)
+    aFace = build.CreateGridFaces(iRowCnt, iColCnt, _bNormUp=_bNormUp)
+
+    return {"iRowCnt": iRowCnt, "iColCnt": iColCnt, "aVex": aVex, "aFace": aFace}
+
+
+# enddef
+
+
 def CreateSurf(_sName, _lGrid, _dMeterPerUnit, _bNormUp=True):
 
     dScale = _dMeterPerUnit / bpy.context.scene.unit_settings.scale_length
 
-    dicData = CreateVexFaceLists(_lGrid, dScale, _bNormUp)
+    dicData = CreateVexFaceArrays(_lGrid, dScale, _bNormUp)
 
     # Create Mesh Datablock
-    mesh = bpy.data.meshes.new(_sName)
-    mesh.from_pydata(dicData["lVex"], [], dicData["lFace"])
+    mesh = build.CreateMesh(_sName, dicData["aVex"], _xFaces=dicData["aFace"])
 
     # Create Object and link to scene
     obj = bpy.data.objects.new(_sName, mesh)
@@ -92,74 +113,66 @@ def CreateSurf2(_sName, _lGrid1, _lGrid2, _lLocation, _sMaterial, _dMeterPerUnit
 
     dScale = _dMeterPerUnit / bpy.context.scene.unit_settings.scale_length
 
-    dicSurf1 = CreateVexFaceLists(_lGrid1, dScale, True)
-    dicSurf2 = CreateVexFaceLists(_lGrid2, dScale, False)
-
-    lVex = dicSurf1["lVex"]
-    iVexCnt1 = len(lVex)
+    dicSurf1 = CreateVexFaceArrays(_lGrid1, dScale, True)
+    dicSurf2 = CreateVexFaceArrays(_lGrid2, dScale, False)
 
-    lVex.extend(dicSurf2["lVex"])
-
-    lFace = dicSurf1["lFace"]
-
-    lFace2 = [
-        (tF[0] + iVexCnt1, tF[1] + iVexCnt1, tF[2] + iVexCnt1, tF[3] + iVexCnt1)
-        for tF in dicSurf2["lFace"]
-    ]
-    lFace.extend(lFace2)
+    iVexCnt1 = dicSurf1["aVex"].shape[0]
+    aVex = np.concatenate([dicSurf1["aVex"], dicSurf2["aVex"]], axis=0)
 
     iRowCnt1 = dicSurf1["iRowCnt"]
     iColCnt1 = dicSurf1["iColCnt"]
-    iRowCnt2 = dicSurf2["iRowCnt"]
-    iColCnt2 = dicSurf2["iColCnt"]
 
-    lSide = [
-        (iVexCnt1 + iCol, iVexCnt1 + iCol + 1, iCol + 1, iCol)
-        for iCol in range(iColCnt1 - 1)
-    ]
-    lFace.extend(lSide)
+    aCol = np.arange(iColCnt1 - 1, dtype=np.int32)
+    aRow = np.arange(iRowCnt1 - 1, dtype=np.int32)
+
+    lFace = [dicSurf1["aFace"], dicSurf2["aFace"] + iVexCnt1]
+
+    lFace.append(
+        np.stack([iVexCnt1 + aCol, iVexCnt1 + aCol + 1, aCol + 1, aCol], axis=1)
+    )
 
     iOff = (iRowCnt1 - 1) * iColCnt1
-    lSide = [
-        (
-            iOff + iCol,
-            iOff + iCol + 1,
-            iOff + iVexCnt1 + iCol + 1,
-            iOff + iVexCnt1 + iCol,
+    lFace.append(
+        np.stack(
+            [
+                iOff + aCol,
+                iOff + aCol + 1,
+                iOff + iVexCnt1 + aCol + 1,
+                iOff + iVexCnt1 + aCol,
+            ],
+            axis=1,
         )
-        for iCol in range(iColCnt1 - 1)
-    ]
-    lFace.extend(lSide)
-
-    lSide = [
-        (
-            iRow * iColCnt1,
-            (iRow + 1) * iColCnt1,
-            iVexCnt1 + (iRow + 1) * iColCnt1,
-            iVexCnt1 + iRow * iColCnt1,
+    )
+
+    lFace.append(
+        np.stack(
+            [
+                aRow * iColCnt1,
+                (aRow + 1) * iColCnt1,
+                iVexCnt1 + (aRow + 1) * iColCnt1,
+                iVexCnt1 + aRow * iColCnt1,
+            ],
+            axis=1,
         )
-        for iRow in range(iRowCnt1 - 1)
-    ]
-    lFace.extend(lSide)
+    )
 
     iOff = iColCnt1 - 1
-    lSide = [
-        (
-            iOff + iVexCnt1 + (iRow) * iColCnt1,
-            iOff + iVexCnt1 + (iRow + 1) * iColCnt1,
-            iOff + (iRow + 1) * iColCnt1,
-            iOff + (iRow) * iColCnt1,
+    lFace.append(
+        np.stack(
+            [
+                iOff + iVexCnt1 + aRow * iColCnt1,
+                iOff + iVexCnt1 + (aRow + 1) * iColCnt1,
+                iOff + (aRow + 1) * iColCnt1,
+                iOff + aRow * iColCnt1,
+            ],
+            axis=1,
         )
-        for iRow in range(iRowCnt1 - 1)
-    ]
-    lFace.extend(lSide)
+    )
 
     # Create Mesh Datablock
-    mesh = bpy.data.meshes.new(_sName)
-    mesh.from_pydata(lVex, [], lFace)
-    for xFace in mesh.polygons:
-        xFace.use_smooth = True
-    # endfor
+    mesh = build.CreateMesh(
+        _sName, aVex, _xFaces=np.concatenate(lFace, axis=0), _bSmooth=True
+    )
 
     # Create Object and link to scene
     obj = bpy.data.objects.new(_sName, mesh)
@@ -175,3 +188,181 @@ def CreateSurf2(_sName, _lGrid1, _lGrid2, _lLocation, _sMaterial, _dMeterPerUnit
 
 
 # enddef
+
+
+def LoadHeightfield(_xPath, *, _tShape=None, _sDType="float32", _iOffset=0):
+    """Memory-map a heightfield file. Only the parts of the grid that are accessed are read from disk.
+
+    Args:
+        _xPath (str | Path): Path to a '.npy' file, or to a raw file of heights stored row by row.
+        _tShape (tuple[int, int], optional): Number of rows and columns. Required for raw files.
+        _sDType (str, optional): Data type of the raw file. Defaults to "float32".
+        _iOffset (int, optional): Byte offset of the data in the raw file. Defaults to 0.
+
+    Returns:
+        np.ndarray: Read-only memory-mapped array of shape (rows, cols).
+    """
+    pathFile = Path(_xPath)
+    if pathFile.suffix == ".npy":
+        aHeights = np.load(pathFile, mmap_mode="r")
+    else:
+        if _tShape is None:
+            raise RuntimeError(f"Shape of raw heightfield '{pathFile}' has to be given")
+        # endif
+        aHeights = np.memmap(
+            pathFile, dtype=_sDType, mode="r", offset=_iOffset, shape=tuple(_tShape)
+        )
+    # endif
+
+    if aHeights.ndim != 2:
+        raise RuntimeError(
+            f"Heightfield '{pathFile}' must have two dimensions, but has {aHeights.ndim}"
+        )
+    # endif
+
+    return aHeights
+
+
+# enddef
+
+
+def _GetTileStep(_fDist, _lLodDistances):
+    iStep = 1
+    if _lLodDistances is not None:
+        for fLodDist in _lLodDistances:
+            if _fDist > fLodDist:
+                iStep *= 2
+            # endif
+        # endfor
+    # endif
+    return iStep
+
+
+# enddef
+
+
+def _GetTileIndices(_iStart, _iEnd, _iStep):
+    # Sample the range with the given step, always including the end,
+    # so that the borders of neighboring tiles coincide.
+    aIdx = np.arange(_iStart, _iEnd + 1, _iStep)
+    if aIdx[-1] != _iEnd:
+        aIdx = np.append(aIdx, _iEnd)
+    # endif
+    return aIdx
+
+
+# enddef
+
+
+def CreateSurfTiles(
+    _sName,
+    _xHeights: Union[np.ndarray, str, Path],
+    _dMeterPerUnit,
+    *,
+    _fCellSize: float = 1.0,
+    _iTileSize: int = 256,
+    _lCameraLocation: Optional[list[float]] = None,
+    _lLodDistances: Optional[list[float]] = None,
+    _bNormUp: bool = True,
+    _clnTarget: Optional[bpy.types.Collection] = None,
+) -> list[str]:
+    """Create a surface from a heightfield as a set of tile objects.
+    Each tile only reads its part of the heightfield, so that memory-mapped heightfields
+    that do not fit into memory can be used. Tiles can be created at reduced resolution,
+    depending on their distance to a camera location. Neighboring tiles share their border
+    vertices. At a change of resolution between tiles, the finer tile has border vertices that
+    are not part of the coarser tile, which can cause small cracks.
+
+    Args:
+        _sName (str): Name of the collection that contains the tiles, and prefix of the tile names.
+        _xHeights (np.ndarray | str | Path): Heights of shape (rows, cols) in heightfield units or path to a
+                                             heightfield file, that is loaded with 'LoadHeightfield()'.
+                                             Rows are along the y-axis, columns along the x-axis.
+        _dMeterPerUnit (float): Meters per heightfield unit. Heights and cell size are multiplied with it,
+                                and divided by the unit scale of the scene, to give Blender units.
+        _fCellSize (float, optional): Distance between grid points in heightfield units. Defaults to 1.0.
+        _iTileSize (int, optional): Number of grid cells per tile side. Defaults to 256.
+        _lCameraLocation (list[float], optional): Location in world coordinates, used for the tile resolution.
+        _lLodDistances (list[float], optional): Increasing distances in world units. For each distance a tile center
+                                                is further away from the camera location, the grid step is doubled.
+        _bNormUp (bool, optional): Orientation of the faces. Defaults to True.
+        _clnTarget (bpy.types.Collection, optional): Parent collection of the tile collection.
+                                                    Defaults to the context collection.
+
+    Returns:
+        list[str]: The names of the tile objects.
+    """
+    if isinstance(_xHeights, (str, Path)):
+        aHeights = LoadHeightfield(_xHeights)
+    else:
+        aHeights = _xHeights
+    # endif
+
+    if _iTileSize < 1:
+        raise RuntimeError(f"Invalid tile size '{_iTileSize}'")
+    # endif
+
+    dScale = _dMeterPerUnit / bpy.context.scene.unit_settings.scale_length
+    fCell = _fCellSize * dScale
+
+    iRowCnt, iColCnt = aHeights.shape
+    iTileRowCnt = max(1, math.ceil((iRowCnt - 1) / _iTileSize))
+    iTileColCnt = max(1, math.ceil((iColCnt - 1) / _iTileSize))
+
+    clnParent = bpy.context.collection if _clnTarget is None else _clnTarget
+    clnTiles = bpy.data.collections.new(_sName)
+    clnParent.children.link(clnTiles)
+
+    if _lCameraLocation is not None:
+        aCam = np.array(_lCameraLocation[0:2], dtype=np.float64)
+    else:
+        aCam = None
+    # endif
+
+    lNames = []
+    for iTileRow in range(iTileRowCnt):
+        iRow0 = iTileRow * _iTileSize
+        iRow1 = min(iRow0 + _iTileSize, iRowCnt - 1)
+
+        for iTileCol in range(iTileColCnt):
+            iCol0 = iTileCol * _iTileSize
+            iCol1 = min(iCol0 + _iTileSize, iColCnt - 1)
+
+            iStep = 1
+            if aCam is not None:
+                aCenter = (
+                    np.array([0.5 * (iCol0 + iCol1), 0.5 * (iRow0 + iRow1)]) * fCell
+                )
+                iStep = _GetTileStep(
+                    float(np.linalg.norm(aCenter - aCam)), _lLodDistances
+                )
+            # endif
+
+            aRowIdx = _GetTileIndices(iRow0, iRow1, iStep)
+            aColIdx = _GetTileIndices(iCol0, iCol1, iStep)
+
+            # Only the sampled grid points of this tile are read from the heightfield
+            aZ = np.asarray(aHeights[np.ix_(aRowIdx, aColIdx)], dtype=np.float64)
+            aZ *= dScale
+
+            aY, aX = np.meshgrid(
+                (aRowIdx - iRow0) * fCell, (aColIdx - iCol0) * fCell, indexing="ij"
+            )
+            aVex = np.stack([aX, aY, aZ], axis=-1).reshape(-1, 3)
+            aFace = build.CreateGridFaces(len(aRowIdx), len(aColIdx), _bNormUp=_bNormUp)
+
+            sTileName = f"{_sName}_{iTileRow:03d}_{iTileCol:03d}"
+            mesh = build.CreateMesh(sTileName, aVex, _xFaces=aFace)
+            obj = bpy.data.objects.new(sTileName, mesh)
+            obj.location = (iCol0 * fCell, iRow0 * fCell, 0.0)
+            obj["anyblend_tile"] = (iTileRow, iTileCol)
+            obj["anyblend_tile_step"] = iStep
+            clnTiles.objects.link(obj)
+            lNames.append(obj.name)
+        # endfor
+    # endfor
+
+    return lNames
+
+
+# enddef
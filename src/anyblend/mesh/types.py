@@ -27,15 +27,40 @@
 ###
 
 
+import numpy as np
 from typing import Optional, Union, NamedTuple
 
 
 # ########################################################################################################
-# Mesh data. Can create a Blender object from this with 'from_pydata(lVex, lEdges, lFaces)' function.
+# Mesh data. Can create a Blender object from this with 'from_pydata(lVex, lEdges, lFaces)' function,
+# or with 'anyblend.mesh.build.SetMeshData()'. The latter also accepts numpy arrays of shape
+# (n, 3) for the vertices, (m, 2) for the edges and (k, s) for faces with s vertices each.
 class CMeshData(NamedTuple):
-    lVex: list[tuple[float, float, float]]
-    lEdges: list[list[int]]
-    lFaces: list[list[int]]
+    lVex: Union[list[tuple[float, float, float]], np.ndarray]
+    lEdges: Union[list[list[int]], np.ndarray]
+    lFaces: Union[list[list[int]], np.ndarray]
+
+
+# endclass
+
+
+# ########################################################################################################
+# Mesh element arrays as read with 'anyblend.mesh.build.GetMeshArrays()'.
+class CMeshArrays(NamedTuple):
+    # Vertex positions of shape (n, 3)
+    aVex: np.ndarray
+    # Vertex indices of the edges of shape (m, 2)
+    aEdges: np.ndarray
+    # Vertex index per loop
+    aLoops: np.ndarray
+    # Number of loops per face
+    aFaceSizes: np.ndarray
+    # Smooth shading flag per face
+    aSmooth: np.ndarray
+    # Material index per face
+    aMaterialIdx: np.ndarray
+    # UV coordinates of shape (number of loops, 2) per UV layer name
+    dicUV: dict[str, np.ndarray]
 
 
 # endclass
@@ -31,10 +31,13 @@ import bmesh
 
 import mathutils
 import math
+import json
+import hashlib
 
 from typing import Union, Optional, Tuple
 from pathlib import Path
-from .mesh.types import CMeshData
+from .mesh.types import CMeshData, CMeshArrays
+from .mesh import build as meshbuild
 from .node import shader as nsh
 from .node import align as nalign
 from .node.shader import utils as nutils
@@ -52,6 +55,63 @@ from . import collection
 from . import viewlayer
 from . import ops_object as ops
 from . import ops_image
+from . import vertex_group
+from .cls_object_hierarchy import CObjectHierarchy
+from .cls_mesh_vex_cache import CMeshVexCache
+from .cls_import_cache import CImportCache
+
+# Vertex arrays of evaluated mesh objects
+_xMeshVexCache: CMeshVexCache = CMeshVexCache()
+
+# Folder of the import cache used by 'ImportObjectAny()', if no folder is given explicitly
+_pathImportCache: Optional[Path] = None
+
+
+################################################################################
+def CreateObjectHierarchyIndex() -> CObjectHierarchy:
+    """Build a parent/child index of all objects for a batch of hierarchy lookups,
+    e.g. to get the children of many objects. The index does not notice objects that are
+    parented to existing objects after it was built, so it should not be kept beyond the batch.
+    """
+    xIndex = CObjectHierarchy()
+    xIndex.Build()
+    return xIndex
+
+
+# enddef
+
+
+################################################################################
+def GetObjectChildren(_objX, *, _bRecursive: bool = False, _xIndex: Optional[CObjectHierarchy] = None) -> list:
+    """Get the children of an object.
+
+    Args:
+        _objX (bpy.types.Object): The parent object.
+        _bRecursive (bool, optional): If true, returns all descendants depth-first. Defaults to False.
+        _xIndex (CObjectHierarchy, optional): Index from 'CreateObjectHierarchyIndex()' shared by a batch
+                                              of lookups. If not given, the children are read from
+                                              'Object.children', and for recursive lookups
+                                              from a new index. Defaults to None.
+
+    Returns:
+        list[bpy.types.Object]: The child objects.
+    """
+    if _xIndex is None:
+        if _bRecursive is False:
+            return list(_objX.children)
+        # endif
+
+        # A single pass over all objects instead of one 'Object.children' scan per descendant
+        _xIndex = CreateObjectHierarchyIndex()
+    # endif
+
+    if _bRecursive is True:
+        return _xIndex.GetDescendants(_objX)
+    # endif
+    return _xIndex.GetChildren(_objX)
+
+
+# enddef
 
 
 ################################################################################
@@ -124,7 +184,25 @@ def CreateObjectFromMeshData(
     _bActivate: bool = False,
     _xCollection: Optional[bpy.types.Collection] = None,
     _xContext: bpy.types.Context = None,
+    _bRecalcNormals: bool = True,
 ) -> bpy.types.Object:
+    """Create a mesh object from mesh data.
+    The vertices, edges and faces of the mesh data can be given as lists or as numpy arrays.
+
+    Args:
+        _sName (str): Name of the new object.
+        _xMeshData (CMeshData): The mesh data.
+        _bSmoothNormals (bool, optional): Smooth shading of all faces. Defaults to True.
+        _bActivate (bool, optional): Make the new object active. Defaults to False.
+        _xCollection (bpy.types.Collection, optional): Collection the object is linked to.
+        _xContext (bpy.types.Context, optional): The context.
+        _bRecalcNormals (bool, optional): Make the face orientations consistent.
+                                          Can be disabled for meshes, whose faces are already consistently
+                                          oriented, e.g. generated grids. Defaults to True.
+
+    Returns:
+        bpy.types.Object: The new object.
+    """
     objX = CreateMeshObject(_sName, _bActivate=_bActivate, _xCollection=_xCollection, _xContext=_xContext)
     meshX: bpy.types.Mesh = objX.data
 
@@ -132,24 +210,22 @@ def CreateObjectFromMeshData(
     # can be places relative to origin.
     objX.location = (0, 0, 0)
 
-    meshX.from_pydata(_xMeshData.lVex, _xMeshData.lEdges, _xMeshData.lFaces)
-    meshX.update(calc_edges=True)
+    meshbuild.SetMeshData(meshX, _xMeshData.lVex, _xFaces=_xMeshData.lFaces, _xEdges=_xMeshData.lEdges)
 
     if hasattr(meshX, "use_auto_smooth"):
         meshX.use_auto_smooth = True
     # endif
 
-    bm: bmesh.types.BMesh = bmesh.new()
-    bm.from_mesh(meshX)
-    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
-    bm.to_mesh(meshX)
-    meshX.update()
-    bm.free()
+    if _bRecalcNormals is True:
+        bm: bmesh.types.BMesh = bmesh.new()
+        bm.from_mesh(meshX)
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        bm.to_mesh(meshX)
+        meshX.update()
+        bm.free()
+    # endif
 
-    xPoly: bpy.types.MeshPolygon
-    for xPoly in meshX.polygons:
-        xPoly.use_smooth = _bSmoothNormals
-    # endfor
+    meshbuild.SetSmooth(meshX, _bSmoothNormals)
 
     return objX
 
@@ -243,16 +319,22 @@ def CreateText(
 
 
 # #####################################################
-def _DoCopyObject(_objTop, *, _clnX, _bLinked=False, _bHierarchy=False):
+def _DoCopyObject(_objTop, *, _clnX, _bLinked=False, _bHierarchy=False, _dicObjectMap=None):
     objX = _objTop.copy()
     if _bLinked is False and _objTop.data is not None:
         objX.data = _objTop.data.copy()
     # endif
     _clnX.objects.link(objX)
 
+    if _dicObjectMap is not None:
+        _dicObjectMap[_objTop.name] = objX.name
+    # endif
+
     if _bHierarchy is True:
         for objChild in _objTop.children:
-            objY = _DoCopyObject(objChild, _clnX=_clnX, _bLinked=_bLinked, _bHierarchy=_bHierarchy)
+            objY = _DoCopyObject(
+                objChild, _clnX=_clnX, _bLinked=_bLinked, _bHierarchy=_bHierarchy, _dicObjectMap=_dicObjectMap
+            )
             ParentObject(objX, objY, bKeepTransform=True)
         # endfor
     # endif
@@ -264,14 +346,28 @@ def _DoCopyObject(_objTop, *, _clnX, _bLinked=False, _bHierarchy=False):
 
 
 # #####################################################
-def CopyObject(_objTop, *, _bLinked=False, _bHierarchy=False, _clnTarget=None):
+def CopyObject(_objTop, *, _bLinked=False, _bHierarchy=False, _clnTarget=None, _dicObjectMap=None):
+    """Copy an object, optionally together with its' child hierarchy.
+
+    Args:
+        _objTop (bpy.types.Object): The object to copy.
+        _bLinked (bool): If true, the copies share the object data with the source.
+        _bHierarchy (bool): If true, the child objects are copied as well.
+        _clnTarget (bpy.types.Collection): The collection the copies are linked to.
+                                           Defaults to the collection of the source object.
+        _dicObjectMap (dict): If given, is filled with a mapping from source object names
+                              to the names of the copied objects.
+
+    Returns:
+        bpy.types.Object: The copy of the top object.
+    """
     if _clnTarget is None:
         clnX = collection.FindCollectionOfObject(bpy.context, _objTop)
     else:
         clnX = _clnTarget
     # endif
 
-    objX = _DoCopyObject(_objTop, _clnX=clnX, _bLinked=_bLinked, _bHierarchy=_bHierarchy)
+    objX = _DoCopyObject(_objTop, _clnX=clnX, _bLinked=_bLinked, _bHierarchy=_bHierarchy, _dicObjectMap=_dicObjectMap)
 
     return objX
 
@@ -280,7 +376,9 @@ def CopyObject(_objTop, *, _bLinked=False, _bHierarchy=False, _clnTarget=None):
 
 
 # #####################################################
-def CopyCollection(_clnX, *, _bLinked=False, _bObjectHierarchy=True, _clnTarget=None, _xContext=None):
+def CopyCollection(
+    _clnX, *, _bLinked=False, _bObjectHierarchy=True, _clnTarget=None, _xContext=None, _dicObjectMap=None
+):
     if _xContext is None:
         xCtx = bpy.context
     else:
@@ -296,13 +394,24 @@ def CopyCollection(_clnX, *, _bLinked=False, _bObjectHierarchy=True, _clnTarget=
     clnY = collection.CreateCollection(xCtx, _clnX.name, bActivate=False, clnParent=clnParent)
     for objX in _clnX.objects:
         if objX.parent is None or (objX.parent is not None and objX.parent.name not in _clnX.objects):
-            CopyObject(objX, _bLinked=_bLinked, _bHierarchy=_bObjectHierarchy, _clnTarget=clnY)
+            CopyObject(
+                objX,
+                _bLinked=_bLinked,
+                _bHierarchy=_bObjectHierarchy,
+                _clnTarget=clnY,
+                _dicObjectMap=_dicObjectMap,
+            )
         # endif
     # endfor
 
     for clnChild in _clnX.children:
         CopyCollection(
-            clnChild, _bLinked=_bLinked, _bObjectHierarchy=_bObjectHierarchy, _clnTarget=clnY, _xContext=xCtx
+            clnChild,
+            _bLinked=_bLinked,
+            _bObjectHierarchy=_bObjectHierarchy,
+            _clnTarget=clnY,
+            _xContext=xCtx,
+            _dicObjectMap=_dicObjectMap,
         )
     # endfor
 
@@ -368,12 +477,13 @@ def Hide(_objX, bHide=None, bHideRender=None, bHideInAllViewports=None, bRecursi
     # endif
 
     if bRecursive is True:
-        for objY in _objX.children:
+        for objY in GetObjectChildren(_objX, _bRecursive=True):
             Hide(
                 objY,
                 bHide=bHide,
                 bHideRender=bHideRender,
                 bHideInAllViewports=bHideInAllViewports,
+                bRecursive=False,
             )
         # endfor
     # endif recusive
@@ -382,6 +492,111 @@ def Hide(_objX, bHide=None, bHideRender=None, bHideInAllViewports=None, bRecursi
 # enddef
 
 
+################################################################################
+def GetObjectMask(_xObjects) -> np.ndarray:
+    """Get a boolean mask over 'bpy.data.objects' that is true for the given objects.
+
+    Args:
+        _xObjects (iterable): Objects or object names.
+
+    Returns:
+        np.ndarray: Boolean array with one element per object in 'bpy.data.objects'.
+    """
+    lUids: list[int] = []
+    for xObj in _xObjects:
+        if isinstance(xObj, str):
+            objX = bpy.data.objects.get(xObj)
+            if objX is None:
+                raise RuntimeError(f"Object '{xObj}' not found")
+            # endif
+        else:
+            objX = xObj
+        # endif
+        lUids.append(objX.session_uid)
+    # endfor
+
+    aUid = np.empty(len(bpy.data.objects), dtype=np.uint32)
+    bpy.data.objects.foreach_get("session_uid", aUid)
+
+    return np.isin(aUid, np.array(lUids, dtype=np.uint32))
+
+
+# enddef
+
+
+################################################################################
+def GetObjectsHidden(*, _sProp: str = "hide_viewport") -> np.ndarray:
+    """Get the hide flags of all objects in 'bpy.data.objects'.
+
+    Args:
+        _sProp (str, optional): One of 'hide_viewport', 'hide_render' or 'hide_select'.
+
+    Returns:
+        np.ndarray: Boolean array with one element per object in 'bpy.data.objects'.
+    """
+    aHide = np.empty(len(bpy.data.objects), dtype=bool)
+    bpy.data.objects.foreach_get(_sProp, aHide)
+    return aHide
+
+
+# enddef
+
+
+################################################################################
+def SetObjectsHidden(_aHide: np.ndarray, *, _sProp: str = "hide_viewport"):
+    """Set the hide flags of all objects in 'bpy.data.objects' with a single 'foreach_set'.
+
+    Args:
+        _aHide (np.ndarray): Boolean array with one element per object in 'bpy.data.objects'.
+        _sProp (str, optional): One of 'hide_viewport', 'hide_render' or 'hide_select'.
+    """
+    lAllowed = ["hide_viewport", "hide_render", "hide_select"]
+    if _sProp not in lAllowed:
+        raise RuntimeError(f"Hide property must be one of {lAllowed}, but is '{_sProp}'")
+    # endif
+
+    xObjects = bpy.data.objects
+    if len(_aHide) != len(xObjects):
+        raise RuntimeError("Number of hide flags does not match number of objects")
+    # endif
+
+    if len(xObjects) == 0:
+        return
+    # endif
+
+    xObjects.foreach_set(_sProp, np.asarray(_aHide, dtype=bool))
+
+    # 'foreach_set' does not call the property update function. Setting the flag of
+    # a single object again triggers the collection sync and dependency graph update for all objects.
+    objX = xObjects[0]
+    setattr(objX, _sProp, getattr(objX, _sProp))
+
+
+# enddef
+
+
+################################################################################
+def HideObjects(_xObjects, _bHide: bool = True, *, _sProp: str = "hide_viewport"):
+    """Set the hide flag of the given objects in one batch.
+
+    Args:
+        _xObjects (iterable): Objects or object names.
+        _bHide (bool, optional): The value of the hide flag. Defaults to True.
+        _sProp (str, optional): One of 'hide_viewport', 'hide_render' or 'hide_select'.
+    """
+    aMask = GetObjectMask(_xObjects)
+    aHide = GetObjectsHidden(_sProp=_sProp)
+    if np.all(aHide[aMask] == _bHide):
+        return
+    # endif
+
+    aHide[aMask] = _bHide
+    SetObjectsHidden(aHide, _sProp=_sProp)
+
+
+# enddef
+
+
 ################################################################################
 def GetActiveObject(_xContext):
     return _xContext.active_object
@@ -424,16 +639,8 @@ def ParentObjectList(_objParent, _lobjChild, bKeepTransform=True):
 
 ######################################################
 # Get list of names of children of Object
-def GetObjectChildrenNames(_objMain, bRecursive=False):
-    lNames = []
-    for objChild in _objMain.children:
-        lNames.append(objChild.name)
-        if bRecursive and objChild.children is not None:
-            lNames += GetObjectChildrenNames(objChild, bRecursive=True)
-        # endif
-    # endfor
-
-    return lNames
+def GetObjectChildrenNames(_objMain, bRecursive=False, *, _xIndex: Optional[CObjectHierarchy] = None):
+    return [x.name for x in GetObjectChildren(_objMain, _bRecursive=bRecursive, _xIndex=_xIndex)]
 
 
 # enddef
@@ -448,15 +655,13 @@ def RemoveObjectHierarchy(_objMain):
         _objMain (blender object): The object to remove together with its' hierarchy.
     """
 
-    lNames = [_objMain.name]
-    lNames += GetObjectChildrenNames(_objMain, bRecursive=True)
+    lObjects = [_objMain]
+    lObjects += GetObjectChildren(_objMain, _bRecursive=True)
 
-    # print(lNames)
-    for sName in lNames:
-        objX = bpy.data.objects.get(sName)
+    for objX in lObjects:
         objX.animation_data_clear()
-        bpy.data.objects.remove(objX)
     # endfor
+    bpy.data.batch_remove(ids=lObjects)
 
 
 # enddef
@@ -483,11 +688,76 @@ def ScaleObject(_objX, _fScale: float, *, _bApply: bool = False):
 # enddef
 
 
+################################################################################
+@bpy.app.handlers.persistent
+def _OnDepsgraphUpdatePost(_xScene, _xDepsgraph):
+    _xMeshVexCache.OnDepsgraphUpdate(_xDepsgraph)
+
+
+# enddef
+
+
+################################################################################
+@bpy.app.handlers.persistent
+def _OnLoadPost(*args):
+    _xMeshVexCache.Clear()
+
+
+# enddef
+
+
+################################################################################
+def _RegisterMeshVexCacheHandlers():
+    if _OnDepsgraphUpdatePost not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_OnDepsgraphUpdatePost)
+    # endif
+
+    if _OnLoadPost not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_OnLoadPost)
+    # endif
+
+
+# enddef
+
+
+################################################################################
+def ClearMeshVexCache():
+    """Remove all cached vertex arrays of evaluated mesh objects."""
+    _xMeshVexCache.Clear()
+
+
+# enddef
+
+
 ######################################################
 # Get Mesh Vertices as numpy array
 def GetMeshVex(
-    _objX: bpy.types.Object, *, sFrame: str = "WORLD", bUseParentFrame: bool = True, bEvaluated: bool = False
+    _objX: bpy.types.Object,
+    *,
+    sFrame: str = "WORLD",
+    bUseParentFrame: bool = True,
+    bEvaluated: bool = False,
+    xDType=np.float64,
+    bUseCache: bool = True,
+    bCopy: bool = True,
 ) -> np.ndarray:
+    """Get the vertices of a mesh object as numpy array of shape (n, 3).
+    The vertices of evaluated objects are cached, separately for each frame and data type.
+    The cache entry of an object is invalidated when its' geometry is re-evaluated.
+
+    Args:
+        _objX (bpy.types.Object): The mesh object.
+        sFrame (str, optional): One of 'WORLD', 'LOCAL' or 'ID'. Defaults to "WORLD".
+        bUseParentFrame (bool, optional): For the 'LOCAL' frame, also apply the local matrix of the parent.
+        bEvaluated (bool, optional): Use the evaluated mesh of the object. Defaults to False.
+        xDType (optional): The numpy data type of the returned array, e.g. np.float32. Defaults to np.float64.
+        bUseCache (bool, optional): Use the cache for evaluated objects. Defaults to True.
+        bCopy (bool, optional): If false, a read-only array is returned for cached vertices,
+                                which avoids copying the array. Defaults to True.
+
+    Returns:
+        np.ndarray: The vertex array.
+    """
     if _objX.type != "MESH":
         raise Exception("Object '{0}' is not a mesh object".format(_objX.name))
     # endif
@@ -512,29 +782,38 @@ def GetMeshVex(
         mFrame = None
     # endif
 
-    if mFrame is not None:
-        mFrameT = np.array(mFrame.to_3x3()).transpose()
-        mTrans = np.array(mFrame.translation)
-    # endif
-
     if bEvaluated is True:
         xDG = bpy.context.evaluated_depsgraph_get()
         objMesh = _objX.evaluated_get(xDG)
-        meshX = objMesh.data
     else:
-        meshX = _objX.data
+        objMesh = _objX
+    # endif
+
+    # Only evaluated meshes are cached, since changes to the original
+    # mesh data are only reported with the next depsgraph evaluation.
+    if bUseCache is True and objMesh.is_evaluated is True:
+        _RegisterMeshVexCacheHandlers()
+        sKey = sFrame if sFrame != "LOCAL" or bUseParentFrame is False else "LOCAL_PARENT"
+        aVex = _xMeshVexCache.GetVex(objMesh, _sFrame=sKey, _matFrame=mFrame, _xDType=xDType)
+        if bCopy is True:
+            aVex = aVex.copy()
+        # endif
+        return aVex
     # endif
 
+    meshX = objMesh.data
     iVexCnt = len(meshX.vertices)
     aVex = np.empty(iVexCnt * 3, dtype=np.float64)
     meshX.vertices.foreach_get("co", aVex)
 
     aVex.shape = (iVexCnt, 3)
     if mFrame is not None:
+        mFrameT = np.array(mFrame.to_3x3()).transpose()
+        mTrans = np.array(mFrame.translation)
         aVex = (aVex @ mFrameT) + mTrans
     # endif
 
-    return aVex
+    return aVex.astype(xDType, copy=False)
 
 
 # enddef
@@ -564,49 +843,102 @@ def GetVertexWeights(_objX, _sGrpName):
         return [1.0] * iVexCnt
     # endif
 
-    lW = [0.0] * iVexCnt
     xGrp = _objX.vertex_groups.get(_sGrpName)
     if xGrp is None:
         raise RuntimeError("Vertex group '{}' does not exist in object '{}'".format(_sGrpName, _objX.name))
     # endif
 
-    for i, xVex in enumerate(_objX.data.vertices):
-        for xG in xVex.groups:
-            if xG.group == xGrp.index:
-                lW[i] = xG.weight
-            # endif target group
-        # endfor vertex groups
-    # endfor vertices
+    return vertex_group.GetWeight(_objX, _sGrpName, _xDType=np.float64).tolist()
 
-    return lW
+
+# enddef
+
+
+######################################################
+def _GetColumnExtremeIndices(_aVex: np.ndarray, _aDir: np.ndarray, _iGridSize: int) -> np.ndarray:
+    """Get the indices of the vertices that are extremal along the given direction,
+    in the cells of a grid perpendicular to that direction. For each cell, the
+    vertex furthest along and the vertex furthest against the direction are selected.
+    """
+    aDir = _aDir / np.linalg.norm(_aDir)
+    aAux = np.array([1.0, 0.0, 0.0]) if abs(aDir[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    aU = np.cross(aDir, aAux)
+    aU /= np.linalg.norm(aU)
+    aW = np.cross(aDir, aU)
+
+    aH = _aVex @ aDir
+    aUW = _aVex @ np.stack([aU, aW], axis=1)
+    aMin = aUW.min(axis=0)
+    aRange = aUW.max(axis=0) - aMin
+    aRange[aRange <= 0.0] = 1.0
+    aCell = np.minimum((aUW - aMin) / aRange * _iGridSize, _iGridSize - 1).astype(np.int64)
+    aCellId = aCell[:, 0] * _iGridSize + aCell[:, 1]
+
+    # Sort by cell and within each cell by the position along the direction
+    aOrder = np.lexsort((aH, aCellId))
+    aSortedId = aCellId[aOrder]
+    aFirst = np.flatnonzero(np.concatenate(([True], aSortedId[1:] != aSortedId[:-1])))
+    aLast = np.concatenate((aFirst[1:] - 1, [len(aOrder) - 1]))
+
+    return np.unique(np.concatenate((aOrder[aFirst], aOrder[aLast])))
 
 
 # enddef
 
 
 ######################################################
-def GetMeshObjectDist(*, objTrg, objX, vDir):
-    matT = objTrg.matrix_world.inverted() @ objX.matrix_world
-    vDir_loc = (objTrg.matrix_world.inverted().to_3x3() @ vDir).normalized()
+def GetMeshObjectDist(*, objTrg, objX, vDir, sVertexSet: str = "EXTREMES", iGridSize: int = 64):
+    """Get the minimal and maximal distance of the vertices of a mesh object to a target mesh along a direction.
+    Distances are positive if the target is hit in the direction 'vDir' and negative if it is hit
+    in the opposite direction. The rays are cast on a cached BVH tree of the evaluated target mesh.
+
+    Args:
+        objTrg (bpy.types.Object): The target mesh object.
+        objX (bpy.types.Object): The mesh object whose vertices are used as ray origins.
+        vDir (mathutils.Vector): The direction in world coordinates.
+        sVertexSet (str, optional): The vertices rays are cast from. 'ALL' uses all vertices.
+                                    'EXTREMES' only uses the vertices that are furthest along and
+                                    against the direction in each cell of a grid perpendicular to it.
+                                    Defaults to "EXTREMES".
+        iGridSize (int, optional): Number of grid cells per axis for the vertex set 'EXTREMES'. Defaults to 64.
+
+    Returns:
+        tuple[float, float]: The minimal and maximal distance.
+    """
+    lAllowedSets = ["ALL", "EXTREMES"]
+    if sVertexSet not in lAllowedSets:
+        raise RuntimeError(f"Vertex set must be one of {lAllowedSets}, but is '{sVertexSet}'")
+    # endif
+
+    xDG = bpy.context.evaluated_depsgraph_get()
+    objTrg_eval = objTrg if objTrg.is_evaluated is True else objTrg.evaluated_get(xDG)
+    xBvhTree = _xMeshVexCache.GetBvhTree(objTrg_eval, xDG)
+
+    matTrgInv = objTrg.matrix_world.inverted()
+    matT = matTrgInv @ objX.matrix_world
+    vDir_loc = (matTrgInv.to_3x3() @ vDir).normalized()
+    vDirNeg_loc = -vDir_loc
+
+    aVex = GetMeshVex(objX, sFrame="ID", bCopy=False)
+    aVex = (aVex @ np.array(matT.to_3x3()).transpose()) + np.array(matT.translation)
+    if sVertexSet == "EXTREMES" and aVex.shape[0] > 0:
+        aVex = aVex[_GetColumnExtremeIndices(aVex, np.array(vDir_loc), iGridSize)]
+    # endif
 
     fDistMin = 1e20
     fDistMax = -1e20
 
-    for vexOrig in objX.data.vertices:
-        vOrig = matT @ vexOrig.co
+    for lOrig in aVex.tolist():
+        vOrig = mathutils.Vector(lOrig)
 
-        tR = objTrg.ray_cast(vOrig, vDir_loc)
-        if tR[0] is True:
-            fDist = (vOrig - tR[1]).length
-        else:
-            tR = objTrg.ray_cast(vOrig, -vDir_loc)
-            if tR[0] is True:
-                fDist = -(vOrig - tR[1]).length
-            else:
-                fDist = None
+        vHit, _, _, fDist = xBvhTree.ray_cast(vOrig, vDir_loc)
+        if vHit is None:
+            vHit, _, _, fDist = xBvhTree.ray_cast(vOrig, vDirNeg_loc)
+            if vHit is not None:
+                fDist = -fDist
             # endif
         # endif
-        if fDist is not None:
+        if vHit is not None:
             fDistMin = min(fDistMin, fDist)
             fDistMax = max(fDistMax, fDist)
         # endif
@@ -625,23 +957,15 @@ def GetMeshObjectDist(*, objTrg, objX, vDir):
 
 ######################################################
 def GetMeshObjectHierarchy(_objTop):
-    lObjects = []
-    if _objTop.type == "MESH":
-        lObjects.append(_objTop)
-    # endif
-
-    for objX in _objTop.children:
-        lObjects.extend(GetMeshObjectHierarchy(objX))
-    # endfor
-
-    return lObjects
+    lObjects = [_objTop] + GetObjectChildren(_objTop, _bRecursive=True)
+    return [x for x in lObjects if x.type == "MESH"]
 
 
 # enddef
 
 
 ######################################################
-def GetObjectDeltaToMesh(*, objTrg, objX, vDir, sMode="ABOVE"):
+def GetObjectDeltaToMesh(*, objTrg, objX, vDir, sMode="ABOVE", sVertexSet: str = "EXTREMES", iGridSize: int = 64):
     lAllowedModes = ["CLOSEST", "ABOVE", "BELOW"]
     if sMode not in lAllowedModes:
         raise RuntimeError("sMode must be one of 'CLOSEST', 'ABOVE' or 'BELOW'")
@@ -663,7 +987,9 @@ def GetObjectDeltaToMesh(*, objTrg, objX, vDir, sMode="ABOVE"):
     # loop over all objects
     for objY in lObjects:
         objY_eval = objY.evaluated_get(xDG)
-        fMin, fMax = GetMeshObjectDist(objTrg=objTrg_eval, objX=objY_eval, vDir=vDir)
+        fMin, fMax = GetMeshObjectDist(
+            objTrg=objTrg_eval, objX=objY_eval, vDir=vDir, sVertexSet=sVertexSet, iGridSize=iGridSize
+        )
 
         fDistMin = min(fDistMin, fMin)
         fDistMax = max(fDistMax, fMax)
@@ -672,22 +998,31 @@ def GetObjectDeltaToMesh(*, objTrg, objX, vDir, sMode="ABOVE"):
     # print(fDistMin)
     # print(fDistMax)
 
-    if sMode == "CLOSEST":
-        if fDistMin < 0.0 and fDistMax > 0.0:
-            if abs(fDistMin) < fDistMax:
-                vDelta = fDistMin * vDir
+    return _GetDeltaFromDist(fDistMin, fDistMax, vDir, sMode)
+
+
+# enddef
+
+
+######################################################
+def _GetDeltaFromDist(_fDistMin: float, _fDistMax: float, _vDir: mathutils.Vector, _sMode: str) -> mathutils.Vector:
+    vDelta = None
+    if _sMode == "CLOSEST":
+        if _fDistMin < 0.0 and _fDistMax > 0.0:
+            if abs(_fDistMin) < _fDistMax:
+                vDelta = _fDistMin * _vDir
             else:
-                vDelta = fDistMax * vDir
+                vDelta = _fDistMax * _vDir
             # endif
-        elif fDistMax < 0.0:
-            vDelta = fDistMax * vDir
-        elif fDistMin > 0.0:
-            vDelta = fDistMin * vDir
+        elif _fDistMax < 0.0:
+            vDelta = _fDistMax * _vDir
+        elif _fDistMin > 0.0:
+            vDelta = _fDistMin * _vDir
         # endif
-    elif sMode == "ABOVE":
-        vDelta = fDistMin * vDir
-    elif sMode == "BELOW":
-        vDelta = fDistMax * vDir
+    elif _sMode == "ABOVE":
+        vDelta = _fDistMin * _vDir
+    elif _sMode == "BELOW":
+        vDelta = _fDistMax * _vDir
     # endif
 
     return vDelta
@@ -696,14 +1031,148 @@ def GetObjectDeltaToMesh(*, objTrg, objX, vDir, sMode="ABOVE"):
 # enddef
 
 
+######################################################
+def DropObjectsToMesh(
+    lObjects: list,
+    objTrg,
+    vDir,
+    sMode: str = "ABOVE",
+    *,
+    sVertexSet: str = "EXTREMES",
+    iGridSize: int = 64,
+    bApply: bool = True,
+) -> list:
+    """Move a list of objects along a direction onto a target mesh.
+    This is the batch version of 'GetObjectDeltaToMesh()'. The depsgraph is evaluated
+    and the BVH tree of the target is obtained once, the ray origins of all objects and their
+    mesh hierarchies are gathered in one pass, and all rays are cast in a single loop.
+    Objects are moved independently of each other, i.e. objects in the list
+    are not obstacles for each other.
+
+    Args:
+        lObjects (list): Objects or object names to drop.
+        objTrg (bpy.types.Object): The target mesh object.
+        vDir (mathutils.Vector): The drop direction in world coordinates.
+        sMode (str, optional): One of 'CLOSEST', 'ABOVE' or 'BELOW', as for 'GetObjectDeltaToMesh()'.
+                               Defaults to "ABOVE".
+        sVertexSet (str, optional): The vertices rays are cast from, as for 'GetMeshObjectDist()'.
+                                    Defaults to "EXTREMES".
+        iGridSize (int, optional): Number of grid cells per axis for the vertex set 'EXTREMES'. Defaults to 64.
+        bApply (bool, optional): If true, the objects are moved by their deltas. Defaults to True.
+
+    Returns:
+        list[mathutils.Vector]: The delta vector in world coordinates per object.
+                                Objects whose rays do not hit the target have a zero delta.
+    """
+    lAllowedModes = ["CLOSEST", "ABOVE", "BELOW"]
+    if sMode not in lAllowedModes:
+        raise RuntimeError("sMode must be one of 'CLOSEST', 'ABOVE' or 'BELOW'")
+    # endif
+
+    lAllowedSets = ["ALL", "EXTREMES"]
+    if sVertexSet not in lAllowedSets:
+        raise RuntimeError(f"Vertex set must be one of {lAllowedSets}, but is '{sVertexSet}'")
+    # endif
+
+    lObj: list[bpy.types.Object] = [bpy.data.objects[x] if isinstance(x, str) else x for x in lObjects]
+    vDir = mathutils.Vector(vDir)
+
+    xDG = bpy.context.evaluated_depsgraph_get()
+    objTrg_eval = objTrg.evaluated_get(xDG)
+    xBvhTree = _xMeshVexCache.GetBvhTree(objTrg_eval, xDG)
+
+    matTrg = objTrg_eval.matrix_world
+    matTrgInv = matTrg.inverted()
+    aTrgInvT = np.array(matTrgInv.to_3x3()).transpose()
+    aTrgInvTrans = np.array(matTrgInv.translation)
+    vDir_loc = (matTrgInv.to_3x3() @ vDir).normalized()
+    vDirNeg_loc = -vDir_loc
+    aDir_loc = np.array(vDir_loc)
+
+    # Gather the ray origins of all objects in the target frame
+    lOrig: list[np.ndarray] = []
+    lOwner: list[np.ndarray] = []
+    for iObjIdx, objX in enumerate(lObj):
+        lVex = [
+            GetMeshVex(objY.evaluated_get(xDG), sFrame="WORLD", bCopy=False) for objY in GetMeshObjectHierarchy(objX)
+        ]
+        if len(lVex) == 0:
+            continue
+        # endif
+
+        aVex = (np.concatenate(lVex, axis=0) @ aTrgInvT) + aTrgInvTrans
+        if sVertexSet == "EXTREMES" and aVex.shape[0] > 0:
+            aVex = aVex[_GetColumnExtremeIndices(aVex, aDir_loc, iGridSize)]
+        # endif
+        lOrig.append(aVex)
+        lOwner.append(np.full(aVex.shape[0], iObjIdx, dtype=np.int64))
+    # endfor
+
+    iObjCnt = len(lObj)
+    aDistMin = np.full(iObjCnt, np.inf)
+    aDistMax = np.full(iObjCnt, -np.inf)
+
+    if len(lOrig) > 0:
+        aOrig = np.concatenate(lOrig, axis=0)
+        aOwner = np.concatenate(lOwner)
+        aDist = np.full(aOrig.shape[0], np.nan)
+
+        for iIdx, lRayOrig in enumerate(aOrig.tolist()):
+            vOrig = mathutils.Vector(lRayOrig)
+            vHit, _, _, fDist = xBvhTree.ray_cast(vOrig, vDir_loc)
+            if vHit is not None:
+                aDist[iIdx] = fDist
+            else:
+                vHit, _, _, fDist = xBvhTree.ray_cast(vOrig, vDirNeg_loc)
+                if vHit is not None:
+                    aDist[iIdx] = -fDist
+                # endif
+            # endif
+        # endfor
+
+        np.fmin.at(aDistMin, aOwner, aDist)
+        np.fmax.at(aDistMax, aOwner, aDist)
+    # endif
+
+    # Scale of distances along the direction from the target frame to world coordinates
+    fScale = vDir.dot(matTrg.to_3x3() @ vDir_loc)
+
+    lDeltas: list[mathutils.Vector] = []
+    for objX, fDistMin, fDistMax in zip(lObj, aDistMin.tolist(), aDistMax.tolist()):
+        vDelta = None
+        if math.isfinite(fDistMin) is True:
+            vDelta = _GetDeltaFromDist(fScale * fDistMin, fScale * fDistMax, vDir, sMode)
+        # endif
+        if vDelta is None:
+            vDelta = mathutils.Vector((0.0, 0.0, 0.0))
+        # endif
+        lDeltas.append(vDelta)
+
+        if bApply is True and vDelta.length_squared > 0.0:
+            matWorld = objX.matrix_world.copy()
+            matWorld.translation += vDelta
+            objX.matrix_world = matWorld
+        # endif
+    # endfor
+
+    return lDeltas
+
+
+# enddef
+
+
 ################################################################################
-def _GetChildMeshObjectNames(_objParent: bpy.types.Object, *, _bRecursive: bool = True) -> list[str]:
+def _GetChildMeshObjectNames(
+    _objParent: bpy.types.Object, *, _bRecursive: bool = True, _xIndex: Optional[CObjectHierarchy] = None
+) -> list[str]:
+    xIndex = CreateObjectHierarchyIndex() if _xIndex is None and _bRecursive is True else _xIndex
+
     lChildren: list[str] = []
-    for objChild in _objParent.children:
+    for objChild in GetObjectChildren(_objParent, _xIndex=xIndex):
         if objChild.type == "MESH":
             lChildren.append(objChild.name)
         elif objChild.type == "EMPTY" and _bRecursive is True:
-            lChildren.extend(_GetChildMeshObjectNames(objChild))
+            lChildren.extend(_GetChildMeshObjectNames(objChild, _xIndex=xIndex))
         # endif
     # endfor
 
@@ -714,48 +1183,417 @@ def _GetChildMeshObjectNames(_objParent: bpy.types.Object, *, _bRecursive: bool
 
 
 ################################################################################
-def JoinHierarchyToObject(_objIn: bpy.types.Object) -> str:
-    if _objIn.type == "EMPTY":
-        lObjects = _GetChildMeshObjectNames(_objIn, _bRecursive=True)
-        if len(lObjects) == 0:
-            return None
+def _CopyMeshSettings(_meshSrc: bpy.types.Mesh, _meshTrg: bpy.types.Mesh):
+    # Copies the settings of a mesh, like auto smooth before Blender 4.1, texture space and remesh settings,
+    # together with its custom properties.
+    setSkip: set[str] = {"name", "use_fake_user", "use_extra_user", "is_runtime_data", "tag"}
+    for xProp in _meshSrc.bl_rna.properties:
+        if (
+            xProp.is_readonly
+            or xProp.identifier in setSkip
+            or xProp.type not in {"BOOLEAN", "INT", "FLOAT", "ENUM", "STRING"}
+        ):
+            continue
         # endif
+        try:
+            setattr(_meshTrg, xProp.identifier, getattr(_meshSrc, xProp.identifier))
+        except (AttributeError, TypeError, ValueError):
+            pass
+        # endtry
+    # endfor
 
-        bpy.ops.object.select_all(action="DESELECT")
+    for sKey in _meshSrc.keys():
+        _meshTrg[sKey] = _meshSrc[sKey]
+    # endfor
 
-        for sObjName in lObjects:
-            bpy.data.objects[sObjName].select_set(True)
-        # endfor
-        sNewObj: str = lObjects[0]
-        sObjInName: str = _objIn.name
 
-        bpy.context.view_layer.objects.active = bpy.data.objects[sNewObj]
-        bpy.ops.object.join()
-        bpy.ops.object.select_all(action="DESELECT")
-        objNew: bpy.types.Object = bpy.data.objects[sNewObj]
-        objNew.parent = _objIn.parent
-        RemoveObjectHierarchy(_objIn)
-        objNew.name = sObjInName
+# enddef
 
-        return objNew.name
 
-    elif _objIn.type == "MESH":
-        return _objIn.name
+################################################################################
+def _GetVertexGroupMemberships(
+    _objX: bpy.types.Object, _lGroupNames: list[str], _iVexOffset: int
+) -> tuple[list[int], list[int], list[float]]:
+    # Vertex group memberships of an object with the group indices in '_lGroupNames',
+    # to which new group names are appended.
+    lGrpMap: list[int] = []
+    for xGrp in _objX.vertex_groups:
+        if xGrp.name not in _lGroupNames:
+            _lGroupNames.append(xGrp.name)
+        # endif
+        lGrpMap.append(_lGroupNames.index(xGrp.name))
+    # endfor
+
+    lVex: list[int] = []
+    lGrp: list[int] = []
+    lWeight: list[float] = []
+    if len(lGrpMap) == 0:
+        return lVex, lGrp, lWeight
     # endif
 
-    return None
+    for xVex in _objX.data.vertices:
+        for xG in xVex.groups:
+            lVex.append(xVex.index + _iVexOffset)
+            lGrp.append(lGrpMap[xG.group])
+            lWeight.append(xG.weight)
+        # endfor
+    # endfor
+
+    return lVex, lGrp, lWeight
 
 
 # enddef
 
 
 ################################################################################
-def JoinObjectList(_lObjNames: list[str], _sNewName: str) -> str:
-    lObjects: list[str] = []
+def _SetVertexGroupMemberships(
+    _objX: bpy.types.Object, _lGroupNames: list[str], _aVex: np.ndarray, _aGrp: np.ndarray, _aWeight: np.ndarray
+):
+    for iGrpIdx, sGrpName in enumerate(_lGroupNames):
+        xGrp = _objX.vertex_groups.get(sGrpName)
+        if xGrp is None:
+            xGrp = _objX.vertex_groups.new(name=sGrpName)
+        # endif
 
-    for sObjName in _lObjNames:
-        objX: bpy.types.Object = bpy.data.objects.get(sObjName)
-        if objX is None:
+        aSel = _aGrp == iGrpIdx
+        aVex = _aVex[aSel]
+        aWeight = _aWeight[aSel]
+        # Memberships are added with one call per weight value
+        aValues, aInverse = np.unique(aWeight, return_inverse=True)
+        for iValIdx, fWeight in enumerate(aValues.tolist()):
+            xGrp.add(aVex[aInverse == iValIdx].tolist(), fWeight, "REPLACE")
+        # endfor
+    # endfor
+
+
+# enddef
+
+
+################################################################################
+def _JoinMeshObjectsOperator(_objTarget: bpy.types.Object, _lObjects: list[bpy.types.Object]):
+    lAll: list[bpy.types.Object] = [_objTarget] + _lObjects
+    if hasattr(bpy.context, "temp_override"):
+        with bpy.context.temp_override(active_object=_objTarget, selected_editable_objects=lAll):
+            bpy.ops.object.join()
+        # endwith
+    else:
+        bpy.ops.object.join({"active_object": _objTarget, "selected_editable_objects": lAll})
+    # endif
+
+
+# enddef
+
+
+################################################################################
+def _JoinMeshArrays(_objTarget: bpy.types.Object, _lObjects: list[bpy.types.Object]):
+    lAll: list[bpy.types.Object] = [_objTarget] + _lObjects
+    matTrgInv = np.array(_objTarget.matrix_world.inverted())
+    bCustomNormals: bool = any(x.data.has_custom_normals for x in lAll)
+
+    # Attributes that are joined separately
+    setSkipAttr: set[str] = {"position", "sharp_face", "material_index", "custom_normal"}
+
+    # Materials of the target keep their indices, new materials are appended
+    lMaterials: list = [xSlot.material for xSlot in _objTarget.material_slots]
+    lUvNames: list[str] = []
+    dicAttrTypes: dict[str, tuple[str, str]] = {}
+    lGroupNames: list[str] = [x.name for x in _objTarget.vertex_groups]
+    lArrays: list[CMeshArrays] = []
+    lMatMaps: list[np.ndarray] = []
+    lAttributes: list[dict[str, np.ndarray]] = []
+    lNormals: list[np.ndarray] = []
+    lGrpVex: list[int] = []
+    lGrpIdx: list[int] = []
+    lGrpWeight: list[float] = []
+    iVexOffset = 0
+    for objX in lAll:
+        meshX: bpy.types.Mesh = objX.data
+        xArrays = meshbuild.GetMeshArrays(meshX)
+
+        matT = matTrgInv @ np.array(objX.matrix_world)
+        mat3 = matT[0:3, 0:3]
+        aVex = (xArrays.aVex @ mat3.transpose()) + matT[0:3, 3]
+
+        # The faces of mirrored objects are flipped, so that their normals keep pointing outwards.
+        # All face corner data is reordered in the same way.
+        aLoopOrder: Optional[np.ndarray] = None
+        if np.linalg.det(mat3) < 0.0:
+            aLoopOrder = meshbuild.GetFlippedLoopOrder(xArrays.aFaceSizes)
+            xArrays = xArrays._replace(
+                aLoops=xArrays.aLoops[aLoopOrder], dicUV={k: v[aLoopOrder] for k, v in xArrays.dicUV.items()}
+            )
+        # endif
+        lArrays.append(xArrays._replace(aVex=aVex))
+
+        lMatMap: list[int] = []
+        for iSlotIdx, xSlot in enumerate(objX.material_slots):
+            if objX is _objTarget:
+                lMatMap.append(iSlotIdx)
+                continue
+            # endif
+            matX = xSlot.material
+            iMatIdx = next((i for i, x in enumerate(lMaterials) if x == matX), None)
+            if iMatIdx is None:
+                iMatIdx = len(lMaterials)
+                lMaterials.append(matX)
+            # endif
+            lMatMap.append(iMatIdx)
+        # endfor
+        lMatMaps.append(np.array(lMatMap if len(lMatMap) > 0 else [0], dtype=np.int32))
+
+        for sUvName in xArrays.dicUV.keys():
+            if sUvName not in lUvNames:
+                lUvNames.append(sUvName)
+            # endif
+        # endfor
+
+        dicAttr: dict[str, np.ndarray] = {}
+        for xAttr in meshX.attributes:
+            sName: str = xAttr.name
+            if sName.startswith(".") or sName in setSkipAttr or sName in xArrays.dicUV:
+                continue
+            # endif
+            xData = meshbuild.GetAttributeArray(meshX, sName)
+            if xData is None:
+                continue
+            # endif
+            sDataType, sDomain, aData = xData
+            # An attribute with the same name but another type or domain is not joined
+            if dicAttrTypes.setdefault(sName, (sDataType, sDomain)) != (sDataType, sDomain):
+                continue
+            # endif
+            dicAttr[sName] = aData if sDomain != "CORNER" or aLoopOrder is None else aData[aLoopOrder]
+        # endfor
+        lAttributes.append(dicAttr)
+
+        if bCustomNormals is True:
+            aNormals = meshbuild.GetCornerNormals(meshX) @ np.linalg.inv(mat3)
+            aNormals /= np.maximum(np.linalg.norm(aNormals, axis=1, keepdims=True), 1e-12)
+            lNormals.append(aNormals if aLoopOrder is None else aNormals[aLoopOrder])
+        # endif
+
+        lVex, lGrp, lWeight = _GetVertexGroupMemberships(objX, lGroupNames, iVexOffset)
+        lGrpVex.extend(lVex)
+        lGrpIdx.extend(lGrp)
+        lGrpWeight.extend(lWeight)
+        iVexOffset += aVex.shape[0]
+    # endfor
+
+    lVex: list[np.ndarray] = []
+    lEdges: list[np.ndarray] = []
+    lLoops: list[np.ndarray] = []
+    lMatIdx: list[np.ndarray] = []
+    dicUV: dict[str, list[np.ndarray]] = {sName: [] for sName in lUvNames}
+    iVexOffset = 0
+    for xArrays, aMatMap in zip(lArrays, lMatMaps):
+        lVex.append(xArrays.aVex)
+        lEdges.append(xArrays.aEdges + iVexOffset)
+        lLoops.append(xArrays.aLoops + iVexOffset)
+        lMatIdx.append(aMatMap[np.clip(xArrays.aMaterialIdx, 0, len(aMatMap) - 1)])
+        iLoopCnt = xArrays.aLoops.shape[0]
+        for sUvName in lUvNames:
+            aUV = xArrays.dicUV.get(sUvName)
+            dicUV[sUvName].append(np.zeros((iLoopCnt, 2), dtype=np.float32) if aUV is None else aUV)
+        # endfor
+        iVexOffset += xArrays.aVex.shape[0]
+    # endfor
+
+    xJoined = CMeshArrays(
+        aVex=np.concatenate(lVex, axis=0),
+        aEdges=np.concatenate(lEdges, axis=0),
+        aLoops=np.concatenate(lLoops),
+        aFaceSizes=np.concatenate([x.aFaceSizes for x in lArrays]),
+        aSmooth=np.concatenate([x.aSmooth for x in lArrays]),
+        aMaterialIdx=np.concatenate(lMatIdx),
+        dicUV={sName: np.concatenate(lUV, axis=0) for sName, lUV in dicUV.items()},
+    )
+
+    meshOld: bpy.types.Mesh = _objTarget.data
+    meshNew: bpy.types.Mesh = bpy.data.meshes.new(meshOld.name)
+    meshbuild.SetMeshArrays(meshNew, xJoined)
+    _CopyMeshSettings(meshOld, meshNew)
+
+    # Attributes of objects that do not have them are set to zero
+    for sName, (sDataType, sDomain) in dicAttrTypes.items():
+        lData: list[np.ndarray] = []
+        for xArrays, dicAttr in zip(lArrays, lAttributes):
+            aData = dicAttr.get(sName)
+            if aData is None:
+                iElCnt = {
+                    "POINT": xArrays.aVex.shape[0],
+                    "EDGE": xArrays.aEdges.shape[0],
+                    "FACE": xArrays.aFaceSizes.shape[0],
+                    "CORNER": xArrays.aLoops.shape[0],
+                }[sDomain]
+                aData = np.zeros((iElCnt, meshbuild._dicAttributeTypes[sDataType][1]))
+            # endif
+            lData.append(aData)
+        # endfor
+        meshbuild.AddAttributeArray(meshNew, sName, sDataType, sDomain, np.concatenate(lData, axis=0))
+    # endfor
+
+    # Custom normals are set after the attributes, as they depend on the sharp edges
+    if bCustomNormals is True:
+        if hasattr(meshNew, "use_auto_smooth"):
+            meshNew.use_auto_smooth = True
+        # endif
+        meshNew.normals_split_custom_set(np.concatenate(lNormals, axis=0))
+    # endif
+
+    # Active layers are taken from the target, or from the first object that has them
+    for objX in lAll:
+        xUvLayer = objX.data.uv_layers.active
+        if xUvLayer is not None:
+            meshNew.uv_layers.active = meshNew.uv_layers[xUvLayer.name]
+            break
+        # endif
+    # endfor
+    for objX in lAll if hasattr(meshNew, "color_attributes") else []:
+        xColorAttrs = objX.data.color_attributes
+        if xColorAttrs.active_color_name in meshNew.color_attributes:
+            meshNew.color_attributes.active_color_name = xColorAttrs.active_color_name
+            meshNew.color_attributes.default_color_name = xColorAttrs.default_color_name
+            break
+        # endif
+    # endfor
+
+    for matX in lMaterials:
+        meshNew.materials.append(matX)
+    # endfor
+
+    iActiveGrpIdx: int = _objTarget.vertex_groups.active_index
+    _objTarget.data = meshNew
+    if len(lGroupNames) > 0:
+        _SetVertexGroupMemberships(
+            _objTarget,
+            lGroupNames,
+            np.array(lGrpVex, dtype=np.int64),
+            np.array(lGrpIdx, dtype=np.int64),
+            np.array(lGrpWeight, dtype=np.float32),
+        )
+        _objTarget.vertex_groups.active_index = iActiveGrpIdx
+    # endif
+
+    bpy.data.batch_remove(ids=_lObjects)
+
+
+# enddef
+
+
+################################################################################
+def JoinMeshObjects(_objTarget: bpy.types.Object, _lObjects: list) -> bpy.types.Object:
+    """Join mesh objects into a target mesh object, like 'bpy.ops.object.join()' with the target as active object,
+    but without depending on the context and without changing the selection.
+    The mesh arrays of all objects are read with 'foreach_get', transformed into the frame of the target object
+    and written to a new mesh for the target, which keeps the settings and custom properties of the target mesh.
+    Faces, edges, smooth flags, materials, UV layers, generic and color attributes, custom normals and
+    vertex groups are joined. Materials, UV layers, attributes and vertex groups are matched by identity and name.
+    The faces of objects that are mirrored relative to the target are flipped, so that their normals keep
+    pointing outwards. Shape keys cannot be joined this way, so if any object has shape keys,
+    'bpy.ops.object.join()' is used instead. The joined objects are removed and their children are parented
+    to the target, keeping their world transforms.
+
+    Args:
+        _objTarget (bpy.types.Object): The mesh object that receives the joined meshes.
+        _lObjects (list): Objects or object names to join into the target. The target itself is ignored.
+
+    Returns:
+        bpy.types.Object: The target object.
+    """
+    if _objTarget.type != "MESH":
+        raise RuntimeError(f"Join target '{_objTarget.name}' is not a mesh object")
+    # endif
+
+    lObjects: list[bpy.types.Object] = []
+    setUid: set[int] = {_objTarget.session_uid}
+    for xObj in _lObjects:
+        objX = bpy.data.objects[xObj] if isinstance(xObj, str) else xObj
+        if objX.session_uid in setUid:
+            continue
+        # endif
+        if objX.type != "MESH":
+            raise RuntimeError(f"Object '{objX.name}' is not a mesh object")
+        # endif
+        setUid.add(objX.session_uid)
+        lObjects.append(objX)
+    # endfor
+
+    if len(lObjects) == 0:
+        return _objTarget
+    # endif
+
+    # Keep children of the removed objects in place
+    xIndex = CreateObjectHierarchyIndex()
+    for objX in lObjects:
+        for objChild in GetObjectChildren(objX, _xIndex=xIndex):
+            if objChild.session_uid not in setUid:
+                ParentObject(_objTarget, objChild, bKeepTransform=True)
+            # endif
+        # endfor
+    # endfor
+
+    sMeshName: str = _objTarget.data.name
+    lMeshes: list[bpy.types.Mesh] = [_objTarget.data] + [x.data for x in lObjects]
+    if any(x.data.shape_keys is not None for x in [_objTarget] + lObjects):
+        _JoinMeshObjectsOperator(_objTarget, lObjects)
+    else:
+        _JoinMeshArrays(_objTarget, lObjects)
+    # endif
+
+    setMeshUid: set[int] = set()
+    lRemoveMeshes: list[bpy.types.Mesh] = []
+    for meshX in lMeshes:
+        if meshX.users == 0 and meshX.session_uid not in setMeshUid:
+            setMeshUid.add(meshX.session_uid)
+            lRemoveMeshes.append(meshX)
+        # endif
+    # endfor
+    if len(lRemoveMeshes) > 0:
+        bpy.data.batch_remove(ids=lRemoveMeshes)
+    # endif
+    _objTarget.data.name = sMeshName
+
+    return _objTarget
+
+
+# enddef
+
+
+################################################################################
+def JoinHierarchyToObject(_objIn: bpy.types.Object) -> str:
+    if _objIn.type == "EMPTY":
+        lObjects = _GetChildMeshObjectNames(_objIn, _bRecursive=True)
+        if len(lObjects) == 0:
+            return None
+        # endif
+
+        sNewObj: str = lObjects[0]
+        sObjInName: str = _objIn.name
+
+        objNew: bpy.types.Object = JoinMeshObjects(bpy.data.objects[sNewObj], lObjects[1:])
+        objNew.parent = _objIn.parent
+        RemoveObjectHierarchy(_objIn)
+        objNew.name = sObjInName
+
+        return objNew.name
+
+    elif _objIn.type == "MESH":
+        return _objIn.name
+    # endif
+
+    return None
+
+
+# enddef
+
+
+################################################################################
+def JoinObjectList(_lObjNames: list[str], _sNewName: str) -> str:
+    lObjects: list[str] = []
+
+    for sObjName in _lObjNames:
+        objX: bpy.types.Object = bpy.data.objects.get(sObjName)
+        if objX is None:
             continue
         # endif
 
@@ -767,20 +1605,8 @@ def JoinObjectList(_lObjNames: list[str], _sNewName: str) -> str:
         # endif
     # endfor
 
-    bpy.ops.object.select_all(action="DESELECT")
-
-    for sObjName in lObjects:
-        bpy.data.objects[sObjName].select_set(True)
-    # endfor
     sNewObj: str = lObjects[0]
-    objMain = bpy.data.objects[sNewObj]
-    objParent: bpy.types.Object = objMain.parent
-
-    bpy.context.view_layer.objects.active = objMain
-    bpy.ops.object.join()
-    bpy.ops.object.select_all(action="DESELECT")
-    objNew: bpy.types.Object = bpy.data.objects[sNewObj]
-    objNew.parent = objParent
+    objNew: bpy.types.Object = JoinMeshObjects(bpy.data.objects[sNewObj], lObjects[1:])
     objNew.name = _sNewName
 
     return objNew.name
@@ -789,6 +1615,18 @@ def JoinObjectList(_lObjNames: list[str], _sNewName: str) -> str:
 # enddef
 
 
+################################################################################
+def SetImportCachePath(_pathCache: Optional[Path]):
+    """Set the default folder of the import cache used by 'ImportObjectAny()'.
+    Set to None to disable the cache by default.
+    """
+    global _pathImportCache
+    _pathImportCache = None if _pathCache is None else Path(_pathCache)
+
+
+# enddef
+
+
 ################################################################################
 def ImportObjectAny(
     *,
@@ -801,6 +1639,114 @@ def ImportObjectAny(
     _lLocation: list[float] = None,
     _lRotationEuler_deg: list[float] = None,
     _bDoJoinObjects: bool = False,
+    _pathCache: Optional[Path] = None,
+    _bLinkFromCache: bool = False,
+) -> list[str]:
+    """Import objects from an OBJ, FBX or glTF file and process them.
+
+    If an import cache folder is given, or set with 'SetImportCachePath()', the processed objects
+    are stored as .blend library in that folder. The cache key is the content hash of the file
+    together with the processing parameters. Later imports with the same key append the objects
+    from the library instead of importing the file again.
+
+    Args:
+        _pathFile (Path): The file to import.
+        _sNewName (str, optional): New name of the imported objects.
+        _fScaleFactor (float, optional): Scale factor that is applied to the objects.
+        _bDoSetOrigin (bool, optional): Set the origin of the objects.
+        _sSetOriginType (str, optional): Origin type, see 'ops_object.SetOriginByType()'.
+        _sSetOriginCenter (str, optional): Origin center, see 'ops_object.SetOriginByType()'.
+        _lLocation (list[float], optional): Location of the objects.
+        _lRotationEuler_deg (list[float], optional): Euler rotation of the objects in degrees.
+        _bDoJoinObjects (bool, optional): Join all imported mesh objects into one object.
+        _pathCache (Path, optional): Folder of the import cache. Defaults to the folder set with
+                                     'SetImportCachePath()'.
+        _bLinkFromCache (bool, optional): Link the object data from the cache library instead of appending it.
+                                          The objects are local copies, that share the linked meshes and materials,
+                                          which can then not be edited.
+
+    Returns:
+        list[str]: The names of the imported objects.
+    """
+    pathCache = _pathImportCache if _pathCache is None else Path(_pathCache)
+
+    xCache: Optional[CImportCache] = None
+    sCacheKey: Optional[str] = None
+    lObjIn: Optional[list[str]] = None
+    if pathCache is not None:
+        xCache = CImportCache(pathCache)
+        dicParams = {
+            "fScaleFactor": _fScaleFactor,
+            "bDoSetOrigin": _bDoSetOrigin,
+            "sSetOriginType": _sSetOriginType,
+            "sSetOriginCenter": _sSetOriginCenter,
+            "lLocation": _lLocation,
+            "lRotationEuler_deg": _lRotationEuler_deg,
+            "bDoJoinObjects": _bDoJoinObjects,
+            "sJoinName": _sNewName if _bDoJoinObjects is True else None,
+        }
+        sCacheKey = xCache.GetKey(_pathFile, dicParams)
+        lObjIn = xCache.Load(sCacheKey, _clnTarget=bpy.context.collection, _bLink=_bLinkFromCache)
+    # endif
+
+    if lObjIn is None:
+        lObjIn = _DoImportObjectAny(
+            _pathFile=_pathFile,
+            _sNewName=_sNewName,
+            _fScaleFactor=_fScaleFactor,
+            _bDoSetOrigin=_bDoSetOrigin,
+            _sSetOriginType=_sSetOriginType,
+            _sSetOriginCenter=_sSetOriginCenter,
+            _lLocation=_lLocation,
+            _lRotationEuler_deg=_lRotationEuler_deg,
+            _bDoJoinObjects=_bDoJoinObjects,
+        )
+
+        if xCache is not None and len(lObjIn) > 0:
+            xIndex = CreateObjectHierarchyIndex()
+            lChildren = [
+                y for x in lObjIn for y in GetObjectChildrenNames(bpy.data.objects[x], bRecursive=True, _xIndex=xIndex)
+            ]
+            xCache.Store(sCacheKey, lObjIn, _lChildren=lChildren, _pathSource=_pathFile)
+        # endif
+    # endif
+
+    # print(lObjIn)
+    if isinstance(_sNewName, str):
+        lNewObjIn: list[str] = []
+        if len(lObjIn) > 1:
+            for iIdx, sObjIn in enumerate(lObjIn):
+                objIn = bpy.data.objects[sObjIn]
+                objIn.name = f"{_sNewName}-{iIdx}"
+                lNewObjIn.append(objIn.name)
+            # endfor
+        elif len(lObjIn) == 1:
+            objIn = bpy.data.objects[lObjIn[0]]
+            objIn.name = _sNewName
+            lNewObjIn.append(objIn.name)
+        # endif
+        lObjIn = lNewObjIn
+    # endif
+    # print(lObjIn)
+
+    return lObjIn
+
+
+# enddef
+
+
+################################################################################
+def _DoImportObjectAny(
+    *,
+    _pathFile: Path,
+    _sNewName: str = None,
+    _fScaleFactor: float = None,
+    _bDoSetOrigin: bool = False,
+    _sSetOriginType: str = None,
+    _sSetOriginCenter: str = None,
+    _lLocation: list[float] = None,
+    _lRotationEuler_deg: list[float] = None,
+    _bDoJoinObjects: bool = False,
 ) -> list[str]:
     lObjIn: list[str]
     if _pathFile.suffix == ".obj":
@@ -906,24 +1852,6 @@ def ImportObjectAny(
         # endfor
     # enddef
 
-    # print(lObjIn)
-    if isinstance(_sNewName, str):
-        lNewObjIn: list[str] = []
-        if len(lObjIn) > 1:
-            for iIdx, sObjIn in enumerate(lObjIn):
-                objIn = bpy.data.objects[sObjIn]
-                objIn.name = f"{_sNewName}-{iIdx}"
-                lNewObjIn.append(objIn.name)
-            # endfor
-        elif len(lObjIn) == 1:
-            objIn = bpy.data.objects[lObjIn[0]]
-            objIn.name = _sNewName
-            lNewObjIn.append(objIn.name)
-        # endif
-        lObjIn = lNewObjIn
-    # endif
-    # print(lObjIn)
-
     return lObjIn
 
 
@@ -948,6 +1876,153 @@ def SmoothObjectSurface_VoxelRemesh(_objIn: bpy.types.Object, _fVoxelSize: float
 # enddef
 
 
+################################################################################
+def GetBakeDevice(_sDevice: str = "AUTO") -> str:
+    """Get the Cycles device used for baking.
+
+    Args:
+        _sDevice (str, optional): One of 'AUTO', 'GPU' or 'CPU'. For 'AUTO', the GPU is used
+                                  if a GPU compute device is enabled in the Cycles preferences,
+                                  and the CPU otherwise. Defaults to "AUTO".
+
+    Returns:
+        str: The Cycles device 'GPU' or 'CPU'.
+    """
+    if _sDevice not in ["AUTO", "GPU", "CPU"]:
+        raise RuntimeError(f"Invalid bake device '{_sDevice}'. Expected one of 'AUTO', 'GPU', 'CPU'")
+    # endif
+
+    if _sDevice != "AUTO":
+        return _sDevice
+    # endif
+
+    xAddon = bpy.context.preferences.addons.get("cycles")
+    if xAddon is None or xAddon.preferences.compute_device_type == "NONE":
+        return "CPU"
+    # endif
+
+    xPrefs = xAddon.preferences
+    xPrefs.get_devices()
+    if any(x.use is True and x.type != "CPU" for x in xPrefs.devices):
+        return "GPU"
+    # endif
+
+    return "CPU"
+
+
+# enddef
+
+
+################################################################################
+def _UpdateHashImage(_xHash, _imgX: bpy.types.Image):
+    _xHash.update(f"{_imgX.name}|{_imgX.source}|{tuple(_imgX.size)}".encode())
+    if _imgX.packed_file is not None:
+        _xHash.update(_imgX.packed_file.data)
+        return
+    # endif
+
+    pathImg = Path(bpy.path.abspath(_imgX.filepath))
+    if _imgX.source == "FILE" and pathImg.is_file():
+        _xHash.update(CImportCache.GetFileHash(pathImg).encode())
+    # endif
+
+
+# enddef
+
+
+################################################################################
+def _UpdateHashMaterial(_xHash, _matX: Optional[bpy.types.Material]):
+    if _matX is None:
+        _xHash.update(b"None")
+        return
+    # endif
+
+    _xHash.update(_matX.name.encode())
+    if _matX.node_tree is None:
+        _xHash.update(str(tuple(_matX.diffuse_color)).encode())
+        return
+    # endif
+
+    # Only node types, unlinked input values, images and links are considered
+    for nodX in sorted(_matX.node_tree.nodes, key=lambda x: x.name):
+        _xHash.update(f"{nodX.name}|{nodX.bl_idname}".encode())
+        for xInput in nodX.inputs:
+            if xInput.is_linked is False and hasattr(xInput, "default_value"):
+                xValue = xInput.default_value
+                if not isinstance(xValue, (bool, int, float, str)):
+                    xValue = tuple(xValue)
+                # endif
+                _xHash.update(f"{xInput.identifier}={xValue}".encode())
+            # endif
+        # endfor
+
+        imgX = getattr(nodX, "image", None)
+        if isinstance(imgX, bpy.types.Image):
+            _UpdateHashImage(_xHash, imgX)
+        # endif
+    # endfor
+
+    for lnkX in _matX.node_tree.links:
+        sFrom = f"{lnkX.from_node.name}.{lnkX.from_socket.identifier}"
+        sTo = f"{lnkX.to_node.name}.{lnkX.to_socket.identifier}"
+        _xHash.update(f"{sFrom}>{sTo}".encode())
+    # endfor
+
+
+# enddef
+
+
+################################################################################
+def _PrepareBakeInput(_objIn: bpy.types.Object):
+    # The input is baked smooth shaded and without auto smooth. This is also applied for cached results,
+    # and before the cache key is computed, so that the key does not change by baking the object.
+    mshIn: bpy.types.Mesh = _objIn.data
+    if hasattr(mshIn, "use_auto_smooth"):
+        mshIn.use_auto_smooth = False
+    # endif
+
+    with ops._TempContextForObject(_objIn):
+        bpy.ops.object.shade_smooth()
+    # endwith
+
+
+# enddef
+
+
+################################################################################
+def _GetBakeCacheKey(_objIn: bpy.types.Object, _dicParams: dict) -> str:
+    # The result depends on the local mesh, the scale and rotation of the object,
+    # the materials with their textures and the bake parameters.
+    xHash = hashlib.sha256()
+
+    xArrays: CMeshArrays = meshbuild.GetMeshArrays(_objIn.data)
+    for sField in CMeshArrays._fields:
+        xValue = getattr(xArrays, sField)
+        if isinstance(xValue, dict):
+            for sName in sorted(xValue.keys()):
+                xHash.update(sName.encode())
+                xHash.update(np.ascontiguousarray(xValue[sName]).tobytes())
+            # endfor
+        else:
+            xHash.update(np.ascontiguousarray(xValue).tobytes())
+        # endif
+    # endfor
+
+    xHash.update(np.array(_objIn.matrix_world.to_3x3(), dtype=np.float32).tobytes())
+
+    for xSlot in _objIn.material_slots:
+        _UpdateHashMaterial(xHash, xSlot.material)
+    # endfor
+
+    dicKey = {"tBlenderVersion": list(bpy.app.version), "dicParams": _dicParams}
+    xHash.update(json.dumps(dicKey, sort_keys=True).encode())
+
+    return xHash.hexdigest()
+
+
+# enddef
+
+
 ################################################################################
 def VoxelRemesh_BakeTexture(
     *,
@@ -962,19 +2037,74 @@ def VoxelRemesh_BakeTexture(
     _tBakedTexRes: Tuple[int, int] = (2048, 2048),
     _fBakedTexCageExtrusion: float = 0.1,
     _pathTex: Optional[Path] = None,
+    _sBakeDevice: str = "AUTO",
+    _iBakeSamples: int = 16,
+    _iBakeThreads: Optional[int] = None,
+    _pathCache: Optional[Path] = None,
 ):
+    """Create a low poly version of a mesh object by voxel remeshing,
+    and bake the diffuse color and the normals of the original object to textures of the low poly object.
+
+    Args:
+        _objIn (bpy.types.Object): The mesh object.
+        _fRemeshVoxelSize (float): The voxel size of the remesh.
+        _sLowPolyObjName (str, optional): The name of the low poly object.
+        _tBakedTexRes (Tuple[int, int], optional): The resolution of the baked textures.
+        _pathTex (Path, optional): Folder the textures are saved to. If not given, the textures are packed.
+        _sBakeDevice (str, optional): The Cycles device 'AUTO', 'GPU' or 'CPU'. See 'GetBakeDevice()'.
+        _iBakeSamples (int, optional): The number of Cycles samples for baking.
+        _iBakeThreads (int, optional): The number of CPU threads for baking. Defaults to the number of CPUs.
+        _pathCache (Path, optional): If given, the baked low poly objects are cached in this folder,
+                                     keyed by the hash of the input mesh, its materials and textures,
+                                     and the parameters. For a cached result, the low poly object
+                                     is loaded from the cache instead of being baked again.
+
+    Returns:
+        bpy.types.Object: The low poly object.
+    """
     if _objIn is None or not isinstance(_objIn, bpy.types.Object) or _objIn.type != "MESH":
         raise RuntimeError("Given object argument is not a Blender mesh object")
     # endif
 
+    _PrepareBakeInput(_objIn)
+
+    xCache: Optional[CImportCache] = None
+    sCacheKey: Optional[str] = None
+    if _pathCache is not None:
+        xCache = CImportCache(Path(_pathCache))
+        dicParams = {
+            "fRemeshVoxelSize": _fRemeshVoxelSize,
+            "bRemeshSmoothShade": _bRemeshSmoothShade,
+            "bDoSmoothSurface": _bDoSmoothSurface,
+            "iSmoothIterations": _iSmoothIterations,
+            "fSmoothFactor": _fSmoothFactor,
+            "iMultiResIterCnt": _iMultiResIterCnt,
+            "tBakedTexRes": list(_tBakedTexRes),
+            "fBakedTexCageExtrusion": _fBakedTexCageExtrusion,
+            "sPathTex": None if _pathTex is None else Path(_pathTex).as_posix(),
+            "iBakeSamples": _iBakeSamples,
+        }
+        sCacheKey = _GetBakeCacheKey(_objIn, dicParams)
+
+        clnTarget = _objIn.users_collection[0] if len(_objIn.users_collection) > 0 else bpy.context.collection
+        lObjLp = xCache.Load(sCacheKey, _clnTarget=clnTarget)
+        if lObjLp is not None:
+            objLp: bpy.types.Object = bpy.data.objects[lObjLp[0]]
+            objLp.matrix_world = _objIn.matrix_world.copy()
+            if _sLowPolyObjName is not None and isinstance(_sLowPolyObjName, str):
+                objLp.name = _sLowPolyObjName
+            # endif
+
+            # Same visibility state as after baking
+            _objIn.hide_render = True
+            _objIn.hide_set(True)
+            return objLp
+        # endif
+    # endif
+
     tNodeSpace = (70, 25)
     tNodeSpaceSmall = (30, 15)
 
-    mshIn: bpy.types.Mesh = _objIn.data
-    if hasattr(mshIn, "use_auto_smooth"):
-        mshIn.use_auto_smooth = False
-    # endif
-    
     objLp: bpy.types.Object = ops.Duplicate(_objIn)
     if _sLowPolyObjName is not None and isinstance(_sLowPolyObjName, str):
         objLp.name = _sLowPolyObjName
@@ -1079,13 +2209,10 @@ def VoxelRemesh_BakeTexture(
     # Texture baking
     # https://docs.blender.org/api/current/bpy.ops.object.html
 
-    # Make original and lp shade smooth
+    # Make lp shade smooth, the original is already smooth shaded by '_PrepareBakeInput()'
     with ops._TempContextForObject(objLp):
         bpy.ops.object.shade_smooth()
     # endwith
-    with ops._TempContextForObject(_objIn):
-        bpy.ops.object.shade_smooth()
-    # endwith
 
     xScene = bpy.context.scene
     xRender = xScene.render
@@ -1097,6 +2224,8 @@ def VoxelRemesh_BakeTexture(
         "use_bake_multires": xRender.use_bake_multires,
         "bake/cage_extrusion": xRender.bake.cage_extrusion,
         "bake_type": xRender.bake_type,
+        "threads_mode": xRender.threads_mode,
+        "threads": xRender.threads,
     }
 
     # Store Cycles Values
@@ -1110,11 +2239,16 @@ def VoxelRemesh_BakeTexture(
 
     # Set general baking values
     xRender.engine = "CYCLES"
-    xCycles.device = "GPU"
-    xCycles.preview_samples = 16
-    xCycles.samples = 16
+    xCycles.device = GetBakeDevice(_sBakeDevice)
+    xCycles.preview_samples = _iBakeSamples
+    xCycles.samples = _iBakeSamples
     xCycles.use_denoising = True
 
+    if _iBakeThreads is not None:
+        xRender.threads_mode = "FIXED"
+        xRender.threads = _iBakeThreads
+    # endif
+
     matLp = mshLp.materials[0]
     nodTexNorm: bpy.types.Node = GetNodeByLabelOrId(matLp.node_tree, "Normal")
     nodTexDiff: bpy.types.Node = GetNodeByLabelOrId(matLp.node_tree, "Diffuse")
@@ -1168,6 +2302,8 @@ def VoxelRemesh_BakeTexture(
     xRender.use_bake_multires = dicRender["use_bake_multires"]
     xRender.bake.cage_extrusion = dicRender["bake/cage_extrusion"]
     xRender.bake_type = dicRender["bake_type"]
+    xRender.threads_mode = dicRender["threads_mode"]
+    xRender.threads = dicRender["threads"]
 
     xCycles.device = dicCycles["device"]
     xCycles.preview_samples = dicCycles["preview_samples"]
@@ -1204,6 +2340,10 @@ def VoxelRemesh_BakeTexture(
     # Clean-up
     objLp.modifiers.clear()
 
+    if xCache is not None:
+        xCache.Store(sCacheKey, [objLp.name])
+    # endif
+
     return objLp
 
 
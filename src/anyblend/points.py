@@ -26,18 +26,203 @@
 # </LICENSE>
 ###
 
-import bpy
 import mathutils
 
 import numpy as np
-import copy
 import math
-import random
-from typing import Optional, Union
+import itertools
+from typing import Iterator, Optional, Union
 
+from anyblend import rng
 from anyblend.cls_polygons import CPolygons
-from anyblend.cls_boundbox import CBoundingBox
 from anyblend.cls_instances import CInstances
+from anyblend.cls_placement_engine import CPlacementEngine
+
+
+######################################################
+def _CreatePlacementEngine(
+    *,
+    lTrgObjNames: list[str],
+    iPntCnt: Optional[int],
+    fMinDist: float,
+    fMaxDist: float,
+    fMinHorizViewAngleSep_deg: float,
+    bUseCameraFov: bool,
+    lCamFovBorder_deg: list[float],
+    lCamDistRange: Optional[list[float]],
+    matCamWorld: Optional[mathutils.Matrix],
+    lCamFov_deg: Optional[list[float]],
+    lVexGrpNames: Optional[list[str]],
+    iSeed: Optional[int],
+    xRng: Optional[np.random.Generator],
+    iMaxTrials: int,
+    xInstances: Optional[CInstances],
+    bUseBoundBox: bool,
+    xInstanceOrigin: Union[list[float], str, None],
+    xObstacles: Optional[CInstances],
+    bUniformly: bool,
+    bFilterPolygons: bool,
+) -> tuple[CPlacementEngine, int, Optional[list[str]], Optional[np.ndarray]]:
+    """Check the arguments of the random point functions and export the target surfaces,
+    the instance and obstacle bounding boxes and the camera into a placement engine.
+    See GetRndPointsOnSurface() and IterRndPointsOnSurface() for the arguments.
+
+    Returns:
+        tuple: The placement engine, the number of points to place, the instance names and the anchor
+               position of every instance, i.e. the position in its bounding box that is placed on the surface.
+    """
+    if iPntCnt is None and xInstances is None:
+        raise RuntimeError("Neither point count nor list of objects is given")
+    # endif
+
+    if bUseBoundBox is True and xInstances is None:
+        raise RuntimeError("If 'bUseBoundBox' is true, need to specify list of objects")
+    # endif
+
+    if iPntCnt is None:
+        iPntCnt = len(xInstances)
+    # endif
+
+    sInstOrig = None
+    lInstOrig = None
+    if isinstance(xInstanceOrigin, str):
+        sInstOrig = xInstanceOrigin
+        if sInstOrig not in ["ORIG"]:
+            raise RuntimeError(f"Instance origin string must be 'ORIG', but '{sInstOrig}' was given")
+        # endif
+    elif isinstance(xInstanceOrigin, list):
+        lInstOrig = xInstanceOrigin
+        if len(lInstOrig) != 3:
+            raise RuntimeError("Instance origin list must be of length three")
+        # endif
+    elif xInstanceOrigin is None:
+        lInstOrig = [0, 0, -0.5]
+    else:
+        raise RuntimeError(f"Invalid instance origin argument: {xInstanceOrigin}")
+    # endif
+
+    xPolys = CPolygons()
+    for iIdx, sTrgObjName in enumerate(lTrgObjNames):
+        sVexGrpName = None
+        if isinstance(lVexGrpNames, list) and iIdx < len(lVexGrpNames) and isinstance(lVexGrpNames[iIdx], str):
+            sVexGrpName = lVexGrpNames[iIdx]
+        # endif
+        xPolys.AddFromObject(_sObjectName=sTrgObjName, _sVexGrpName=sVexGrpName)
+    # endfor
+
+    lInstNames = None
+    lBoxes = None
+    aAnchors = None
+    if isinstance(xInstances, CInstances):
+        lInstNames = xInstances.lNames
+        lBoxes = []
+        lAnchors = []
+        for sInstName in lInstNames:
+            xInst = xInstances[sInstName]
+            xBox = xInst.xBoundBox.GetOrientedBox()
+            if lInstOrig is not None:
+                lAnchors.append(xBox.aCenter + xBox.GetDelta(lInstOrig))
+            elif sInstOrig == "ORIG":
+                lAnchors.append(np.array(xInst.vOrigin))
+            else:
+                raise RuntimeError("Invalid instance origin")
+            # endif
+            lBoxes.append(xBox)
+        # endfor
+        aAnchors = np.array(lAnchors).reshape(-1, 3)
+    # endif
+
+    lObstacleBoxes = None
+    if bUseBoundBox is True and xObstacles is not None:
+        lObstacleBoxes = [xObst.xBoundBox.GetOrientedBox() for xObst in xObstacles]
+    # endif
+
+    xEngine = CPlacementEngine(
+        xPolys,
+        _sSampling="AREA" if bUniformly is True else "POLY",
+        _aCamWorld=None if matCamWorld is None else np.array(matCamWorld),
+        _lBoxes=lBoxes if bUseBoundBox is True else None,
+        _aBoxAnchors=aAnchors if bUseBoundBox is True else None,
+        _lObstacleBoxes=lObstacleBoxes,
+        _xRng=rng.GetGenerator(iSeed) if xRng is None else xRng,
+        _fMinDist=fMinDist,
+        _fMaxDist=fMaxDist,
+        _fMinHorizViewAngleSep_deg=fMinHorizViewAngleSep_deg,
+        _bUseCameraFov=bUseCameraFov,
+        _lCamFovBorder_deg=lCamFovBorder_deg,
+        _lCamDistRange=lCamDistRange,
+        _lCamFov_deg=lCamFov_deg,
+        _iMaxTrials=iMaxTrials,
+    )
+
+    if bUniformly is True:
+        _PrepareUniformSampling(xEngine, bFilterPolygons=bFilterPolygons, bUseCameraFov=bUseCameraFov)
+    # endif
+
+    return xEngine, iPntCnt, lInstNames, aAnchors
+
+
+# enddef
+
+
+######################################################
+def _PrepareUniformSampling(xEngine: CPlacementEngine, *, bFilterPolygons: bool, bUseCameraFov: bool):
+    iPlyCnt = xEngine.xSampler.iTotalPolyCount
+    if iPlyCnt == 0:
+        raise RuntimeError("There are no polynomials to distribute points on")
+    # endif
+
+    # if a camera fov or distance from camera is given,
+    # then set the polygon weights according to constraint
+    # before generating random points.
+    # This speeds up point generation as only polygons are used,
+    # that are inside the allowed range.
+    # This optimization can only be done if there are more than
+    # 4 polygons. Otherwise, nothing will be left. You may need
+    # to subdivide the placement surface for better results.
+    if bFilterPolygons is True and bUseCameraFov is True and iPlyCnt > 4:
+        xEngine.FilterPolygons()
+    # endif
+
+
+# enddef
+
+
+######################################################
+def _GetPlacementItem(
+    iIdx: int, aPnt: np.ndarray, lInstNames: Optional[list[str]], aAnchors: Optional[np.ndarray]
+) -> tuple[Union[int, str], mathutils.Vector]:
+    """Convert a position found by the placement engine into a key and value of the result of
+    GetRndPointsOnSurface(). For instances, the key is the instance name and the value is the delta
+    from their anchor position to the placed position.
+    """
+    if lInstNames is None:
+        return iIdx, mathutils.Vector(aPnt)
+    # endif
+    return lInstNames[iIdx], mathutils.Vector(aPnt - aAnchors[iIdx])
+
+
+# enddef
+
+
+######################################################
+def _GetPlacementResult(
+    lPoints: list[Optional[np.ndarray]], lInstNames: Optional[list[str]], aAnchors: Optional[np.ndarray]
+) -> dict:
+    """Convert the positions found by the placement engine into the result of GetRndPointsOnSurface()."""
+    dicTrgPnts = {}
+    for iIdx, aPnt in enumerate(lPoints):
+        if aPnt is None:
+            dicTrgPnts[iIdx if lInstNames is None else lInstNames[iIdx]] = None
+        else:
+            xKey, vPnt = _GetPlacementItem(iIdx, aPnt, lInstNames, aAnchors)
+            dicTrgPnts[xKey] = vPnt
+        # endif
+    # endfor
+    return dicTrgPnts
+
+
+# enddef
 
 
 ######################################################
@@ -55,6 +240,7 @@ def GetRndPointsOnSurface(
     lCamFov_deg: Optional[list[float]] = None,
     lVexGrpNames: Optional[list[str]] = None,
     iSeed: Optional[int] = None,
+    xRng: Optional[np.random.Generator] = None,
     iMaxTrials: int = 20,
     xInstances: Optional[CInstances] = None,
     bUseBoundBox: bool = False,
@@ -139,7 +325,13 @@ def GetRndPointsOnSurface(
             will not be intersected by the object's bounding boxes.
 
         iSeed (int, optional):
-            The random seed to use. Defaults to None.
+            The random seed to use. Only used if 'xRng' is not given. If neither is given,
+            the generator is seeded from the global state of 'random', so that 'random.seed()'
+            still gives reproducible results. Defaults to None.
+
+        xRng (np.random.Generator, optional):
+            The random number generator to use, e.g. from 'rng.SpawnGenerators()'.
+            Independent placements with their own generators can run concurrently. Defaults to None.
 
         iMaxTrials (int, optional):
             The maximal number of random trials to find a valid position
@@ -148,296 +340,30 @@ def GetRndPointsOnSurface(
     Returns:
         list: A list of vectors of type mathutils.Vector, giving positions on the surface.
     """
-    if iSeed is not None:
-        random.seed(iSeed)
-        np.random.seed(iSeed)
-    # endif
-
-    if fMaxDist is None:
-        fMaxDist = math.inf
-    # endif
-
-    if iPntCnt is None and xInstances is None:
-        raise RuntimeError("Neither point count nor list of objects is given")
-    # endif
-
-    if bUseBoundBox is True and xInstances is None:
-        raise RuntimeError("If 'bUseBoundBox' is true, need to specify list of objects")
-    # endif
-
-    if lCamDistRange is None:
-        lCamDistRange = [0.0, math.inf]
-    # endif
-
-    if isinstance(xInstances, CInstances):
-        bHasInst = True
-        lInstNames = xInstances.lNames
-    else:
-        bHasInst = False
-        lInstNames = None
-    # endif
-
-    if iPntCnt is None:
-        iPntCnt = len(xInstances)
-    # endif
-
-    sInstOrig = None
-    lInstOrig = None
-    if isinstance(xInstanceOrigin, str):
-        sInstOrig = xInstanceOrigin
-        if sInstOrig not in ["ORIG"]:
-            raise RuntimeError(f"Instance origin string must be 'ORIG', but '{sInstOrig}' was given")
-        # endif
-    elif isinstance(xInstanceOrigin, list):
-        lInstOrig = xInstanceOrigin
-        if len(lInstOrig) != 3:
-            raise RuntimeError("Instance origin list must be of length three")
-        # endif
-    elif xInstanceOrigin is None:
-        lInstOrig = [0,0,-0.5]
-    else:
-        raise RuntimeError(f"Invalid instance origin argument: {xInstanceOrigin}")
-    # endif
-
-    lMatrixWorld = []
-    xPolys = CPolygons()
-
-    for iIdx, sTrgObjName in enumerate(lTrgObjNames):
-        sVexGrpName = None
-        if isinstance(lVexGrpNames, list) and iIdx < len(lVexGrpNames) and isinstance(lVexGrpNames[iIdx], str):
-            sVexGrpName = lVexGrpNames[iIdx]
-        # endif
-        xPolys.AddFromObject(_sObjectName=sTrgObjName, _sVexGrpName=sVexGrpName)
-        lMatrixWorld.append(bpy.data.objects[sTrgObjName].matrix_world)
-    # endfor
-
-    bHasDistConstraint = fMinDist > 1e-7 or fMaxDist != math.inf
-    bHasAngleConstraint = fMinHorizViewAngleSep_deg > 1e-6
-
-    # If a minimal view angle is specified, get the active camera
-    fMinHorizViewAngleSep_rad = None
-    # fCamHorizFov_rad = None
-    if bHasAngleConstraint is True or bUseCameraFov is True:
-        if matCamWorld is None:
-            raise RuntimeError("No camera world matrix given")
-        # endif
-
-        if bUseCameraFov is True and lCamFov_deg is None:
-            raise RuntimeError("No horizontal camera field of view given")
-        else:
-            if abs(lCamFov_deg[0]) / 2.0 - lCamFovBorder_deg[0] <= 0.1:
-                raise RuntimeError("Horizontal camera FoV border is too large")
-            # endif
-            if abs(lCamFov_deg[1]) / 2.0 - lCamFovBorder_deg[1] <= 0.1:
-                raise RuntimeError("Vertical camera FoV border is too large")
-            # endif
-            lCamFov_rad = [math.radians(abs(x)) for x in lCamFov_deg]
-            lCamMaxViewAngle_rad = [lCamFov_rad[i] / 2.0 - math.radians(lCamFovBorder_deg[i]) for i in range(2)]
-        # endif
-
-        fMinHorizViewAngleSep_rad = math.radians(abs(fMinHorizViewAngleSep_deg))
-        matProjXZ = mathutils.Matrix.OrthoProjection("XZ", 3)
-        matProjYZ = mathutils.Matrix.OrthoProjection("YZ", 3)
-        matCamWorld_inv = matCamWorld.inverted()
-        vCamOrig = matCamWorld.to_translation().to_3d()
-    # endif
-
-    # print(iPlyCnt)
-    iPlyCnt = xPolys.iTotalPolyCount
-    # print(iPlyCnt)
-
-    dicPnts: dict[int, mathutils.Vector] = {}
-    dicBoxes: dict[int, CBoundingBox] = {}
-    lHorizViewDir = []
-    vHorizViewDir_cam = None
-    lPlyIdx: list[int] = list(range(0, iPlyCnt))
-
-    for iPntIdx in range(0, iPntCnt):
-        # print(f"Test point {iPntIdx}")
-        vPos_w = None
-
-        # Try to find a position as long as there are polynomials
-        # to chose from
-        while len(lPlyIdx) > 0:
-            # Find a poly with a selection probability
-            # defined the the vertex weights.
-            for iTest in range(0, iMaxTrials):
-                iPlyIdx = random.choice(lPlyIdx)
-
-                fWeight = xPolys.GetPolyWeight(iPlyIdx)
-                fRnd = random.uniform(0, xPolys.fMaxWeight)
-
-                if fRnd < fWeight:
-                    break
-                # endif
-            # endfor test
-
-            # Evaluate position
-            vPos_w = mathutils.Vector(xPolys.GetRandomPosOnPoly(iPlyIdx))
-            # print(f"vPos_w: {vPos_w}")
-
-            if bHasAngleConstraint is True or bUseCameraFov is True:
-                vPos_cam = (matCamWorld_inv @ vPos_w.to_4d()).to_3d()
-                vViewDir_cam = vPos_cam.normalized()
-                vHorizPos_cam = matProjXZ @ vPos_cam
-                vVertPos_cam = matProjYZ @ vPos_cam
-                vHorizViewDir_cam = vHorizPos_cam.normalized()
-                vVertViewDir_cam = vVertPos_cam.normalized()
-                # print(vHorizViewDir_cam)
-            # enddef
-
-            bFovOK = True
-            if bUseCameraFov is True:
-                fCamDist = (vPos_w - vCamOrig).length
-                lViewAngle_rad = [
-                    abs(math.atan2(vHorizViewDir_cam.x, -vHorizViewDir_cam.z)),
-                    abs(math.atan2(vVertViewDir_cam.y, -vVertViewDir_cam.z)),
-                ]
-                # lViewAngle_rad = [math.acos(abs(vHorizViewDir_cam.z)), math.acos(abs(vVertViewDir_cam.z))]
-                bFovOK = (
-                    lViewAngle_rad[0] <= lCamMaxViewAngle_rad[0]
-                    and lViewAngle_rad[1] <= lCamMaxViewAngle_rad[1]
-                    and fCamDist >= lCamDistRange[0]
-                    and fCamDist <= lCamDistRange[1]
-                )
-            # endif
-
-            # if no constraint is given, or this is the first point,
-            # then accept the position
-            # print("fMinDist: {}, len(lPnts): {}".format(fMinDist, len(lPnts)))
-            if (
-                bHasDistConstraint is False
-                and bHasAngleConstraint is False
-                and bUseCameraFov is False
-                and bUseBoundBox is False
-            ) or (bUseCameraFov is True and bFovOK is True and len(xObstacles) == 0 and len(dicPnts) == 0):
-                break
-            # endif
-
-            bDistOK = True
-            if bHasDistConstraint is True:
-                lDist = [(vPos_w - x).length for i, x in dicPnts.items() if x is not None]
-                # print("vPos: {}, lPnts: {}".format(vPos, lPnts))
-                # print("MinDist: {}, lDist: {}".format(fMinDist, lDist))
-                bDistOK = all(x >= fMinDist and x <= fMaxDist for x in lDist)
-            # endif
-
-            bAngleOK = True
-            if bHasAngleConstraint is True:
-                lAngle = [vHorizViewDir_cam.angle(x) for x in lHorizViewDir]
-                bAngleOK = all(x >= fMinHorizViewAngleSep_rad for x in lAngle)
-            # endif
-
-            bBoundBoxOK = True
-            if bUseBoundBox is True:
-                # # !!! DEBUG
-                # vPos_w = lBoxs[0]["vCtr"].copy()
-                # vPos_w += mathutils.Vector((iTestPlyIdx*0.1, 0, 0))
-                # print(f"vPos_w: {vPos_w}")
-                # # !!!!!!!!!!!!!!!!!!!!!!
-                xInst = xInstances[lInstNames[iPntIdx]]
-                xBox = copy.deepcopy(xInst.xBoundBox)
-                if lInstOrig is not None:
-                    vNewCtr_w = vPos_w - xBox.GetDelta(lInstOrig)
-                    vDelta = vNewCtr_w - xBox.vCenter
-                elif sInstOrig == "ORIG":
-                    vDelta = vPos_w - xInst.vOrigin
-                else:
-                    raise RuntimeError("Invalid instance origin")
-                # endif
-
-                xBox.Move(vDelta)
-
-                for iIdx, xBoxX in dicBoxes.items():
-                    # print("{}: Test -> {}, {}".format(iPntIdx, [x for x in dicBoxX["vCtr"]], dicBoxX["tSize"]))
-                    if xBox.Intersects(xBoxX) is True:
-                        bBoundBoxOK = False
-                        break
-                    # endif
-                # endfor
-
-                if bBoundBoxOK is True:
-                    for xObst in xObstacles:
-                        if xBox.Intersects(xObst.xBoundBox) is True:
-                            bBoundBoxOK = False
-                            break
-                        # endif
-                    # endfor
-                # endif
-
-                # print(f"bBoundBoxOK: {bBoundBoxOK}")
-            # endif use bound box
-
-            if bAngleOK is True and bDistOK is True and bFovOK is True and bBoundBoxOK is True:
-                break
-            # endif
-
-            # Remove polynomial from polynomials to randomly choose from,
-            # so that it is not selected again.
-            lPlyIdx.remove(iPlyIdx)
-            vPos_w = None
-        # endwhile polynomials left
-
-        if vPos_w is not None:
-            dicPnts[iPntIdx] = vPos_w
-
-            if bUseBoundBox is True:
-                xInst = xInstances[lInstNames[iPntIdx]]
-                xBox = copy.deepcopy(xInst.xBoundBox)
-                if lInstOrig is not None:
-                    vNewCtr_w = vPos_w - xBox.GetDelta(lInstOrig)
-                    vDelta = vNewCtr_w - xBox.vCenter
-                elif sInstOrig == "ORIG":
-                    vDelta = vPos_w - xInst.vOrigin
-                else:
-                    raise RuntimeError("Invalid instance origin")
-                # endif
-
-                xBox.Move(vDelta)
-
-                dicBoxes[iPntIdx] = xBox
-            # endif
-
-            if bHasAngleConstraint is True:
-                lHorizViewDir.append(vHorizViewDir_cam)
-                # print(lHorizViewDir)
-            # endif
-        else:
-            dicPnts[iPntIdx] = None
-        # endif
-    # endfor point count
-
-    # Transform to world coordinates
-    # lPnts = [objX.matrix_world @ x for x in lPnts]
-
-    if bUseBoundBox is True or bHasInst is True:
-        dicTrgPnts = {}
-        for iIdx, vPnt in dicPnts.items():
-            if vPnt is None:
-                dicTrgPnts[lInstNames[iIdx]] = None
-
-            else:
-                xInst = xInstances[lInstNames[iIdx]]
-                xBB = xInst.xBoundBox
-
-                if lInstOrig is not None:
-                    vOrig = xBB.vCenter + xBB.GetDelta(lInstOrig)
-                elif sInstOrig == "ORIG":
-                    vOrig = xInst.vOrigin
-                else:
-                    raise RuntimeError("Invalid instance origin")
-                # endif
-
-                vTrgPnt = vPnt - vOrig
-                # print(f"\ndicBB: {dicBB}")
-                # print(f"vTrgPnt: {vTrgPnt}, vPnt: {vPnt}, vCtrBot: {vCtrBot}, location: {objA.location}")
-                dicTrgPnts[lInstNames[iIdx]] = vTrgPnt
-            # endif
-        # endfor
-        dicPnts = dicTrgPnts
-    # endif
-
-    return dicPnts
+    xEngine, iPntCnt, lInstNames, aAnchors = _CreatePlacementEngine(
+        lTrgObjNames=lTrgObjNames,
+        iPntCnt=iPntCnt,
+        fMinDist=fMinDist,
+        fMaxDist=fMaxDist,
+        fMinHorizViewAngleSep_deg=fMinHorizViewAngleSep_deg,
+        bUseCameraFov=bUseCameraFov,
+        lCamFovBorder_deg=lCamFovBorder_deg,
+        lCamDistRange=lCamDistRange,
+        matCamWorld=matCamWorld,
+        lCamFov_deg=lCamFov_deg,
+        lVexGrpNames=lVexGrpNames,
+        iSeed=iSeed,
+        xRng=xRng,
+        iMaxTrials=iMaxTrials,
+        xInstances=xInstances,
+        bUseBoundBox=bUseBoundBox,
+        xInstanceOrigin=xInstanceOrigin,
+        xObstacles=xObstacles,
+        bUniformly=False,
+        bFilterPolygons=False,
+    )
+
+    return _GetPlacementResult(xEngine.PlacePoints(iPntCnt), lInstNames, aAnchors)
 
 
 # enddef
@@ -458,6 +384,7 @@ def GetRndPointsOnSurfaceUniformly(
     lCamFov_deg: Optional[list[float]] = None,
     lVexGrpNames: Optional[list[str]] = None,
     iSeed: Optional[int] = None,
+    xRng: Optional[np.random.Generator] = None,
     iMaxTrials: int = 20,
     xInstances: Optional[CInstances] = None,
     bUseBoundBox: bool = False,
@@ -542,7 +469,13 @@ def GetRndPointsOnSurfaceUniformly(
             will not be intersected by the object's bounding boxes.
 
         iSeed (int, optional):
-            The random seed to use. Defaults to None.
+            The random seed to use. Only used if 'xRng' is not given. If neither is given,
+            the generator is seeded from the global state of 'random', so that 'random.seed()'
+            still gives reproducible results. Defaults to None.
+
+        xRng (np.random.Generator, optional):
+            The random number generator to use, e.g. from 'rng.SpawnGenerators()'.
+            Independent placements with their own generators can run concurrently. Defaults to None.
 
         iMaxTrials (int, optional):
             The maximal number of random trials to find a valid position
@@ -551,323 +484,143 @@ def GetRndPointsOnSurfaceUniformly(
     Returns:
         list: A list of vectors of type mathutils.Vector, giving positions on the surface.
     """
-    if iSeed is not None:
-        random.seed(iSeed)
-        np.random.seed(iSeed)
-    # endif
-
-    if fMaxDist is None:
-        fMaxDist = math.inf
-    # endif
-
-    if iPntCnt is None and xInstances is None:
-        raise RuntimeError("Neither point count nor list of objects is given")
-    # endif
-
-    if bUseBoundBox is True and xInstances is None:
-        raise RuntimeError("If 'bUseBoundBox' is true, need to specify list of objects")
-    # endif
-
-    if lCamDistRange is None:
-        lCamDistRange = [0.0, math.inf]
-    # endif
-
-    if isinstance(xInstances, CInstances):
-        bHasInst = True
-        lInstNames = xInstances.lNames
-    else:
-        bHasInst = False
-        lInstNames = None
-    # endif
-
-    if iPntCnt is None:
-        iPntCnt = len(xInstances)
-    # endif
-
-    sInstOrig = None
-    lInstOrig = None
-    if isinstance(xInstanceOrigin, str):
-        sInstOrig = xInstanceOrigin
-        if sInstOrig not in ["ORIG"]:
-            raise RuntimeError(f"Instance origin string must be 'ORIG', but '{sInstOrig}' was given")
-        # endif
-    elif isinstance(xInstanceOrigin, list):
-        lInstOrig = xInstanceOrigin
-        if len(lInstOrig) != 3:
-            raise RuntimeError("Instance origin list must be of length three")
-        # endif
-    else:
-        raise RuntimeError(f"Invalid instance origin argument: {xInstanceOrigin}")
-    # endif
-
-    lMatrixWorld = []
-    xPolys = CPolygons()
+    xEngine, iPntCnt, lInstNames, aAnchors = _CreatePlacementEngine(
+        lTrgObjNames=lTrgObjNames,
+        iPntCnt=iPntCnt,
+        fMinDist=fMinDist,
+        fMaxDist=fMaxDist,
+        fMinHorizViewAngleSep_deg=fMinHorizViewAngleSep_deg,
+        bUseCameraFov=bUseCameraFov,
+        lCamFovBorder_deg=lCamFovBorder_deg,
+        lCamDistRange=lCamDistRange,
+        matCamWorld=matCamWorld,
+        lCamFov_deg=lCamFov_deg,
+        lVexGrpNames=lVexGrpNames,
+        iSeed=iSeed,
+        xRng=xRng,
+        iMaxTrials=iMaxTrials,
+        xInstances=xInstances,
+        bUseBoundBox=bUseBoundBox,
+        xInstanceOrigin=xInstanceOrigin,
+        xObstacles=xObstacles,
+        bUniformly=True,
+        bFilterPolygons=bFilterPolygons,
+    )
+
+    return _GetPlacementResult(xEngine.PlacePoints(iPntCnt), lInstNames, aAnchors)
 
-    for iIdx, sTrgObjName in enumerate(lTrgObjNames):
-        sVexGrpName = None
-        if isinstance(lVexGrpNames, list) and iIdx < len(lVexGrpNames) and isinstance(lVexGrpNames[iIdx], str):
-            sVexGrpName = lVexGrpNames[iIdx]
-        # endif
-        xPolys.AddFromObject(_sObjectName=sTrgObjName, _sVexGrpName=sVexGrpName)
-        lMatrixWorld.append(bpy.data.objects[sTrgObjName].matrix_world)
-    # endfor
 
-    bHasDistConstraint = fMinDist > 1e-7 or fMaxDist != math.inf
-    bHasAngleConstraint = fMinHorizViewAngleSep_deg > 1e-6
+# enddef
 
-    # If a minimal view angle is specified, get the active camera
-    fMinHorizViewAngleSep_rad = None
-    # fCamHorizFov_rad = None
-    if bHasAngleConstraint is True or bUseCameraFov is True:
-        if matCamWorld is None:
-            raise RuntimeError("No camera world matrix given")
-        # endif
 
-        if bUseCameraFov is True and lCamFov_deg is None:
-            raise RuntimeError("No horizontal camera field of view given")
-        else:
-            if abs(lCamFov_deg[0]) / 2.0 - lCamFovBorder_deg[0] <= 0.1:
-                raise RuntimeError("Horizontal camera FoV border is too large")
-            # endif
-            if abs(lCamFov_deg[1]) / 2.0 - lCamFovBorder_deg[1] <= 0.1:
-                raise RuntimeError("Vertical camera FoV border is too large")
-            # endif
-            lCamFov_rad = [math.radians(abs(x)) for x in lCamFov_deg]
-            lCamMaxViewAngle_rad = [lCamFov_rad[i] / 2.0 - math.radians(lCamFovBorder_deg[i]) for i in range(2)]
+######################################################
+def _IterPlacementChunks(xItems: Iterator, iChunkSize: int) -> Iterator[list]:
+    while True:
+        lChunk = list(itertools.islice(xItems, iChunkSize))
+        if len(lChunk) == 0:
+            return
         # endif
+        yield lChunk
+    # endwhile
 
-        fMinHorizViewAngleSep_rad = math.radians(abs(fMinHorizViewAngleSep_deg))
-        matProjXZ = mathutils.Matrix.OrthoProjection("XZ", 3)
-        matProjYZ = mathutils.Matrix.OrthoProjection("YZ", 3)
-        matCamWorld_inv = matCamWorld.inverted()
-        vCamOrig = matCamWorld.to_translation().to_3d()
-    # endif
 
-    # print(iPlyCnt)
-    iPlyCnt = xPolys.iTotalPolyCount
-    # print(f"xPolys.iTotalPolyCount: {xPolys.iTotalPolyCount}")
-    if iPlyCnt == 0:
-        raise RuntimeError("There are no polynomials to distribute points on")
-    # endif
+# enddef
 
-    # if a camera fov or distance from camera is given,
-    # then set the polygon weights according to constraint
-    # before generating random points.
-    # This speeds up point generation as only polygons are used,
-    # that are inside the allowed range.
-    # This optimization can only be done if there are more than
-    # 4 polygons. Otherwise, nothing will be left. You may need
-    # to subdivide the placement surface for better results.
-    if bFilterPolygons is True and bUseCameraFov is True and iPlyCnt > 4:
-        for iVexIdx, xObjData in xPolys.lObjectVertexIndices:
-            vPos_w = mathutils.Vector(xObjData.aVex[iVexIdx])
-
-            vPos_cam = (matCamWorld_inv @ vPos_w.to_4d()).to_3d()
-            # vViewDir_cam = vPos_cam.normalized()
-            vHorizPos_cam = matProjXZ @ vPos_cam
-            vVertPos_cam = matProjYZ @ vPos_cam
-            vHorizViewDir_cam = vHorizPos_cam.normalized()
-            vVertViewDir_cam = vVertPos_cam.normalized()
-
-            fCamDist = (vPos_w - vCamOrig).length
-            lViewAngle_rad = [
-                abs(math.atan2(vHorizViewDir_cam.x, -vHorizViewDir_cam.z)),
-                abs(math.atan2(vVertViewDir_cam.y, -vVertViewDir_cam.z)),
-            ]
-
-            fW: float = max(0.0, 1.0 - max(0.0, lViewAngle_rad[0] - lCamMaxViewAngle_rad[0]) / lCamMaxViewAngle_rad[0])
-            fW *= max(0.0, 1.0 - max(0.0, lViewAngle_rad[1] - lCamMaxViewAngle_rad[1]) / lCamMaxViewAngle_rad[1])
-            fW *= max(0.0, 1.0 - max(0.0, lCamDistRange[0] - fCamDist) / lCamDistRange[0])
-            fW *= max(0.0, 1.0 - max(0.0, fCamDist - lCamDistRange[1]) / lCamDistRange[1])
-            xObjData.lWeights[iVexIdx] = fW
-        # endfor
-    # endif
 
-    dicPnts: dict[int, mathutils.Vector] = {}
-    dicBoxes: dict[int, CBoundingBox] = {}
-    lHorizViewDir = []
-    vHorizViewDir_cam = None
-    # lPlyIdx: list[int] = list(range(0, iPlyCnt))
-
-    for iPntIdx in range(0, iPntCnt):
-        # print(f"Test point {iPntIdx}")
-        vPos_w = None
-
-        # Try to find a position as long as there are polynomials
-        # to chose from
-        iAttempt = 0
-        while iAttempt < iMaxTrials:
-            # Evaluate position
-            vPos_w = mathutils.Vector(xPolys.SampleUniformlyByWeightAndArea())
-            # print(f"vPos_w: {vPos_w}")
-
-            if bHasAngleConstraint is True or bUseCameraFov is True:
-                vPos_cam = (matCamWorld_inv @ vPos_w.to_4d()).to_3d()
-                # vViewDir_cam = vPos_cam.normalized()
-                vHorizPos_cam = matProjXZ @ vPos_cam
-                vVertPos_cam = matProjYZ @ vPos_cam
-                vHorizViewDir_cam = vHorizPos_cam.normalized()
-                vVertViewDir_cam = vVertPos_cam.normalized()
-                # print(vHorizViewDir_cam)
-            # enddef
-
-            bFovOK = True
-            if bUseCameraFov is True:
-                fCamDist = (vPos_w - vCamOrig).length
-                lViewAngle_rad = [
-                    abs(math.atan2(vHorizViewDir_cam.x, -vHorizViewDir_cam.z)),
-                    abs(math.atan2(vVertViewDir_cam.y, -vVertViewDir_cam.z)),
-                ]
-                bFovOK = (
-                    lViewAngle_rad[0] <= lCamMaxViewAngle_rad[0]
-                    and lViewAngle_rad[1] <= lCamMaxViewAngle_rad[1]
-                    and fCamDist >= lCamDistRange[0]
-                    and fCamDist <= lCamDistRange[1]
-                )
-            # endif
+######################################################
+def IterRndPointsOnSurface(
+    *,
+    lTrgObjNames: list[str],
+    iPntCnt: Optional[int] = None,
+    fMinDist: float = 0.0,
+    fMaxDist: float = math.inf,
+    fMinHorizViewAngleSep_deg: float = 0.0,
+    bUseCameraFov: bool = False,
+    lCamFovBorder_deg: list[float] = [0.0, 0.0],
+    lCamDistRange: list[float] = None,
+    matCamWorld: Optional[mathutils.Matrix] = None,
+    lCamFov_deg: Optional[list[float]] = None,
+    lVexGrpNames: Optional[list[str]] = None,
+    iSeed: Optional[int] = None,
+    xRng: Optional[np.random.Generator] = None,
+    iMaxTrials: int = 20,
+    xInstances: Optional[CInstances] = None,
+    bUseBoundBox: bool = False,
+    xInstanceOrigin: Union[list[float], str, None] = None,
+    xObstacles: Optional[CInstances] = None,
+    bUniformly: bool = False,
+    bFilterPolygons: bool = False,
+    iChunkSize: Optional[int] = None,
+) -> Iterator:
+    """Lazily place points at random positions on the surface.
+       Every point is only placed, when the next item is requested from the returned iterator.
+       Only placed points are yielded, points for which no valid position is found are skipped.
+       In this way, the caller can already process placed points and stop the placement at any time,
+       e.g. when a time budget is used up.
 
-            # print(
-            #     f"{iAttempt}/{iMaxTrials}: bUseCameraFov ({bUseCameraFov}), bFovOK ({bFovOK}), fCamDist ({fCamDist}), lCamDistRange: ({lCamDistRange})"
-            # )
-            # print(f"> lViewAngle_rad: ({lViewAngle_rad}), lCamMaxViewAngle_rad: ({lCamMaxViewAngle_rad})")
-            # print(" ")
-
-            # if no constraint is given, or this is the first point,
-            # then accept the position
-            # print("fMinDist: {}, len(lPnts): {}".format(fMinDist, len(lPnts)))
-            if (
-                bHasDistConstraint is False
-                and bHasAngleConstraint is False
-                and bUseCameraFov is False
-                and bUseBoundBox is False
-            ) or (bUseCameraFov is True and bFovOK is True and len(xObstacles) == 0 and len(dicPnts) == 0):
+    Example:
+    ```python
+        for sInstName, vDelta in points.IterRndPointsOnSurface(lTrgObjNames=["Ground"], xInstances=xInst):
+            xInst[sInstName].MoveLocation(vDelta)
+            if time.time() > fEndTime:
                 break
             # endif
+        # endfor
+    ```
 
-            bDistOK = True
-            if bHasDistConstraint is True:
-                lDist = [(vPos_w - x).length for i, x in dicPnts.items() if x is not None]
-                # print("vPos: {}, lPnts: {}".format(vPos, lPnts))
-                # print("MinDist: {}, lDist: {}".format(fMinDist, lDist))
-                bDistOK = all(x >= fMinDist and x <= fMaxDist for x in lDist)
-            # endif
-
-            bAngleOK = True
-            if bHasAngleConstraint is True:
-                lAngle = [vHorizViewDir_cam.angle(x) for x in lHorizViewDir]
-                bAngleOK = all(x >= fMinHorizViewAngleSep_rad for x in lAngle)
-            # endif
-
-            bBoundBoxOK = True
-            if bUseBoundBox is True:
-                # # !!! DEBUG
-                # vPos_w = lBoxs[0]["vCtr"].copy()
-                # vPos_w += mathutils.Vector((iTestPlyIdx*0.1, 0, 0))
-                # print(f"vPos_w: {vPos_w}")
-                # # !!!!!!!!!!!!!!!!!!!!!!
-                xInst = xInstances[lInstNames[iPntIdx]]
-                xBox = copy.deepcopy(xInst.xBoundBox)
-                if lInstOrig is not None:
-                    vNewCtr_w = vPos_w - xBox.GetDelta(lInstOrig)
-                    vDelta = vNewCtr_w - xBox.vCenter
-                elif sInstOrig == "ORIG":
-                    vDelta = vPos_w - xInst.vOrigin
-                else:
-                    raise RuntimeError("Invalid instance origin")
-                # endif
-
-                xBox.Move(vDelta)
-
-                for iIdx, xBoxX in dicBoxes.items():
-                    # print("{}: Test -> {}, {}".format(iPntIdx, [x for x in dicBoxX["vCtr"]], dicBoxX["tSize"]))
-                    if xBox.Intersects(xBoxX) is True:
-                        bBoundBoxOK = False
-                        break
-                    # endif
-                # endfor
-
-                if bBoundBoxOK is True:
-                    for xObst in xObstacles:
-                        if xBox.Intersects(xObst.xBoundBox) is True:
-                            bBoundBoxOK = False
-                            break
-                        # endif
-                    # endfor
-                # endif
-
-                # print(f"bBoundBoxOK: {bBoundBoxOK}")
-            # endif use bound box
-
-            if bAngleOK is True and bDistOK is True and bFovOK is True and bBoundBoxOK is True:
-                break
-            # endif
+    Args:
+        See GetRndPointsOnSurface() and GetRndPointsOnSurfaceUniformly() for the placement arguments.
 
-            # Remove polynomial from polynomials to randomly choose from,
-            # so that it is not selected again.
-            iAttempt += 1
-            vPos_w = None
-        # endwhile polynomials left
-
-        if vPos_w is not None:
-            dicPnts[iPntIdx] = vPos_w
-
-            if bUseBoundBox is True:
-                xInst = xInstances[lInstNames[iPntIdx]]
-                xBox = copy.deepcopy(xInst.xBoundBox)
-                if lInstOrig is not None:
-                    vNewCtr_w = vPos_w - xBox.GetDelta(lInstOrig)
-                    vDelta = vNewCtr_w - xBox.vCenter
-                elif sInstOrig == "ORIG":
-                    vDelta = vPos_w - xInst.vOrigin
-                else:
-                    raise RuntimeError("Invalid instance origin")
-                # endif
-
-                xBox.Move(vDelta)
-
-                dicBoxes[iPntIdx] = xBox
-            # endif
+        bUniformly (bool, optional):
+            If true, samples positions uniformly by the weighted polygon area,
+            like GetRndPointsOnSurfaceUniformly(). Defaults to False.
 
-            if bHasAngleConstraint is True:
-                lHorizViewDir.append(vHorizViewDir_cam)
-                # print(lHorizViewDir)
-            # endif
-        else:
-            dicPnts[iPntIdx] = None
-        # endif
-    # endfor point count
+        bFilterPolygons (bool, optional):
+            Only used if 'bUniformly' is true. See GetRndPointsOnSurfaceUniformly(). Defaults to False.
 
-    # Transform to world coordinates
-    # lPnts = [objX.matrix_world @ x for x in lPnts]
+        iChunkSize (int, optional):
+            If given, yields lists of up to this number of placed points. Defaults to None.
 
-    if bUseBoundBox is True or bHasInst is True:
-        dicTrgPnts = {}
-        for iIdx, vPnt in dicPnts.items():
-            if vPnt is None:
-                dicTrgPnts[lInstNames[iIdx]] = None
+    Raises:
+        RuntimeError: if the arguments are invalid. This is raised on call, not on iteration.
 
-            else:
-                xInst = xInstances[lInstNames[iIdx]]
-                xBB = xInst.xBoundBox
-
-                if lInstOrig is not None:
-                    vOrig = xBB.vCenter + xBB.GetDelta(lInstOrig)
-                elif sInstOrig == "ORIG":
-                    vOrig = xInst.vOrigin
-                else:
-                    raise RuntimeError("Invalid instance origin")
-                # endif
-
-                vTrgPnt = vPnt - vOrig
-                # print(f"\ndicBB: {dicBB}")
-                # print(f"vTrgPnt: {vTrgPnt}, vPnt: {vPnt}, vCtrBot: {vCtrBot}, location: {objA.location}")
-                dicTrgPnts[lInstNames[iIdx]] = vTrgPnt
-            # endif
-        # endfor
-        dicPnts = dicTrgPnts
+    Returns:
+        Iterator: Yields tuples of the point index, or instance name, and the position, or delta
+                  to the current instance location, as mathutils.Vector. These are the items of the
+                  dictionary returned by GetRndPointsOnSurface(), without the points that were not placed.
+    """
+    if iChunkSize is not None and iChunkSize < 1:
+        raise RuntimeError(f"Invalid chunk size '{iChunkSize}'")
     # endif
 
-    return dicPnts
+    xEngine, iPntCnt, lInstNames, aAnchors = _CreatePlacementEngine(
+        lTrgObjNames=lTrgObjNames,
+        iPntCnt=iPntCnt,
+        fMinDist=fMinDist,
+        fMaxDist=fMaxDist,
+        fMinHorizViewAngleSep_deg=fMinHorizViewAngleSep_deg,
+        bUseCameraFov=bUseCameraFov,
+        lCamFovBorder_deg=lCamFovBorder_deg,
+        lCamDistRange=lCamDistRange,
+        matCamWorld=matCamWorld,
+        lCamFov_deg=lCamFov_deg,
+        lVexGrpNames=lVexGrpNames,
+        iSeed=iSeed,
+        xRng=xRng,
+        iMaxTrials=iMaxTrials,
+        xInstances=xInstances,
+        bUseBoundBox=bUseBoundBox,
+        xInstanceOrigin=xInstanceOrigin,
+        xObstacles=xObstacles,
+        bUniformly=bUniformly,
+        bFilterPolygons=bFilterPolygons,
+    )
+
+    xItems = (_GetPlacementItem(iIdx, aPnt, lInstNames, aAnchors) for iIdx, aPnt in xEngine.IterPoints(iPntCnt))
+    if iChunkSize is None:
+        return xItems
+    # endif
+    return _IterPlacementChunks(xItems, iChunkSize)
 
 
 # enddef
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \rng.py
+# Created Date: Monday, October 19th 2026, 8:41:17 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+# Explicit random number generators instead of the global state of 'random' and 'np.random'.
+# Functions that draw random numbers accept a 'np.random.Generator', so that independent
+# placements can run in parallel threads or processes and are still reproducible.
+# If neither a generator nor a seed is given, the generator is seeded from the global state of
+# the 'random' module, so that code calling 'random.seed()' still gets reproducible results.
+#
+# Example:
+#   lRng = rng.SpawnGenerators(42, 2)
+#   dicA = points.GetRndPointsOnSurface(lTrgObjNames=["Ground"], iPntCnt=10, xRng=lRng[0])
+#   dicB = points.GetRndPointsOnSurface(lTrgObjNames=["Table"], iPntCnt=5, xRng=lRng[1])
+
+import random
+import numpy as np
+from typing import Union
+
+TSeed = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+# ################################################################################################
+def _GetDefaultSeed() -> int:
+    return random.getrandbits(64)
+
+
+# enddef
+
+
+# ################################################################################################
+def GetGenerator(_xSeed: TSeed = None) -> np.random.Generator:
+    """Get a random number generator.
+
+    Args:
+        _xSeed (int | SeedSequence | Generator, optional): A seed or a generator, which is returned as is.
+                                                           If None, the generator is seeded from the global
+                                                           state of the 'random' module. Defaults to None.
+
+    Returns:
+        np.random.Generator: The generator.
+    """
+    if isinstance(_xSeed, np.random.Generator):
+        return _xSeed
+    # endif
+    return np.random.default_rng(_GetDefaultSeed() if _xSeed is None else _xSeed)
+
+
+# enddef
+
+
+# ################################################################################################
+def SpawnGenerators(_xSeed: TSeed, _iCount: int) -> list[np.random.Generator]:
+    """Create independent random number generators from one seed, e.g. one per parallel placement.
+    The streams do not overlap and only depend on the seed and their index, not on the order
+    in which they are used.
+
+    Args:
+        _xSeed (int | SeedSequence | Generator): The seed, or a generator to spawn child generators from.
+                                                 If None, the seed is drawn from the global state of
+                                                 the 'random' module.
+        _iCount (int): The number of generators.
+
+    Returns:
+        list[np.random.Generator]: The generators.
+    """
+    if isinstance(_xSeed, np.random.Generator):
+        # 'Generator.spawn()' needs NumPy 1.25, Blender 3.x bundles older versions,
+        # so the children are spawned from the seed sequence of the generator's bit generator.
+        xSeedSeq = getattr(_xSeed.bit_generator, "_seed_seq", None)
+        if xSeedSeq is None:
+            xSeedSeq = np.random.SeedSequence(_xSeed.integers(2**63, size=4).tolist())
+        # endif
+    elif isinstance(_xSeed, np.random.SeedSequence):
+        xSeedSeq = _xSeed
+    else:
+        xSeedSeq = np.random.SeedSequence(_GetDefaultSeed() if _xSeed is None else _xSeed)
+    # endif
+
+    return [np.random.default_rng(xChild) for xChild in xSeedSeq.spawn(_iCount)]
+
+
+# enddef
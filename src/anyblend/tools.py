@@ -29,18 +29,20 @@
 import bpy
 import mathutils
 
-import random
+import numpy as np
+from typing import Optional
 
 from anyblend.cls_boundbox import CBoundingBox
 from . import collection
 from . import viewlayer
 from . import object as anyobj
 from . import ops_object as anyops
+from . import rng
 
 
 ############################################################################################
-def GetRandomColor() -> list[float]:
-    lColor = [random.uniform(0.0, 1.0) for i in range(3)]
+def GetRandomColor(_xRng: Optional[np.random.Generator] = None) -> list[float]:
+    lColor = rng.GetGenerator(_xRng).uniform(0.0, 1.0, size=3).tolist()
     fMax = max(lColor)
     return [round(x / fMax, 3) for x in lColor]
 
@@ -57,8 +59,10 @@ def SpreadObjectsIn2D(
     _iMaxColCnt: int = None,
     _bShowRowTitles: bool = False,
     _fRowTitleSize: float = 1.0,
+    _xRng: Optional[np.random.Generator] = None,
 ):
 
+    xRng = rng.GetGenerator(_xRng)
     clnTop = bpy.data.collections.get(_sClnTop)
     if clnTop is None:
         raise RuntimeError(f"Collection '{_sClnTop}' does not exist")
@@ -151,7 +155,7 @@ def SpreadObjectsIn2D(
                 _xCollection=clnRow,
             )
 
-            lColor = GetRandomColor()
+            lColor = GetRandomColor(xRng)
             anyops.SetNewMaterial(objText, _lBaseColor=lColor, _lEmission=lColor)
 
             objText.location = vRowPos
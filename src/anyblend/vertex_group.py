@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \vertex_group.py
+# Created Date: Monday, October 19th 2026, 4:58:21 pm
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender base functions module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+# Vertex group weights as numpy arrays.
+# The weights of several vertex groups are read in a single pass over the vertices,
+# combined with array operations and written back with one 'VertexGroup.add()' call per weight value.
+#
+# Example:
+#   aW = vertex_group.GetWeights(objPlane, ["placement_mask", "camera_visibility_mask", "painted"])
+#   aMask = vertex_group.Multiply(aW[0], vertex_group.Maximum(aW[1], aW[2]))
+#   aMask = vertex_group.BlurAdjacency(objPlane.data, aMask, _iIterations=4)
+#   vertex_group.SetWeights(objPlane, "combined_mask", aMask)
+
+import bpy
+import numpy as np
+from typing import Optional
+
+from .mesh import build as meshbuild
+
+
+# ################################################################################################
+def GetWeights(_objX: bpy.types.Object, _lGroupNames: list[str], *, _xDType=np.float32) -> np.ndarray:
+    """Get the weights of all vertices for the given vertex groups.
+    Vertices that are not part of a vertex group have weight zero for that group.
+
+    Args:
+        _objX (bpy.types.Object): The mesh object.
+        _lGroupNames (list[str]): The names of the vertex groups.
+        _xDType (optional): The numpy data type of the returned array. Defaults to np.float32.
+
+    Raises:
+        RuntimeError: if a vertex group does not exist for the object.
+
+    Returns:
+        np.ndarray: The weights of shape (len(_lGroupNames), number of vertices).
+    """
+    lGroups: list[bpy.types.VertexGroup] = []
+    for sGrpName in _lGroupNames:
+        xGrp = _objX.vertex_groups.get(sGrpName)
+        if xGrp is None:
+            raise RuntimeError(f"Vertex group '{sGrpName}' does not exist in object '{_objX.name}'")
+        # endif
+        lGroups.append(xGrp)
+    # endfor
+
+    xVertices = _objX.data.vertices
+    aW = np.zeros((len(lGroups), len(xVertices)), dtype=_xDType)
+    if len(lGroups) == 0:
+        return aW
+    # endif
+
+    # Vertex group memberships are only accessible per vertex.
+    # Therefore, all memberships are collected in one pass and then sorted into the array.
+    lVex: list[int] = []
+    lGrp: list[int] = []
+    lWeight: list[float] = []
+    for xVex in xVertices:
+        for xG in xVex.groups:
+            lVex.append(xVex.index)
+            lGrp.append(xG.group)
+            lWeight.append(xG.weight)
+        # endfor
+    # endfor
+
+    if len(lVex) == 0:
+        return aW
+    # endif
+
+    aMap = np.full(max(max(lGrp), max(x.index for x in lGroups)) + 1, -1, dtype=np.int64)
+    for iRow, xGrp in enumerate(lGroups):
+        aMap[xGrp.index] = iRow
+    # endfor
+
+    aRow = aMap[np.array(lGrp, dtype=np.int64)]
+    aValid = aRow >= 0
+    aW[aRow[aValid], np.array(lVex, dtype=np.int64)[aValid]] = np.array(lWeight, dtype=_xDType)[aValid]
+
+    return aW
+
+
+# enddef
+
+
+# ################################################################################################
+def GetWeight(_objX: bpy.types.Object, _sGroupName: str, *, _xDType=np.float32) -> np.ndarray:
+    """Get the weights of all vertices for a vertex group. See 'GetWeights()'.
+
+    Returns:
+        np.ndarray: The weights per vertex.
+    """
+    return GetWeights(_objX, [_sGroupName], _xDType=_xDType)[0]
+
+
+# enddef
+
+
+# ################################################################################################
+def SetWeights(
+    _objX: bpy.types.Object,
+    _sGroupName: str,
+    _aWeights: np.ndarray,
+    *,
+    _fMinWeight: Optional[float] = 0.0,
+    _iLevels: Optional[int] = None,
+) -> bpy.types.VertexGroup:
+    """Set the weights of all vertices of a vertex group. The group is created if it does not exist,
+    otherwise its previous content is replaced.
+
+    Args:
+        _objX (bpy.types.Object): The mesh object.
+        _sGroupName (str): The name of the vertex group.
+        _aWeights (np.ndarray): The weight per vertex.
+        _fMinWeight (float, optional): Vertices with a weight less or equal to this value are not added
+                                       to the group. If None, all vertices are added. Defaults to 0.0.
+        _iLevels (int, optional): If given, the weights are rounded to this number of levels
+                                  between 0 and 1. As the weights are added with one call per distinct value,
+                                  this speeds up writing smooth weights considerably. Defaults to None.
+
+    Returns:
+        bpy.types.VertexGroup: The vertex group.
+    """
+    iVexCnt = len(_objX.data.vertices)
+    aWeights = np.asarray(_aWeights, dtype=np.float32).reshape(-1)
+    if len(aWeights) != iVexCnt:
+        raise RuntimeError(
+            f"Number of weights ({len(aWeights)}) does not match the number of vertices ({iVexCnt}) "
+            f"of object '{_objX.name}'"
+        )
+    # endif
+
+    xGrp = _objX.vertex_groups.get(_sGroupName)
+    if xGrp is None:
+        xGrp = _objX.vertex_groups.new(name=_sGroupName)
+    else:
+        xGrp.remove(list(range(iVexCnt)))
+    # endif
+
+    aWeights = np.clip(aWeights, 0.0, 1.0)
+    if _iLevels is not None:
+        aWeights = np.round(aWeights * _iLevels) / _iLevels
+    # endif
+
+    aIdx = np.arange(iVexCnt) if _fMinWeight is None else np.flatnonzero(aWeights > _fMinWeight)
+    if len(aIdx) == 0:
+        return xGrp
+    # endif
+
+    aValues, aInverse = np.unique(aWeights[aIdx], return_inverse=True)
+    aOrder = np.argsort(aInverse, kind="stable")
+    aSplit = np.flatnonzero(np.diff(aInverse[aOrder])) + 1
+    for fWeight, aValueIdx in zip(aValues.tolist(), np.split(aIdx[aOrder], aSplit)):
+        xGrp.add(aValueIdx.tolist(), fWeight, "REPLACE")
+    # endfor
+
+    return xGrp
+
+
+# enddef
+
+
+# ################################################################################################
+def Multiply(*_tWeights: np.ndarray) -> np.ndarray:
+    """Element-wise product of weight arrays."""
+    return np.prod(np.stack(_tWeights), axis=0)
+
+
+# enddef
+
+
+# ################################################################################################
+def Minimum(*_tWeights: np.ndarray) -> np.ndarray:
+    """Element-wise minimum of weight arrays."""
+    return np.min(np.stack(_tWeights), axis=0)
+
+
+# enddef
+
+
+# ################################################################################################
+def Maximum(*_tWeights: np.ndarray) -> np.ndarray:
+    """Element-wise maximum of weight arrays."""
+    return np.max(np.stack(_tWeights), axis=0)
+
+
+# enddef
+
+
+# ################################################################################################
+def Threshold(_aWeights: np.ndarray, _fThreshold: float, *, _fLow: float = 0.0, _fHigh: float = 1.0) -> np.ndarray:
+    """Set weights greater or equal to the threshold to '_fHigh', and all others to '_fLow'."""
+    return np.where(_aWeights >= _fThreshold, _fHigh, _fLow).astype(_aWeights.dtype)
+
+
+# enddef
+
+
+# ################################################################################################
+def BlurAdjacency(
+    _meshX: bpy.types.Mesh,
+    _aWeights: np.ndarray,
+    *,
+    _iIterations: int = 1,
+    _fFactor: float = 0.5,
+    _fSigma: Optional[float] = None,
+) -> np.ndarray:
+    """Blur vertex weights over the edges of a mesh.
+    In every iteration, the weight of a vertex is blended with the mean weight of its neighbors.
+    If '_fSigma' is given, the neighbors are weighted with a gaussian of their edge length,
+    so that the blur is independent of the local vertex density. Repeated iterations approximate
+    a gaussian blur, whose width grows with the square root of the number of iterations.
+
+    Args:
+        _meshX (bpy.types.Mesh): The mesh.
+        _aWeights (np.ndarray): The weight per vertex.
+        _iIterations (int, optional): Number of iterations. Defaults to 1.
+        _fFactor (float, optional): Blend factor between a vertex weight and the mean of its neighbors.
+                                    Defaults to 0.5.
+        _fSigma (float, optional): Standard deviation of the gaussian edge weights in mesh units.
+                                   If None, all neighbors have the same weight. Defaults to None.
+
+    Returns:
+        np.ndarray: The blurred weights.
+    """
+    aVex, aEdges = meshbuild.GetEdgeArrays(_meshX)
+    iVexCnt = len(aVex)
+    aW = np.asarray(_aWeights, dtype=np.float64).reshape(-1)
+    if len(aW) != iVexCnt:
+        raise RuntimeError(f"Number of weights ({len(aW)}) does not match the number of vertices ({iVexCnt})")
+    # endif
+    if len(aEdges) == 0:
+        return aW.astype(np.float32)
+    # endif
+
+    aV0 = aEdges[:, 0]
+    aV1 = aEdges[:, 1]
+    if _fSigma is None:
+        aEdgeW = np.ones(len(aEdges), dtype=np.float64)
+    else:
+        aDist2 = np.sum(np.square(aVex[aV0] - aVex[aV1], dtype=np.float64), axis=1)
+        aEdgeW = np.exp(-aDist2 / (2.0 * _fSigma * _fSigma))
+    # endif
+
+    aNorm = np.bincount(aV0, aEdgeW, iVexCnt) + np.bincount(aV1, aEdgeW, iVexCnt)
+    aHasNeighbors = aNorm > 0.0
+    aNorm[~aHasNeighbors] = 1.0
+
+    for _ in range(_iIterations):
+        aMean = (np.bincount(aV0, aEdgeW * aW[aV1], iVexCnt) + np.bincount(aV1, aEdgeW * aW[aV0], iVexCnt)) / aNorm
+        aW = np.where(aHasNeighbors, (1.0 - _fFactor) * aW + _fFactor * aMean, aW)
+    # endfor
+
+    return aW.astype(np.float32)
+
+
+# enddef